@@ -0,0 +1,258 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.db import transaction, IntegrityError
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.generic import View
+from rest_framework import status
+from rest_framework.exceptions import MethodNotAllowed, ValidationError
+
+from common.authentication import AsyncCachedTokenAuthentication
+from common.constant import constants
+from common.facet import filter_books
+from common.pagination import KeysetPagination
+from common.permission import AsyncBookPermission
+from common.router import read_from_replica
+from common.serializer import BookSerializer
+from db.models import Book
+
+
+class AsyncBaseView(View):
+    """
+    Base class of async views, it authenticates the request and checks the permissions
+    without leaving the event loop, same as ``BaseViewMixin`` does for the sync views.
+    """
+    authentication_classes = [AsyncCachedTokenAuthentication]
+    permission_classes = [AsyncBookPermission]
+    basename = "book"
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # The requests are authenticated by token and not by the session cookie,
+        # so the views are csrf exempt the same as DRF's ``APIView.as_view``.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        for authentication in self.authentication_classes:
+            result = await authentication().authenticate(request)
+            if result is not None:
+                request.user, request.auth = result
+                break
+        else:
+            return JsonResponse({constants["Error"]: "Authentication credentials were not provided."},
+                                status=status.HTTP_401_UNAUTHORIZED)
+        try:
+            for permission in self.permission_classes:
+                if not await permission().has_permission(request, self):
+                    return JsonResponse({constants["Error"]: "You do not have permission to perform this action."},
+                                        status=status.HTTP_403_FORBIDDEN)
+        except MethodNotAllowed as err:
+            response = JsonResponse({constants["Error"]: err.detail}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
+            response["Allow"] = ", ".join(self._allowed_methods())
+            return response
+        return await super().dispatch(request, *args, **kwargs)
+
+    @staticmethod
+    def _get_data(request):
+        """
+        static method of class to parse the JSON body of the request.
+        """
+        try:
+            return json.loads(request.body or b"{}")
+        except ValueError:
+            raise ValidationError("JSON parse error.")
+
+    @staticmethod
+    async def _get_book(attr):
+        """
+        static method of class to fetch the book by id, slug, title or previous slug, same as
+        ``BookAPIView._get_book``.
+        param attr: A object attribute to fetch book.
+        type attr: str
+        """
+        if attr.isnumeric():
+            return await Book.objects.aget(id=attr)
+        book = (await Book.objects.filter(slug=attr).afirst() or
+                await Book.objects.filter(title=attr).order_by("id").afirst())
+        return book if book is not None else await Book.objects.aget(slug_redirects__slug=attr)
+
+
+@sync_to_async
+def _create_book(serializer):
+    with transaction.atomic():
+        return Book.objects.create(**serializer.validated_data)
+
+
+@sync_to_async
+def _update_book(serializer, book):
+    with transaction.atomic():
+        return serializer.update(book, serializer.validated_data)
+
+
+@sync_to_async
+def _delete_book(book):
+    with transaction.atomic():
+        book.delete()
+
+
+class AsyncBookAPIView(AsyncBaseView):
+    """
+    Async class to manage book, and it includes a methods
+    ``get`` to fetch book list with cursor pagination,
+    ``post`` to add book.
+    """
+
+    @read_from_replica
+    async def get(self, request):
+        """
+        This method includes business logic to fetch list of book.
+        param request: A request object consists of query param value.
+        type request: request
+        """
+        try:
+            books, fields = BookSerializer.sparse(filter_books(Book.objects.all(), request.GET), request.GET)
+            page = await KeysetPagination().apaginate_queryset(books, request)
+            data = {"Data": BookSerializer(page, many=True, fields=fields).data,
+                    "Next": page.next_cursor, "Previous": page.previous_cursor}
+            if page.count is not None:
+                data["Count"] = page.count
+            data[constants["Message"]] = constants["SuccessfullyFetched"].format(" ".join([
+                constants["Book"].capitalize(), "list"]))
+            return JsonResponse(data, status=status.HTTP_200_OK)
+        except ValidationError as err:
+            return JsonResponse({constants["Error"]: err.args[0],
+                                 constants["Message"]: constants["ErrorMessage"].format("fetching book list")},
+                                status=status.HTTP_400_BAD_REQUEST)
+        except Exception as err:
+            return JsonResponse({constants["Error"]: str(err),
+                                 constants["Message"]: constants["SomethingWentWrong"].format("fetching book list")},
+                                status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    async def post(self, request):
+        """
+        This method includes business logic to add book.
+        param request: A request object consists of query param value.
+        type request: request
+        """
+        serializer = None
+        try:
+            serializer = BookSerializer(data=self._get_data(request))
+            # Validation may query the unique slug, run it off the event loop.
+            await sync_to_async(serializer.is_valid)(raise_exception=True)
+            book = await _create_book(serializer)
+            return JsonResponse({"Data": {"id": book.id},
+                                 constants["Message"]: constants["SuccessfullyAdded"].format(
+                                     " ".join([book.title, constants["Book"]]))},
+                                status=status.HTTP_201_CREATED)
+        except ValidationError as err:
+            return JsonResponse({constants["Error"]: err.args[0],
+                                 constants["Message"]: constants["ErrorMessage"].format("adding book")},
+                                status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError:
+            return JsonResponse({constants["Error"]: constants["AlreadyExist"].format(
+                " ".join([serializer.validated_data.get('title'), constants["Book"]])),
+                constants["Message"]: constants["ErrorMessage"].format("adding book")},
+                status=status.HTTP_400_BAD_REQUEST)
+        except Exception as err:
+            return JsonResponse({constants["Error"]: str(err),
+                                 constants["Message"]: constants["SomethingWentWrong"].format("adding book")},
+                                status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AsyncBookDetailAPIView(AsyncBaseView):
+    """
+    Async class to manage book, and it includes a methods
+    ``get`` to fetch book detail,
+    ``put`` to update book,
+    ``patch`` to partially update book,
+    ``delete`` to delete book.
+    """
+
+    @read_from_replica
+    async def get(self, request, _book):
+        """
+        This method includes business logic to fetch book detail.
+        param request: A request object consists of query param value.
+        type request: request
+        param _book: A unique value for model object.
+        type _book: str
+        """
+        try:
+            return JsonResponse({"Data": BookSerializer(await self._get_book(_book)).data,
+                                 constants["Message"]: constants["SuccessfullyFetched"].format(constants["Book"])},
+                                status=status.HTTP_200_OK)
+        except Book.DoesNotExist:
+            return JsonResponse({constants["Error"]: constants["DoseNotExist"].format(constants["Book"].capitalize()),
+                                 constants["Message"]: constants["ErrorMessage"].format("fetching book")},
+                                status=status.HTTP_404_NOT_FOUND)
+        except Exception as err:
+            return JsonResponse({constants["Error"]: str(err),
+                                 constants["Message"]: constants["SomethingWentWrong"].format("fetching book")},
+                                status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    async def put(self, request, _book, partial=False):
+        """
+        This method includes business logic to update book.
+        param request: A request object consists of query param value.
+        type request: request
+        param _book: A unique value for model object.
+        type _book: str
+        """
+        serializer = None
+        try:
+            serializer = BookSerializer(data=self._get_data(request), partial=partial)
+            await sync_to_async(serializer.is_valid)(raise_exception=True)
+            book = await _update_book(serializer, await self._get_book(_book))
+            return JsonResponse({constants["Data"]: BookSerializer(book).data,
+                                 constants["Message"]: constants["SuccessfullyUpdated"].format(
+                                     constants["Book"].capitalize())}, status=status.HTTP_200_OK)
+        except Book.DoesNotExist:
+            return JsonResponse({constants["Error"]: constants["DoseNotExist"].format(constants["Book"].capitalize()),
+                                 constants["Message"]: constants["ErrorMessage"].format(constants["UpdatingBook"])},
+                                status=status.HTTP_404_NOT_FOUND)
+        except IntegrityError:
+            return JsonResponse({constants["Error"]: constants["AlreadyExist"].format(
+                " ".join([serializer.validated_data.get('title'), constants["Book"]])),
+                constants["Message"]: constants["ErrorMessage"].format(constants["UpdatingBook"])},
+                status=status.HTTP_400_BAD_REQUEST)
+        except ValidationError as err:
+            return JsonResponse({constants["Error"]: err.args[0],
+                                 constants["Message"]: constants["ErrorMessage"].format(constants["UpdatingBook"])},
+                                status=status.HTTP_400_BAD_REQUEST)
+        except Exception as err:
+            return JsonResponse({constants["Error"]: str(err),
+                                 constants["Message"]: constants["SomethingWentWrong"].format(
+                                     constants["UpdatingBook"])},
+                                status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    async def patch(self, request, _book):
+        """
+        This method includes business logic to partially update book.
+        param request: A request object consists of query param value.
+        type request: request
+        param _book: A unique value for model object.
+        type _book: str
+        """
+        return await self.put(request, _book, partial=True)
+
+    async def delete(self, request, _book):
+        """
+        This method includes business logic to delete book.
+        param request: A request object consists of query param value.
+        type request: request
+        param _book: A unique value for model object.
+        type _book: str
+        """
+        try:
+            await _delete_book(await self._get_book(_book))
+            return JsonResponse({"Data": {}, constants["Message"]: constants["SuccessfullyDeleted"].format("Book")},
+                                status=status.HTTP_200_OK)
+        except Book.DoesNotExist:
+            return JsonResponse({constants["Error"]: constants["DoseNotExist"].format(constants["Book"].capitalize()),
+                                 constants["Message"]: constants["ErrorMessage"].format("deleting book")},
+                                status=status.HTTP_404_NOT_FOUND)
+        except Exception as err:
+            return JsonResponse({constants["Error"]: str(err),
+                                 constants["Message"]: constants["SomethingWentWrong"].format("deleting book")},
+                                status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,141 @@
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import AsyncClient, Client, TestCase
+from rest_framework.authtoken.models import Token
+
+from db.models import Book, BookFacet, User
+
+
+class AsyncBookAPIViewTest(TestCase):
+    """
+    Tests of the async routes of the book REST API, they are authenticated by token and csrf exempt.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.token = Token.objects.create(user=User.objects.get(email="admin@mail.com"))
+        cls.book = Book.objects.create(title="Async Book", category="story", description="Async book.",
+                                       author="Async")
+
+    def setUp(self):
+        self.client = Client(enforce_csrf_checks=True, HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_list(self):
+        response = self.client.get("/rest/async/book/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Next", response.json())
+
+    def test_create(self):
+        response = self.client.post("/rest/async/book/", {
+            "title": "Async Created", "category": "story", "description": "Created.", "author": "Async"},
+            content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Book.objects.filter(id=response.json()["Data"]["id"], title="Async Created").exists())
+
+    def test_create_invalid(self):
+        response = self.client.post("/rest/async/book/", "{", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_update(self):
+        response = self.client.put(f"/rest/async/book/{self.book.id}/", {
+            "title": "Async Updated", "category": "story", "description": "Updated.", "author": "Async"},
+            content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.title, "Async Updated")
+
+    def test_partial_update_by_slug(self):
+        response = self.client.patch(f"/rest/async/book/{self.book.slug}/", {"author": "Patched"},
+                                     content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.author, "Patched")
+
+    def test_delete(self):
+        response = self.client.delete(f"/rest/async/book/{self.book.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Book.objects.filter(id=self.book.id).exists())
+
+    def test_delete_missing(self):
+        response = self.client.delete("/rest/async/book/0/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_unauthenticated(self):
+        response = Client(enforce_csrf_checks=True).post("/rest/async/book/", {}, content_type="application/json")
+        self.assertEqual(response.status_code, 401)
+
+    def test_student_cannot_add(self):
+        token = Token.objects.create(user=User.objects.get(email="rupam@mail.com"))
+        response = Client(enforce_csrf_checks=True, HTTP_AUTHORIZATION=f"Token {token.key}").post(
+            "/rest/async/book/", {"title": "Denied", "category": "story", "description": "Denied.",
+                                  "author": "Student"}, content_type="application/json")
+        self.assertEqual(response.status_code, 403)
+
+    async def test_create_with_async_client(self):
+        # The async client of Django 4.1 sends the extra keyword arguments as header names.
+        client = AsyncClient(enforce_csrf_checks=True)
+        response = await client.post("/rest/async/book/", {
+            "title": "Async Client", "category": "story", "description": "Created.", "author": "Async"},
+            content_type="application/json", AUTHORIZATION=f"Token {self.token.key}")
+        self.assertEqual(response.status_code, 201)
+
+    def test_head(self):
+        response = self.client.head(f"/rest/async/book/{self.book.id}/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_options_not_allowed(self):
+        response = self.client.options("/rest/async/book/")
+        self.assertEqual(response.status_code, 405)
+        self.assertIn("GET", response["Allow"])
+
+
+class AsyncBookFacetTest(TestCase):
+    """
+    Tests of the facet counts changed by the async routes, in the transaction of the book write.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.token = Token.objects.create(user=User.objects.get(email="admin@mail.com"))
+
+    def setUp(self):
+        self.client = Client(enforce_csrf_checks=True, HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    @staticmethod
+    def get_count(field, value):
+        return BookFacet.objects.filter(field=field, value=value).values_list("count", flat=True).first() or 0
+
+    def add_book(self, title, author):
+        return self.client.post("/rest/async/book/", {"title": title, "category": "historical",
+                                                      "description": f"{title}.", "author": author},
+                                content_type="application/json")
+
+    def test_counts_follow_writes(self):
+        count = self.get_count("category", "historical")
+        response = self.add_book("Async Facet", "Async Author")
+        self.assertEqual(response.status_code, 201)
+        book_id = response.json()["Data"]["id"]
+        self.assertEqual(self.get_count("category", "historical"), count + 1)
+        self.assertEqual(self.get_count("author", "Async Author"), 1)
+        response = self.client.patch(f"/rest/async/book/{book_id}/", {"author": "Async Other"},
+                                     content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_count("author", "Async Author"), 0)
+        self.assertEqual(self.get_count("author", "Async Other"), 1)
+        self.assertEqual(self.client.delete(f"/rest/async/book/{book_id}/").status_code, 200)
+        self.assertEqual(self.get_count("author", "Async Other"), 0)
+        self.assertEqual(self.get_count("category", "historical"), count)
+
+    def test_failed_count_rolls_back_create(self):
+        with mock.patch("db.signal.change_facet_counts", side_effect=DatabaseError("Counts unavailable.")):
+            response = self.add_book("Async Rolled Back", "Async Author")
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(Book.objects.filter(title="Async Rolled Back").exists())
+
+    def test_failed_count_rolls_back_delete(self):
+        book = Book.objects.create(title="Async Kept", category="story", description="Kept.", author="Async")
+        with mock.patch("db.signal.change_facet_counts", side_effect=DatabaseError("Counts unavailable.")):
+            response = self.client.delete(f"/rest/async/book/{book.id}/")
+        self.assertEqual(response.status_code, 500)
+        self.assertTrue(Book.objects.filter(id=book.id).exists())
@@ -0,0 +1,72 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from common.authentication import invalidate_token, token_cache
+from common.checks import check_token_revocation_cache
+from db.models import User
+
+
+class TokenRevocationTest(TestCase):
+    """
+    Tests of the cached token authentication, a revoked token is refused by every process at once.
+    """
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.user = User.objects.get(email="admin@mail.com")
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def get_books(self):
+        return self.client.get("/rest/book/").status_code
+
+    def test_logout_revokes_token(self):
+        self.assertEqual(self.get_books(), 200)
+        self.assertEqual(self.client.delete("/rest/userLogout/").status_code, 200)
+        self.assertFalse(Token.objects.filter(key=self.token.key).exists())
+        self.assertEqual(self.get_books(), 401)
+
+    def test_revocation_by_another_process(self):
+        self.assertEqual(self.get_books(), 200)
+        # Another process revokes the token, the in process entry of this process is left as it is.
+        Token.objects.filter(key=self.token.key)._raw_delete("default")
+        with mock.patch.object(token_cache, "delete"):
+            invalidate_token(self.token.key)
+        self.assertIsNotNone(token_cache.get(self.token.key))
+        self.assertEqual(self.get_books(), 401)
+
+    def test_deactivated_user_by_another_process(self):
+        self.assertEqual(self.get_books(), 200)
+        with mock.patch.object(token_cache, "delete"):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self.get_books(), 401)
+
+    def test_token_cached_after_revocation_is_used(self):
+        invalidate_token(self.token.key)
+        self.assertEqual(self.get_books(), 200)
+        with mock.patch.object(Token.objects, "select_related", side_effect=AssertionError("Token was not cached.")):
+            self.assertEqual(self.get_books(), 200)
+
+
+class TokenRevocationCacheCheckTest(TestCase):
+    """
+    Tests of the check refusing a token revocation cache private to every process.
+    """
+
+    @override_settings(DEBUG=False, TOKEN_CACHE_ALIAS="")
+    def test_process_local_cache(self):
+        self.assertEqual([message.id for message in check_token_revocation_cache(None)], ["book_project.E001"])
+
+    @override_settings(DEBUG=False, TOKEN_CACHE_ALIAS="tokens", CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "tokens": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                   "LOCATION": "/tmp/book_app_tokens"}})
+    def test_shared_token_cache(self):
+        self.assertEqual(check_token_revocation_cache(None), [])
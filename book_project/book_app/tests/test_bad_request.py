@@ -0,0 +1,77 @@
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse, HttpResponseNotFound
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from book_project.middleware import BadRequestMiddleware, get_error_page
+
+
+@override_settings(APPEND_SLASH=True, REST_URL_PREFIXES=["/rest/", "/restUserLogin/"])
+class BadRequestTest(SimpleTestCase):
+    """
+    Tests of the paths answered by ``BadRequestMiddleware``.
+    """
+
+    def setUp(self):
+        get_error_page.cache_clear()
+        self.addCleanup(get_error_page.cache_clear)
+        self.requests = []
+        self.response = HttpResponse("Book list")
+
+    def get_response(self, request):
+        self.requests.append(request)
+        return self.response
+
+    def get(self, path):
+        return BadRequestMiddleware(self.get_response)(RequestFactory().get(path))
+
+    def test_unknown_html_path(self):
+        response = self.get("/no/such/page/")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.content.decode(), get_error_page())
+        self.assertEqual(self.requests, [])
+
+    def test_unknown_rest_path(self):
+        for path in ("/rest/no/such/book/", "/restUserLogin/no/"):
+            with self.subTest(path=path):
+                response = self.get(path)
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response["Content-Type"], "application/json")
+                self.assertEqual(json.loads(response.content), {"Error": f"{path} not found."})
+        self.assertEqual(self.requests, [])
+
+    def test_valid_path_falls_through(self):
+        for path in ("/rest/book/", "/rest/book", "/rest/book/1/", "/userRegister/"):
+            with self.subTest(path=path):
+                self.assertIs(self.get(path), self.response)
+        self.assertEqual(len(self.requests), 4)
+
+    @override_settings(APPEND_SLASH=False)
+    def test_path_without_slash(self):
+        self.assertEqual(self.get("/rest/book").status_code, 404)
+        self.assertEqual(self.requests, [])
+
+    def test_view_not_found(self):
+        self.response = HttpResponseNotFound()
+        response = self.get("/userRegister/")
+        self.assertEqual(response.content.decode(), get_error_page())
+        response = self.get("/rest/book/")
+        self.assertEqual(json.loads(response.content), {"Error": "/rest/book/ not found."})
+        self.assertEqual(len(self.requests), 2)
+
+    def test_error_page_rendered_once(self):
+        with mock.patch("book_project.middleware.render_to_string", return_value="Not found") as render:
+            for path in ("/no/such/page/", "/nor/this/one/"):
+                self.assertEqual(self.get(path).content, b"Not found")
+        render.assert_called_once_with("error.html")
+
+    def test_async_path(self):
+        async def get_response(request):
+            self.requests.append(request)
+            return self.response
+        middleware = BadRequestMiddleware(get_response)
+        self.assertEqual(async_to_sync(middleware)(RequestFactory().get("/rest/nothing/")).status_code, 404)
+        self.assertIs(async_to_sync(middleware)(RequestFactory().get("/rest/async/book/")), self.response)
+        self.assertEqual(len(self.requests), 1)
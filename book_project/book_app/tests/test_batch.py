@@ -0,0 +1,108 @@
+from unittest import mock
+
+from django.db import IntegrityError
+
+from book_app.tests.test_views import BookAPITestCase
+from common.serializer import BookSerializer
+from db.models import Book
+
+
+class BookBatchTest(BookAPITestCase):
+    """
+    Tests of the batch update and delete of books.
+    """
+
+    def bulk_update(self, items):
+        return self.client.patch("/rest/book/bulk_update/", items, format="json")
+
+    def bulk_delete(self, attrs):
+        return self.client.delete("/rest/book/bulk_delete/", attrs, format="json")
+
+    def test_bulk_update(self):
+        first, second = self.create_book("First Batch Book"), self.create_book("Second Batch Book")
+        response = self.bulk_update([{"id": first.id, "author": "Batch"}, {"id": second.slug, "author": "Batch"}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result["Status"] for result in response.json()["Data"]], [200, 200])
+        self.assertEqual(Book.objects.filter(author="Batch").count(), 2)
+
+    def test_bulk_update_missing_book(self):
+        book = self.create_book("Found Batch Book")
+        response = self.bulk_update([{"id": book.id, "author": "Batch"}, {"id": "missing-book", "author": "Batch"}])
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result["Status"] for result in response.json()["Data"]], [200, 404])
+        book.refresh_from_db()
+        self.assertEqual(book.author, "Batch")
+
+    def test_bulk_update_invalid_book(self):
+        first, second = self.create_book("Valid Batch Book"), self.create_book("Invalid Batch Book")
+        response = self.bulk_update([{"id": first.id, "author": "Batch"},
+                                     {"id": second.id, "category": "poetry"}])
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result["Status"] for result in response.json()["Data"]], [200, 400])
+        second.refresh_from_db()
+        self.assertEqual(second.category, "story")
+
+    def test_bulk_update_failing_book_is_rolled_back_alone(self):
+        first, second = self.create_book("Kept Batch Book"), self.create_book("Failing Batch Book")
+        update = BookSerializer.update
+
+        def update_or_fail(serializer, book, data):
+            if book.id == second.id:
+                Book.objects.filter(id=book.id).update(author="Partial")
+                raise IntegrityError()
+            return update(serializer, book, data)
+
+        with mock.patch.object(BookSerializer, "update", autospec=True, side_effect=update_or_fail):
+            response = self.bulk_update([{"id": first.id, "author": "Batch"}, {"id": second.id, "author": "Batch"}])
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result["Status"] for result in response.json()["Data"]], [200, 400])
+        self.assertEqual(Book.objects.get(id=first.id).author, "Batch")
+        self.assertEqual(Book.objects.get(id=second.id).author, "Tester")
+
+    def test_bulk_update_without_id(self):
+        self.assertEqual(self.bulk_update([{"author": "Batch"}]).status_code, 400)
+        self.assertEqual(self.bulk_update([]).status_code, 400)
+
+    def test_batch_too_large(self):
+        with mock.patch("book_app.views.BATCH_MAX_SIZE", 1):
+            self.assertEqual(self.bulk_delete(["first", "second"]).status_code, 400)
+
+    def test_bulk_delete(self):
+        first, second = self.create_book("First Deleted Book"), self.create_book("Second Deleted Book")
+        response = self.bulk_delete([str(first.id), second.slug])
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Book.objects.filter(id__in=[first.id, second.id]).exists())
+
+    def test_bulk_delete_missing_book(self):
+        book = self.create_book("Deleted Batch Book")
+        response = self.bulk_delete([book.slug, "missing-book"])
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result["Status"] for result in response.json()["Data"]], [200, 404])
+        self.assertFalse(Book.objects.filter(id=book.id).exists())
+
+    def test_numeric_attribute_is_an_id(self):
+        book = self.create_book("9999999")
+        response = self.bulk_delete([book.slug])
+        self.assertEqual(response.json()["Data"][0]["Status"], 404)
+        self.assertTrue(Book.objects.filter(id=book.id).exists())
+
+    def test_slug_wins_over_title(self):
+        by_slug = self.create_book("Alpha")
+        by_title = self.create_book("alpha")
+        self.assertNotEqual(by_title.slug, "alpha")
+        response = self.bulk_update([{"id": "alpha", "author": "Batch"}])
+        self.assertEqual(response.json()["Data"][0]["Data"]["id"], by_slug.id)
+
+    def test_oldest_book_wins_title(self):
+        oldest = self.create_book("Shared Title")
+        self.create_book("Shared Title")
+        response = self.bulk_update([{"id": "Shared Title", "author": "Batch"}])
+        self.assertEqual(response.json()["Data"][0]["Data"]["id"], oldest.id)
+
+    def test_previous_slug(self):
+        book = self.create_book("Before Rename")
+        book.title = "After Rename"
+        book.save()
+        response = self.bulk_delete(["before-rename"])
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Book.objects.filter(id=book.id).exists())
@@ -0,0 +1,118 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from common import router
+from common.cache import get_or_build_entry
+from book_app.tests.test_views import BookAPITestCase
+from db.models import Book
+
+
+@override_settings(DATABASE_REPLICAS=["default"])
+class ReplicaCacheTest(TestCase):
+    """
+    Tests of the cached values built from the reads of a replica.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.builds = []
+
+    def build(self):
+        self.builds.append(router.reads_from_replica())
+        return len(self.builds)
+
+    @router.read_from_replica
+    def get_from_replica(self):
+        return get_or_build_entry("key", self.build)
+
+    @router.read_from_replica
+    def get_from_primary(self):
+        token = router.pin_to_primary()
+        try:
+            return get_or_build_entry("key", self.build)
+        finally:
+            router.unpin(token)
+
+    def test_replica_entry_is_reused_by_replica_reads(self):
+        self.assertEqual(self.get_from_replica(), (1, True))
+        self.assertEqual(self.get_from_replica(), (1, True))
+        self.assertEqual(self.builds, [True])
+
+    def test_replica_entry_is_not_served_to_primary_reads(self):
+        self.get_from_replica()
+        self.assertEqual(self.get_from_primary(), (2, False))
+        # The value built from the primary is served to every request.
+        self.assertEqual(self.get_from_replica(), (2, False))
+        self.assertEqual(self.builds, [True, False])
+
+    @override_settings(DATABASE_REPLICA_STICKY_SECONDS=0)
+    def test_replica_entry_expires_with_replication_lag(self):
+        self.get_from_replica()
+        self.get_from_replica()
+        self.assertEqual(self.builds, [True, True])
+
+
+@override_settings(DATABASE_REPLICAS=["default"])
+class ReplicaResponseTest(BookAPITestCase):
+    """
+    Tests of the cached book responses read from a replica.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_replica_response_has_own_etag(self):
+        replica_etag = self.client.get("/rest/book/")["ETag"]
+        self.assertTrue(replica_etag.endswith('-replica"'))
+        self.client.cookies[router.PRIMARY_COOKIE] = "1"
+        response = self.client.get("/rest/book/", HTTP_IF_NONE_MATCH=replica_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response["ETag"].endswith('-replica"'))
+
+    def test_write_pins_client_to_primary(self):
+        response = self.client.post("/rest/book/", {"title": "Pinned Book", "category": "story",
+                                                    "description": "Pinned.", "author": "Tester"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(router.PRIMARY_COOKIE, response.cookies)
+        self.assertFalse(self.client.get("/rest/book/")["ETag"].endswith('-replica"'))
+
+    def test_stream_reads_from_replica(self):
+        routed = []
+        db_for_read = router.ReplicaRouter.db_for_read
+
+        def record(model, **hints):
+            if model is Book:
+                routed.append(router.reads_from_replica())
+            return db_for_read(model, **hints)
+        with mock.patch.object(router.ReplicaRouter, "db_for_read", staticmethod(record)):
+            response = self.client.get("/rest/book/", {"stream": "ndjson"})
+            b"".join(response.streaming_content)
+        self.assertTrue(routed)
+        self.assertTrue(all(routed))
+
+
+class LastModifiedTest(BookAPITestCase):
+    """
+    Tests of the ``Last-Modified`` header of the cached book responses.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_deleted_book_modifies_list_page(self):
+        book = self.create_book("Deleted Book")
+        last_modified = self.client.get("/rest/book/")["Last-Modified"]
+        with mock.patch("time.time", return_value=time.time() + 60), \
+                self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.delete(f"/rest/book/{book.id}/").status_code, 200)
+        response = self.client.get("/rest/book/", HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["Last-Modified"], last_modified)
+        response = self.client.get("/rest/book/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+                                   HTTP_IF_NONE_MATCH="")
+        self.assertEqual(response.status_code, 304)
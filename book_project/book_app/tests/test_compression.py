@@ -0,0 +1,123 @@
+import gzip
+import zlib
+
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from book_project.middleware import CompressionMiddleware
+from common.compression import RESPONSE_ENCODINGS, brotli, zstandard
+
+BODY = b'{"title": "Compressed Book", "author": "Tester"}' * 100
+
+
+def decompress(data, encoding):
+    if encoding == "br":
+        return brotli.decompress(data)
+    if encoding == "zstd":
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return gzip.decompress(data)
+
+
+@override_settings(COMPRESSION_ENCODINGS=["zstd", "br", "gzip"], COMPRESSION_MIN_SIZE=1024,
+                   COMPRESSION_FLUSH_SIZE=65536)
+class CompressionTest(SimpleTestCase):
+    """
+    Tests of the responses compressed by ``CompressionMiddleware``.
+    """
+
+    def get(self, response, accept="gzip, deflate, br, zstd"):
+        middleware = CompressionMiddleware(lambda request: response)
+        return middleware(RequestFactory().get("/rest/book/", HTTP_ACCEPT_ENCODING=accept))
+
+    @staticmethod
+    def json_response(body=BODY, **headers):
+        response = HttpResponse(body, content_type="application/json")
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    def test_negotiation(self):
+        cases = [("gzip, br, zstd", RESPONSE_ENCODINGS[0]), ("gzip", "gzip"), ("br;q=0, gzip", "gzip"),
+                 ("*", RESPONSE_ENCODINGS[0]), ("identity", None), ("gzip;q=0, identity", None), ("", None)]
+        if "br" in RESPONSE_ENCODINGS:
+            cases.append(("gzip, br", "br"))
+        for accept, encoding in cases:
+            with self.subTest(accept=accept):
+                response = self.get(self.json_response(), accept)
+                self.assertEqual(response.get("Content-Encoding"), encoding)
+                self.assertEqual(response["Vary"], "Accept-Encoding")
+                if encoding is None:
+                    self.assertEqual(response.content, BODY)
+                else:
+                    self.assertEqual(decompress(response.content, encoding), BODY)
+                    self.assertEqual(response["Content-Length"], str(len(response.content)))
+
+    def test_every_encoding_round_trips(self):
+        for encoding in RESPONSE_ENCODINGS:
+            with self.subTest(encoding=encoding):
+                response = self.get(self.json_response(), encoding)
+                self.assertEqual(response["Content-Encoding"], encoding)
+                self.assertEqual(decompress(response.content, encoding), BODY)
+
+    @override_settings(COMPRESSION_ENCODINGS=["gzip"])
+    def test_configured_encodings(self):
+        self.assertEqual(self.get(self.json_response())["Content-Encoding"], "gzip")
+
+    def test_minimum_size(self):
+        response = self.get(self.json_response(BODY[:1023]))
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertFalse(response.has_header("Vary"))
+        self.assertEqual(response.content, BODY[:1023])
+        self.assertTrue(self.get(self.json_response(BODY[:1024])).has_header("Content-Encoding"))
+
+    def test_uncompressible_responses(self):
+        responses = [HttpResponse(BODY, content_type="image/png"),
+                     self.json_response(**{"Cache-Control": "no-transform"}),
+                     self.json_response(**{"Content-Encoding": "br"})]
+        for response in responses:
+            with self.subTest(response=response):
+                content_encoding = response.get("Content-Encoding")
+                response = self.get(response)
+                self.assertEqual(response.get("Content-Encoding"), content_encoding)
+                self.assertEqual(response.content, BODY)
+
+    def test_etag_weakened(self):
+        response = self.get(self.json_response(ETag='"book-list"'), "gzip")
+        self.assertEqual(response["ETag"], 'W/"book-list"')
+        response = self.get(self.json_response(ETag='W/"book-list"'), "gzip")
+        self.assertEqual(response["ETag"], 'W/"book-list"')
+        response = self.get(self.json_response(ETag='"book-list"'), "identity")
+        self.assertEqual(response["ETag"], '"book-list"')
+
+    def test_vary_keeps_other_headers(self):
+        response = self.get(self.json_response(Vary="Cookie"), "gzip")
+        self.assertEqual(response["Vary"], "Cookie, Accept-Encoding")
+
+    def test_streamed_response(self):
+        chunks = [BODY[index:index + 100] for index in range(0, len(BODY), 100)]
+        for encoding in RESPONSE_ENCODINGS:
+            with self.subTest(encoding=encoding):
+                response = self.get(StreamingHttpResponse(iter(chunks), content_type="application/x-ndjson"),
+                                    encoding)
+                self.assertEqual(response["Content-Encoding"], encoding)
+                self.assertFalse(response.has_header("Content-Length"))
+                self.assertEqual(decompress(b"".join(response.streaming_content), encoding), BODY)
+
+    @override_settings(COMPRESSION_FLUSH_SIZE=1000)
+    def test_streamed_response_is_flushed(self):
+        chunks = [BODY[index:index + 100] for index in range(0, len(BODY), 100)]
+        response = self.get(StreamingHttpResponse(iter(chunks), content_type="application/x-ndjson"), "gzip")
+        parts = list(response.streaming_content)
+        # Everything added before the end of the stream is sent flushed, up to the last 1000 bytes.
+        decompressor = zlib.decompressobj(31)
+        self.assertEqual(decompressor.decompress(b"".join(parts[:-1])), BODY[:len(BODY) // 1000 * 1000])
+        self.assertEqual(decompressor.decompress(parts[-1]), BODY[len(BODY) // 1000 * 1000:])
+
+    def test_async_response(self):
+        async def get_response(request):
+            return self.json_response()
+        middleware = CompressionMiddleware(get_response)
+        response = async_to_sync(middleware)(RequestFactory().get("/rest/book/", HTTP_ACCEPT_ENCODING="gzip"))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), BODY)
@@ -0,0 +1,62 @@
+from django.test import override_settings
+
+from book_app.tests.test_views import BookAPITestCase
+from db.models import Book, BookFacet, Job
+
+
+@override_settings(JOB_QUEUE_EAGER=False)
+class BookFacetTest(BookAPITestCase):
+    """
+    Tests of the facet counts, they are updated in the transaction of the book write without any worker.
+    """
+
+    def get_facets(self, **params):
+        response = self.client.get("/rest/book/facets/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["Data"]
+
+    def get_count(self, field, value):
+        return BookFacet.objects.filter(field=field, value=value).values_list("count", flat=True).first() or 0
+
+    def test_counts_match_books(self):
+        facets = self.get_facets(limit=100)
+        for category, count in facets["category"].items():
+            self.assertEqual(count, Book.objects.filter(category=category).count())
+        for author, count in facets["author"].items():
+            self.assertEqual(count, Book.objects.filter(author=author).count())
+
+    def test_create_counts_book(self):
+        count = self.get_count("category", "historical")
+        response = self.client.post("/rest/book/", {"title": "Facet Book", "category": "historical",
+                                                    "description": "Facet.", "author": "Facet Author"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.get_count("category", "historical"), count + 1)
+        self.assertEqual(self.get_facets()["author"].get("Facet Author"), 1)
+        self.assertFalse(Job.objects.filter(name="change_facet_counts").exists())
+
+    def test_update_moves_count(self):
+        book = self.create_book("Moved Book", author="Before")
+        response = self.client.patch(f"/rest/book/{book.id}/", {"author": "After", "category": "educational"},
+                                     format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_count("author", "Before"), 0)
+        self.assertEqual(self.get_count("author", "After"), 1)
+        self.assertEqual(self.get_count("category", "educational"),
+                         Book.objects.filter(category="educational").count())
+
+    def test_delete_uncounts_book(self):
+        book = self.create_book("Deleted Book", author="Gone")
+        self.assertEqual(self.client.delete(f"/rest/book/{book.id}/").status_code, 200)
+        self.assertEqual(self.get_count("author", "Gone"), 0)
+        self.assertNotIn("Gone", self.get_facets()["author"])
+
+    def test_category_page_count(self):
+        self.create_book("Counted Book", category="historical")
+        response = self.client.get("/rest/book/", {"category": "historical", "cursor": "", "count": "true"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["Count"], Book.objects.filter(category="historical").count())
+
+    def test_invalid_limit(self):
+        for limit in ("0", "-1", "many"):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.client.get("/rest/book/facets/", {"limit": limit}).status_code, 400)
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from common.jobs import claim_jobs, enqueue, run_job, task
+from db.models import Job
+
+calls = []
+
+
+@task("test_record")
+def record(value):
+    calls.append(value)
+
+
+@task("test_fail")
+def fail():
+    raise RuntimeError("Failed on purpose.")
+
+
+@override_settings(JOB_QUEUE_EAGER=False, JOB_MAX_ATTEMPTS=3, JOB_RETRY_DELAY=10, JOB_VISIBILITY_TIMEOUT=60)
+class JobQueueTest(TestCase):
+    """
+    Tests of the background job queue run by the workers.
+    """
+
+    def setUp(self):
+        calls.clear()
+
+    @staticmethod
+    def expire(job):
+        Job.objects.filter(id=job.id).update(locked_until=timezone.now() - timedelta(seconds=1))
+
+    @staticmethod
+    def make_due(job):
+        Job.objects.filter(id=job.id).update(run_at=timezone.now())
+
+    def test_claim(self):
+        first, second = enqueue("test_record", {"value": 1}), enqueue("test_record", {"value": 2})
+        jobs = claim_jobs("worker-1", 10)
+        self.assertEqual([job.id for job in jobs], [first.id, second.id])
+        self.assertTrue(all(job.status == Job.JobStatus.running and job.attempts == 1 and
+                            job.locked_by == "worker-1" for job in jobs))
+        self.assertEqual(claim_jobs("worker-2", 10), [])
+
+    def test_claim_limit_and_delay(self):
+        due = enqueue("test_record", {"value": 1})
+        enqueue("test_record", {"value": 2})
+        enqueue("test_record", {"value": 3}, delay=60)
+        self.assertEqual([job.id for job in claim_jobs("worker-1", 1)], [due.id])
+        self.assertEqual(len(claim_jobs("worker-1", 10)), 1)
+        self.assertEqual(claim_jobs("worker-1", 10), [])
+
+    def test_run_removes_job(self):
+        enqueue("test_record", {"value": 1})
+        job, = claim_jobs("worker-1", 10)
+        self.assertTrue(run_job(job, "worker-1"))
+        self.assertEqual(calls, [1])
+        self.assertFalse(Job.objects.filter(id=job.id).exists())
+
+    def test_retry_backoff(self):
+        enqueue("test_fail")
+        for attempt in (1, 2):
+            job, = claim_jobs("worker-1", 10)
+            started = timezone.now()
+            with self.assertLogs("common.jobs", "ERROR"):
+                self.assertFalse(run_job(job, "worker-1"))
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts), (Job.JobStatus.pending, attempt))
+            self.assertGreaterEqual(job.run_at, started + timedelta(seconds=10 * 2 ** (attempt - 1)))
+            self.assertIn("Failed on purpose.", job.last_error)
+            self.assertEqual(claim_jobs("worker-1", 10), [])
+            self.make_due(job)
+        job, = claim_jobs("worker-1", 10)
+        with self.assertLogs("common.jobs", "ERROR"):
+            self.assertFalse(run_job(job, "worker-1"))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.JobStatus.failed, 3))
+        self.make_due(job)
+        self.assertEqual(claim_jobs("worker-1", 10), [])
+
+    def test_visibility_timeout_reclaim(self):
+        enqueue("test_record", {"value": 1})
+        job, = claim_jobs("worker-1", 10)
+        self.expire(job)
+        reclaimed, = claim_jobs("worker-2", 10)
+        self.assertEqual((reclaimed.id, reclaimed.attempts, reclaimed.locked_by), (job.id, 2, "worker-2"))
+        # The first worker finishing late does not remove the job of the second one.
+        with self.assertLogs("common.jobs", "WARNING"):
+            self.assertFalse(run_job(job, "worker-1"))
+        self.assertTrue(Job.objects.filter(id=job.id, locked_by="worker-2").exists())
+        self.assertTrue(run_job(reclaimed, "worker-2"))
+        self.assertFalse(Job.objects.filter(id=job.id).exists())
+
+    def test_expired_job_runs_out_of_attempts(self):
+        enqueue("test_record", {"value": 1})
+        for _ in range(3):
+            job, = claim_jobs("worker-1", 10)
+            self.expire(job)
+        self.assertEqual(claim_jobs("worker-1", 10), [])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.JobStatus.failed, 3))
@@ -0,0 +1,81 @@
+import re
+
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from book_app.tests.test_views import BookAPITestCase
+from book_project.middleware import MetricsMiddleware
+from db.models import Book
+
+
+class MetricsAccessTest(TestCase):
+    """
+    Tests of the access to the ``/metrics`` endpoint.
+    """
+
+    @override_settings(METRICS_TOKEN="", METRICS_ALLOWED_NETWORKS=[])
+    def test_closed_by_default(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+
+    @override_settings(METRICS_TOKEN="", METRICS_ALLOWED_NETWORKS=["10.0.0.0/8"])
+    def test_allowed_networks(self):
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="10.1.2.3").status_code, 200)
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="203.0.113.7").status_code, 403)
+
+    @override_settings(METRICS_TOKEN="secret", METRICS_ALLOWED_NETWORKS=[])
+    def test_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code, 401)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("django_http_requests_total", response.content.decode())
+
+
+class ServerTimingTest(BookAPITestCase):
+    """
+    Tests of the ``Server-Timing`` header of sampled requests.
+    """
+
+    @override_settings(METRICS_SAMPLE_RATE=1.0)
+    def test_sampled_request(self):
+        response = self.client.get("/rest/book/")
+        self.assertEqual(response.status_code, 200)
+        timings = dict(re.match(r"(\w+);dur=([\d.]+)", part).groups() for part in response["Server-Timing"].split(", "))
+        self.assertEqual(set(timings), {"db", "serialize", "render", "total"})
+        self.assertGreater(float(timings["serialize"]), 0)
+        self.assertGreater(float(timings["render"]), 0)
+        self.assertGreaterEqual(float(timings["total"]), float(timings["db"]))
+        queries = int(re.search(r'desc="(\d+) queries"', response["Server-Timing"]).group(1))
+        self.assertGreater(queries, 0)
+
+    @override_settings(METRICS_SAMPLE_RATE=0.0)
+    def test_unsampled_request(self):
+        response = self.client.get("/rest/book/")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+
+@override_settings(METRICS_SAMPLE_RATE=1.0, METRICS_N_PLUS_ONE_THRESHOLD=5)
+class NPlusOneTest(TestCase):
+    """
+    Tests of the repeated queries logged as possible N+1 queries.
+    """
+
+    def get(self, repeats):
+        def view(request):
+            for book_id in range(repeats):
+                Book.objects.filter(id=book_id).exists()
+            return HttpResponse()
+        return MetricsMiddleware(view)(RequestFactory().get("/rest/book/"))
+
+    def test_repeated_query_logged(self):
+        with self.assertLogs("book_project.middleware", "WARNING") as logs:
+            response = self.get(5)
+        self.assertIn('desc="5 queries"', response["Server-Timing"])
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("Possible N+1 query in GET /rest/book/", logs.output[0])
+        self.assertIn("ran 5 times", logs.output[0])
+
+    def test_below_threshold(self):
+        with self.assertNoLogs("book_project.middleware", "WARNING"):
+            self.get(4)
@@ -0,0 +1,53 @@
+from django.conf import settings
+
+from book_app.tests.test_views import BookAPITestCase
+from db.models import Book
+
+
+class CursorPaginationTest(BookAPITestCase):
+    """
+    Tests of the book list paginated with cursors.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Enough books for a few pages next to the seeded ones.
+        for index in range(int(settings.DEFAULT_PAGE_SIZE) * 2):
+            cls.create_book(f"Paged Book {index}")
+
+    def get_page(self, cursor=""):
+        response = self.client.get("/rest/book/", {"cursor": cursor})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def walk(self, page, direction):
+        pages = [page]
+        while page[direction]:
+            page = self.get_page(page[direction])
+            pages.append(page)
+        return pages
+
+    def test_next_walks_every_book(self):
+        pages = self.walk(self.get_page(), "Next")
+        ids = [book["id"] for page in pages for book in page["Data"]]
+        self.assertEqual(ids, list(Book.objects.order_by("created", "id").values_list("id", flat=True)))
+        self.assertTrue(all(len(page["Data"]) == int(settings.DEFAULT_PAGE_SIZE) for page in pages[:-1]))
+        self.assertIsNone(pages[0]["Previous"])
+
+    def test_previous_walks_back(self):
+        forward = self.walk(self.get_page(), "Next")
+        backward = self.walk(forward[-1], "Previous")
+        self.assertEqual([[book["id"] for book in page["Data"]] for page in backward],
+                         [[book["id"] for book in page["Data"]] for page in reversed(forward)])
+
+    def test_added_book_does_not_shift_pages(self):
+        first = self.get_page()
+        self.create_book("Added While Paging")
+        second = self.get_page(first["Next"])
+        ids = list(Book.objects.order_by("created", "id").values_list("id", flat=True))
+        start = ids.index(first["Data"][-1]["id"]) + 1
+        self.assertEqual([book["id"] for book in second["Data"]], ids[start:start + len(second["Data"])])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get("/rest/book/", {"cursor": "not-a-cursor"}).status_code, 400)
@@ -0,0 +1,71 @@
+from django.contrib.auth.models import Group, Permission
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from book_app.tests.test_views import BookAPITestCase
+from common.checks import check_shared_cache
+from db.models import User
+
+
+class PermissionCacheTest(BookAPITestCase):
+    """
+    Tests of the cached permissions of a student, they are dropped when the groups change.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.student = User.objects.get(email="rupam@mail.com")
+        cls.group = Group.objects.get(name="Student")
+        cls.add_book = Permission.objects.get(codename="add_book")
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=self.student).key}")
+
+    def add(self, title):
+        return self.client.post("/rest/book/", {"title": title, "category": "story", "description": f"{title}.",
+                                                "author": "Tester"}, format="json")
+
+    def test_group_permission_added(self):
+        self.assertEqual(self.add("Refused Book").status_code, 403)
+        self.group.permissions.add(self.add_book)
+        self.assertEqual(self.add("Allowed Book").status_code, 201)
+        self.group.permissions.remove(self.add_book)
+        self.assertEqual(self.add("Refused Again Book").status_code, 403)
+
+    def test_user_removed_from_group(self):
+        self.assertEqual(self.client.get("/rest/book/").status_code, 200)
+        self.student.groups.remove(self.group)
+        self.assertEqual(self.client.get("/rest/book/").status_code, 403)
+        self.student.groups.add(self.group)
+        self.assertEqual(self.client.get("/rest/book/").status_code, 200)
+
+    def test_group_users_changed(self):
+        self.assertEqual(self.client.get("/rest/book/").status_code, 200)
+        self.group.user_set.remove(self.student)
+        self.assertEqual(self.client.get("/rest/book/").status_code, 403)
+        self.group.user_set.clear()
+        self.group.user_set.add(self.student)
+        self.assertEqual(self.client.get("/rest/book/").status_code, 200)
+
+
+class SharedCacheCheckTest(TestCase):
+    """
+    Tests of the check warning about a cache private to every process.
+    """
+
+    @override_settings(DEBUG=False)
+    def test_process_local_cache(self):
+        self.assertEqual([message.id for message in check_shared_cache(None)], ["book_project.W001"])
+
+    @override_settings(DEBUG=True)
+    def test_debug(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(DEBUG=False, CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": "/tmp/book_app_cache"}})
+    def test_shared_cache(self):
+        self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,76 @@
+import importlib
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.db import connection
+from django.test import override_settings
+from rest_framework.pagination import PageNumberPagination
+
+from book_app.tests.test_views import BookAPITestCase
+from db.models import BookSearchTerm
+
+
+@override_settings(SEARCH_BACKEND="index")
+class BookSearchTest(BookAPITestCase):
+    """
+    Tests of the book search over the inverted index.
+    """
+
+    def add_book(self, title, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/rest/book/", dict({"title": title, "category": "story",
+                                                             "description": f"{title}.", "author": "Tester"},
+                                                            **fields), format="json")
+        self.assertEqual(response.status_code, 201)
+        return response.json()["Data"]["id"]
+
+    def search(self, query, **params):
+        return self.client.get("/rest/book/search/", dict({"q": query}, **params))
+
+    def get_ids(self, query, **params):
+        response = self.search(query, **params)
+        self.assertEqual(response.status_code, 200)
+        return [book["id"] for book in response.json()["Data"]]
+
+    def test_saved_book_is_indexed(self):
+        book_id = self.add_book("Quixotic Zephyr")
+        self.assertEqual(self.get_ids("zephyr"), [book_id])
+        self.assertEqual(self.get_ids("QUIXOTIC"), [book_id])
+
+    def test_renamed_book_is_indexed_again(self):
+        book_id = self.add_book("Quixotic Zephyr")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/rest/book/{book_id}/", {"title": "Vermilion Harbor",
+                                                          "description": "Renamed."}, format="json")
+        self.assertEqual(self.get_ids("zephyr"), [])
+        self.assertEqual(self.get_ids("vermilion"), [book_id])
+
+    def test_ranking(self):
+        in_description = self.add_book("Plain Book", description="A story about zephyr winds.")
+        in_title = self.add_book("Zephyr Book")
+        in_title_and_author = self.add_book("Zephyr Winds", author="Quixotic")
+        self.assertEqual(self.get_ids("zephyr quixotic"), [in_title_and_author, in_title, in_description])
+
+    def test_stop_words_and_unknown_terms(self):
+        self.add_book("Quixotic Zephyr")
+        self.assertEqual(self.get_ids("the"), [])
+        self.assertEqual(self.get_ids("nonexistentterm"), [])
+        self.assertEqual(self.search("").status_code, 400)
+
+    def test_pagination(self):
+        page_size = int(PageNumberPagination().page_size)
+        ids = [self.add_book(f"Zephyr Volume {index}") for index in range(page_size + 2)]
+        self.assertEqual(self.search("zephyr").json()["Count"], page_size + 2)
+        pages = [self.get_ids("zephyr", page=page) for page in (1, 2)]
+        self.assertEqual([len(page) for page in pages], [page_size, 2])
+        self.assertEqual(sorted(sum(pages, [])), sorted(ids))
+        self.assertEqual(self.search("zephyr", page=3).status_code, 404)
+
+    def test_migration_indexes_existing_books(self):
+        book_id = self.add_book("Quixotic Zephyr")
+        BookSearchTerm.objects.all().delete()
+        self.assertEqual(self.get_ids("zephyr"), [])
+        migration = importlib.import_module("db.migrations.0008_book_search_terms")
+        migration.index_existing_books(apps, SimpleNamespace(connection=connection))
+        self.assertEqual(self.get_ids("zephyr"), [book_id])
+        self.assertTrue(BookSearchTerm.objects.filter(book_id=book_id).exists())
@@ -0,0 +1,30 @@
+from django.test import TestCase
+
+from common.slug import allocate_slugs
+from db.fixtures import generate_books
+from db.models import Book
+
+
+class SeedBooksTest(TestCase):
+    """
+    Tests of the fake books added by the seeder.
+    """
+
+    def test_generated_slugs_are_unique(self):
+        existing = Book.objects.count()
+        generate_books(300, batch_size=50, pool_size=10)
+        self.assertEqual(Book.objects.count(), existing + 300)
+        self.assertEqual(Book.objects.values("slug").distinct().count(), existing + 300)
+
+    def test_known_suffixes_are_not_looked_up(self):
+        next_suffix = {}
+        self.assertEqual(allocate_slugs(["Seeded Title", "Seeded Title"], next_suffix=next_suffix),
+                         ["seeded-title", "seeded-title-2"])
+        with self.assertNumQueries(0):
+            self.assertEqual(allocate_slugs(["Seeded Title"], next_suffix=next_suffix), ["seeded-title-3"])
+
+    def test_numbered_title_moves_shared_suffix(self):
+        next_suffix = {}
+        allocate_slugs(["Acme", "Acme"], next_suffix=next_suffix)
+        self.assertEqual(allocate_slugs(["Acme 5"], next_suffix=next_suffix), ["acme-5"])
+        self.assertEqual(allocate_slugs(["Acme"], next_suffix=next_suffix), ["acme-6"])
@@ -0,0 +1,80 @@
+from book_app.tests.test_views import BookAPITestCase
+from common.slug import SLUG_MAX_LENGTH, allocate_slugs
+from db.models import Book, BookSlugRedirect
+
+
+class BookSlugTest(BookAPITestCase):
+    """
+    Tests of the slugs allocated to the books and the redirects of their previous slugs.
+    """
+
+    def add_book(self, title):
+        response = self.client.post("/rest/book/", {"title": title, "category": "story",
+                                                    "description": f"{title}.", "author": "Tester"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        return Book.objects.get(id=response.json()["Data"]["id"])
+
+    def rename(self, book, title):
+        response = self.client.patch(f"/rest/book/{book.id}/", {"title": title}, format="json")
+        self.assertEqual(response.status_code, 200)
+        book.refresh_from_db()
+        return book
+
+    def test_duplicate_titles_get_suffix(self):
+        slugs = [self.add_book("Same Title").slug for _ in range(3)]
+        self.assertEqual(slugs, ["same-title", "same-title-2", "same-title-3"])
+
+    def test_batch_allocation(self):
+        self.add_book("Batch Title")
+        self.assertEqual(allocate_slugs(["Batch Title", "Batch Title", "Other Title"]),
+                         ["batch-title-2", "batch-title-3", "other-title"])
+
+    def test_suffix_follows_largest_number(self):
+        self.add_book("Numbered Title")
+        self.add_book("Numbered Title 7")
+        self.add_book("Numbered Title 12")
+        self.assertEqual(self.add_book("Numbered Title").slug, "numbered-title-13")
+        self.assertEqual(allocate_slugs(["Numbered Title 14", "Numbered Title", "Numbered Title"]),
+                         ["numbered-title-14", "numbered-title-15", "numbered-title-16"])
+
+    def test_allocation_queries_do_not_grow_with_duplicates(self):
+        for _ in range(20):
+            self.create_book("Common Title", slug=None)
+        # The taken bases of the books and the redirects, then the largest suffix.
+        with self.assertNumQueries(3):
+            self.assertEqual(allocate_slugs(["Common Title"]), ["common-title-21"])
+
+    def test_long_title_keeps_room_for_suffix(self):
+        title = "A very long book title filling every character here"[:50]
+        first, second = self.add_book(title), self.add_book(title)
+        self.assertLessEqual(len(first.slug), SLUG_MAX_LENGTH)
+        self.assertLessEqual(len(second.slug), SLUG_MAX_LENGTH)
+        self.assertTrue(second.slug.endswith("-2"))
+        self.assertNotEqual(first.slug, second.slug)
+
+    def test_rename_keeps_redirect(self):
+        book = self.rename(self.add_book("Old Name"), "New Name")
+        self.assertEqual(book.slug, "new-name")
+        response = self.client.get("/rest/book/old-name/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["Data"]["id"], book.id)
+        self.client.force_login(self.admin)
+        response = self.client.get("/book/old-name")
+        self.assertRedirects(response, "/book/new-name", status_code=301)
+
+    def test_update_without_rename_keeps_slug(self):
+        book = self.add_book("Kept Name")
+        self.client.patch(f"/rest/book/{book.id}/", {"author": "Someone Else"}, format="json")
+        book.refresh_from_db()
+        self.assertEqual(book.slug, "kept-name")
+        self.assertFalse(BookSlugRedirect.objects.filter(book=book).exists())
+
+    def test_previous_slug_is_not_reused(self):
+        self.rename(self.add_book("Taken Name"), "Moved Name")
+        self.assertEqual(self.add_book("Taken Name").slug, "taken-name-2")
+
+    def test_rename_back(self):
+        book = self.rename(self.rename(self.add_book("First Name"), "Second Name"), "First Name")
+        self.assertEqual(book.slug, "first-name")
+        self.assertEqual(list(BookSlugRedirect.objects.filter(book=book).values_list("slug", flat=True)),
+                         ["second-name"])
@@ -0,0 +1,60 @@
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from book_app.tests.test_views import BookAPITestCase
+
+
+class SparseFieldsTest(BookAPITestCase):
+    """
+    Tests of the book responses narrowed by the ``fields`` and ``exclude`` query params.
+    """
+
+    def get_books(self, path="/rest/book/", **params):
+        response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["Data"]
+
+    def test_fields_narrow_list(self):
+        with CaptureQueriesContext(connection) as queries:
+            books = self.get_books(fields="id,title")
+        self.assertTrue(books)
+        self.assertTrue(all(set(book) == {"id", "title"} for book in books))
+        book_query = next(query["sql"] for query in queries if 'FROM "db_book"' in query["sql"]
+                          and "COUNT" not in query["sql"])
+        self.assertNotIn('"description"', book_query)
+
+    def test_exclude_narrows_list(self):
+        books = self.get_books(exclude="description, slug")
+        self.assertTrue(all(set(book) == {"id", "title", "category", "author"} for book in books))
+
+    def test_fields_narrow_other_lists(self):
+        book = self.create_book("Sparse Book")
+        self.assertEqual(self.get_books(ids=str(book.id), fields="title"), [{"title": "Sparse Book"}])
+        books = self.get_books(cursor="", fields="id")
+        self.assertTrue(all(set(book) == {"id"} for book in books))
+        response = self.client.get("/rest/book/", {"stream": "ndjson", "fields": "id,slug"})
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertTrue(all(set(book) == {"id", "slug"} for book in lines[:-1]))
+        response = self.client.get("/rest/async/book/", {"fields": "author"})
+        self.assertTrue(all(set(book) == {"author"} for book in response.json()["Data"]))
+
+    def test_unknown_fields(self):
+        for params in ({"fields": "id,price"}, {"exclude": "price"}, {"ids": "1", "fields": "price"},
+                       {"stream": "ndjson", "fields": "price"}):
+            with self.subTest(params=params):
+                response = self.client.get("/rest/book/", params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()["Error"], {"fields": "Unknown fields price."})
+
+    def test_cache_key_per_field_set(self):
+        full = self.client.get("/rest/book/")
+        narrow = self.client.get("/rest/book/", {"fields": "id,title"})
+        self.assertNotEqual(full["ETag"], narrow["ETag"])
+        self.assertEqual(set(narrow.json()["Data"][0]), {"id", "title"})
+        again = self.client.get("/rest/book/")
+        self.assertEqual(again["ETag"], full["ETag"])
+        self.assertEqual(set(again.json()["Data"][0]), {"id", "title", "category", "description", "author", "slug"})
+        self.assertEqual(self.client.get("/rest/book/", {"fields": "id,title"}, HTTP_IF_NONE_MATCH=narrow["ETag"])
+                         .status_code, 304)
@@ -0,0 +1,49 @@
+import gzip
+import os
+import tempfile
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.utils.http import http_date
+
+from book_project.middleware import StaticFilesMiddleware
+
+
+class StaticFilesTest(SimpleTestCase):
+    """
+    Tests of the static files served by ``StaticFilesMiddleware``.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "style.css")
+        with open(path, "w") as file:
+            file.write("body { color: black; }" * 20)
+        with gzip.open(path + ".gz", "wb") as file:
+            file.write(b"body { color: black; }" * 20)
+        self.modified = 1600000000
+        os.utime(path, (self.modified, self.modified))
+        # The variant is saved by collectstatic after the file.
+        os.utime(path + ".gz", (self.modified + 100, self.modified + 100))
+        with override_settings(STATIC_ROOT=directory.name, STATIC_URL="/static/", STATIC_SERVE=True):
+            self.middleware = StaticFilesMiddleware(lambda request: HttpResponse(status=404))
+
+    def get(self, **headers):
+        return self.middleware(RequestFactory().get("/static/style.css", **headers))
+
+    def test_variant_has_time_of_file(self):
+        for encoding in ("gzip", "identity"):
+            with self.subTest(encoding=encoding):
+                response = self.get(HTTP_ACCEPT_ENCODING=encoding)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response["Last-Modified"], http_date(self.modified))
+                response.close()
+                response = self.get(HTTP_ACCEPT_ENCODING=encoding, HTTP_IF_MODIFIED_SINCE=http_date(self.modified))
+                self.assertEqual(response.status_code, 304)
+
+    def test_gzip_variant(self):
+        response = self.get(HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), b"body { color: black; }" * 20)
+        response.close()
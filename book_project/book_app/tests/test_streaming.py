@@ -0,0 +1,55 @@
+import json
+from unittest import mock
+
+from book_app.tests.test_views import BookAPITestCase
+from db.models import Book
+
+
+class BookStreamTest(BookAPITestCase):
+    """
+    Tests of the book list streamed as JSON or JSON Lines.
+    """
+
+    def get_stream(self, stream, **params):
+        response = self.client.get("/rest/book/", dict({"stream": stream}, **params))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def get_lines(self, **params):
+        return [json.loads(line) for line in self.get_stream("ndjson", **params).splitlines()]
+
+    def test_ndjson_lines_and_trailer(self):
+        lines = self.get_lines(page_size=10)
+        self.assertEqual(len(lines), 11)
+        books, trailer = lines[:-1], lines[-1]
+        self.assertEqual([book["id"] for book in books],
+                         list(Book.objects.order_by("created", "id").values_list("id", flat=True)[:10]))
+        self.assertIsNotNone(trailer["Next"])
+        self.assertIn("Message", trailer)
+
+    def test_ndjson_follows_next_cursor(self):
+        ids, cursor = [], ""
+        while cursor is not None:
+            lines = self.get_lines(page_size=10, cursor=cursor)
+            ids.extend(book["id"] for book in lines[:-1])
+            cursor = lines[-1]["Next"]
+        self.assertEqual(ids, list(Book.objects.order_by("created", "id").values_list("id", flat=True)))
+
+    def test_json_document(self):
+        body = json.loads(self.get_stream("json", page_size=5))
+        self.assertEqual(len(body["Data"]), 5)
+        self.assertIsNotNone(body["Next"])
+        body = json.loads(self.get_stream("json", page_size=Book.objects.count()))
+        self.assertEqual(len(body["Data"]), Book.objects.count())
+        self.assertIsNone(body["Next"])
+
+    def test_page_size_limit(self):
+        with mock.patch("book_app.views.STREAM_MAX_PAGE_SIZE", 3):
+            self.assertEqual(len(self.get_lines(page_size=100)), 4)
+
+    def test_invalid_page_size(self):
+        for page_size in ("0", "-1", "many"):
+            response = self.client.get("/rest/book/", {"stream": "ndjson", "page_size": page_size})
+            self.assertEqual(response.status_code, 400, page_size)
+            self.assertEqual(response.json()["Error"], {"page_size": "A valid positive integer is required."})
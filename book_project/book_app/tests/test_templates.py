@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+
+from book_app.tests.test_views import BookAPITestCase
+from common.cache import bump_catalogue_generation
+from common.form import get_book_form_html
+from db.models import Book
+
+
+class BookFragmentTest(BookAPITestCase):
+    """
+    Tests of the cached fragments of the book pages, the key of a row includes the time the book was updated.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.admin)
+        self.book = Book.objects.order_by("created", "id").first()
+
+    def edit(self, **fields):
+        data = {"title": self.book.title, "category": self.book.category, "description": self.book.description,
+                "author": self.book.author}
+        data.update(fields)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f"/bookEdit/{self.book.slug}", data)
+        self.assertEqual(response.status_code, 302)
+        self.book.refresh_from_db()
+
+    def test_row_is_cached(self):
+        self.assertContains(self.client.get("/"), self.book.title)
+        key = make_template_fragment_key("book_row", [self.book.id, self.book.updated])
+        self.assertIn(self.book.title, cache.get(key))
+        cache.set(key, "<td>Cached Row</td>")
+        # A new generation renders the page again, the row comes from its fragment.
+        bump_catalogue_generation()
+        self.assertContains(self.client.get("/"), "Cached Row")
+
+    def test_edit_changes_row(self):
+        title = self.book.title
+        self.assertContains(self.client.get("/"), title)
+        key = make_template_fragment_key("book_row", [self.book.id, self.book.updated])
+        self.edit(title="Edited Fragment Title", author="Edited Author")
+        response = self.client.get("/")
+        self.assertContains(response, "Edited Fragment Title")
+        self.assertContains(response, "Edited Author")
+        self.assertNotContains(response, f">{title}</a>")
+        self.assertNotEqual(make_template_fragment_key("book_row", [self.book.id, self.book.updated]), key)
+
+    def test_edit_changes_detail(self):
+        self.assertContains(self.client.get(f"/book/{self.book.slug}"), self.book.title)
+        self.edit(description="Edited fragment description.")
+        self.assertContains(self.client.get(f"/book/{self.book.slug}"), "Edited fragment description.")
+
+    def test_form_rendered_once(self):
+        get_book_form_html.cache_clear()
+        self.addCleanup(get_book_form_html.cache_clear)
+        for _ in range(2):
+            self.assertContains(self.client.get("/"), get_book_form_html(), html=False)
+        self.assertEqual(get_book_form_html.cache_info().misses, 1)
@@ -0,0 +1,67 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from db.models import Book, User
+
+
+class BookAPITestCase(TestCase):
+    """
+    Base class of the book REST API tests, the client is authenticated by the token of the admin user.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.get(email="admin@mail.com")
+        cls.token = Token.objects.create(user=cls.admin)
+
+    def setUp(self):
+        # The catalogue generation is bumped on commit, which never happens in a test.
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    @staticmethod
+    def create_book(title, **fields):
+        return Book.objects.create(**dict({"title": title, "category": "story", "description": f"{title}.",
+                                           "author": "Tester"}, **fields))
+
+
+class BookPermissionTest(BookAPITestCase):
+    """
+    Tests of the request methods mapped to the book permissions.
+    """
+
+    def test_head(self):
+        book = self.create_book("Head Book")
+        self.assertEqual(self.client.head(f"/rest/book/{book.id}/").status_code, 200)
+
+    def test_options_not_allowed(self):
+        self.assertEqual(self.client.options("/rest/book/").status_code, 405)
+
+
+class BookImportTest(BookAPITestCase):
+    """
+    Tests of the bulk import of books.
+    """
+
+    def test_import(self):
+        response = self.client.post("/rest/book/bulk/", [{"title": "Imported Book", "category": "story",
+                                                          "description": "Imported.", "author": "Tester"}],
+                                    format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Book.objects.filter(title="Imported Book").exists())
+
+    def test_empty_body(self):
+        for content_type in ("text/csv", "application/x-ndjson", "application/json"):
+            with self.subTest(content_type=content_type):
+                response = self.client.post("/rest/book/bulk/", content_type=content_type)
+                self.assertEqual(response.status_code, 400)
+
+    def test_record_not_object(self):
+        response = self.client.post("/rest/book/bulk/", [["Listed Book"]], format="json")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post("/rest/book/bulk/", b'"Lined Book"\n', content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Book.objects.filter(title__in=["Listed Book", "Lined Book"]).exists())
@@ -1,5 +1,6 @@
 from django.urls import path
 
+from book_app.async_views import AsyncBookAPIView, AsyncBookDetailAPIView
 from book_app.views import BookAPIView, BookView, BookEditView, BookDeleteView
 from rest_framework import routers
 
@@ -11,7 +12,10 @@ urlpatterns = [
     path('', BookView.as_view(),name="book_view"),
     path("book/<slug>", BookView.as_view(), name="book_detail"),
     path("bookEdit/<slug>", BookEditView.as_view(), name="book_edit"),
-    path("bookDelete/<slug>", BookDeleteView.as_view(), name="book_delete")
+    path("bookDelete/<slug>", BookDeleteView.as_view(), name="book_delete"),
+    # Async routes of the book REST API for ASGI servers.
+    path("rest/async/book/", AsyncBookAPIView.as_view(), name="async_book"),
+    path("rest/async/book/<_book>/", AsyncBookDetailAPIView.as_view(), name="async_book_detail"),
 ]
 urlpatterns += router.urls
 
@@ -1,30 +1,42 @@
 from django.contrib import messages
-from django.db.models import Q
+from django.db.models import F, Q
+from django.http import StreamingHttpResponse
 from django.shortcuts import render, redirect
-from rest_framework.authentication import TokenAuthentication
-from rest_framework.exceptions import ValidationError
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from django.db import transaction, IntegrityError
+from django.db import router, transaction, IntegrityError
 
-from book_project.settings import DEFAULT_PAGE_SIZE
+from book_project.settings import (BATCH_MAX_SIZE, DEFAULT_PAGE_SIZE, FRAGMENT_CACHE_TIMEOUT, STREAM_CHUNK_SIZE,
+                                   STREAM_MAX_PAGE_SIZE)
+from common.authentication import CachedTokenAuthentication
+from common.bulk import export_books, import_books, read_records
+from common.cache import (cached_response, get_catalogue_cache_key, get_catalogue_modified, get_last_modified,
+                          get_or_build)
 from common.constant import constants
-from common.form import BookForm
+from common.facet import filter_books, get_facet_count, get_facets, AUTHOR_FACET_LIMIT
+from common.form import BookForm, get_book_form_html
+from common.pagination import CountedPageNumberPagination, KeysetPagination
 from common.permission import BookPermission
+from common.router import read_from_replica
+from common.search import get_search_backend
+from common.slug import get_book_by_slug
+from common.streaming import stream_json, stream_ndjson
 from common.serializer import BookSerializer
 from db.models import Book
 from django.views.generic import View
-from django.core.paginator import Paginator
+from django.core.paginator import Page, Paginator
 from django.contrib.auth.mixins import LoginRequiredMixin
 
 class BaseViewMixin(ViewSet):
     """
     Base Mixin class.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated, BookPermission]
     lookup_field = '_book'
 
@@ -38,16 +50,81 @@ class BookAPIView(BaseViewMixin):
     ``update`` to update book.
     ``partial_update`` to partially update book.
     ``destroy`` to delete book.
+    ``search`` to search book.
+    ``facets`` to fetch number of books per category and author.
+    ``bulk`` to import many books.
+    ``export`` to export every book.
+    ``bulk_update`` to partially update many books.
+    ``bulk_delete`` to delete many books.
     """
 
     @classmethod
-    def _get_query(cls, attr):
+    def _get_many_query(cls, attrs):
         """
-        class method of class to generate the model query.
-        param attr: A object attribute to create query.
+        class method of class to generate the model query of many objects, numeric attributes are matched
+        as ids and the others as slugs or titles, each with one ``IN``.
+        param attrs: A list of object attributes to create query.
+        type attrs: list
+        """
+        ids = [attr for attr in attrs if attr.isnumeric()]
+        names = [attr for attr in attrs if not attr.isnumeric()]
+        return Q(id__in=ids) | Q(slug__in=names) | Q(title__in=names)
+
+    @classmethod
+    def _get_books(cls, attrs, queryset=None):
+        """
+        class method of class to fetch many books by id, slug or title with one query, the books are matched
+        like ``_get_book`` does and the previous slugs of renamed books are only looked up for the missing ones.
+        Returns a mapping of the attribute to its book, attributes matching no book are left out.
+        param attrs: A list of object attributes to fetch books.
+        type attrs: list
+        param queryset: A book queryset, e.g. with sparse fields, it must load the slug and title.
+        type queryset: QuerySet
+        """
+        queryset = Book.objects.all() if queryset is None else queryset
+        by_id, by_slug, by_title = {}, {}, {}
+        # Newest first, so the oldest book wins a title shared by many books.
+        for book in queryset.filter(cls._get_many_query(attrs)).order_by("-id"):
+            by_id[str(book.id)] = by_slug[book.slug] = by_title[book.title] = book
+        books = {}
+        for attr in attrs:
+            book = by_id.get(attr) if attr.isnumeric() else by_slug.get(attr) or by_title.get(attr)
+            if book is not None:
+                books[attr] = book
+        missing = [attr for attr in attrs if attr not in books and not attr.isnumeric()]
+        if missing:
+            for book in queryset.filter(slug_redirects__slug__in=missing).annotate(
+                    previous_slug=F("slug_redirects__slug")):
+                books[book.previous_slug] = book
+        return books
+
+    @staticmethod
+    def _get_batch(items):
+        """
+        static method of class to validate the items of a batch request, the body is a JSON list
+        of at most ``BATCH_MAX_SIZE`` items.
+        param items: The parsed request body.
+        type items: list
+        """
+        if not isinstance(items, list) or not items:
+            raise ValidationError("Expected a list of books.")
+        if len(items) > BATCH_MAX_SIZE:
+            raise ValidationError(f"Expected at most {BATCH_MAX_SIZE} books.")
+        return items
+
+    @classmethod
+    def _get_book(cls, attr):
+        """
+        class method of class to fetch the book by id, slug or title.
+        The unique slug index is tried first, the title is only looked up when no slug matches
+        and the previous slugs of renamed books last.
+        param attr: A object attribute to fetch book.
         type attr: str
         """
-        return (Q(id=attr)) if attr.isnumeric() else (Q(title=attr) | Q(slug=attr))
+        if attr.isnumeric():
+            return Book.objects.get(id=attr)
+        book = Book.objects.filter(slug=attr).first() or Book.objects.filter(title=attr).order_by("id").first()
+        return book if book is not None else get_book_by_slug(attr)
 
     def create(self, request):
         """
@@ -80,6 +157,86 @@ class BookAPIView(BaseViewMixin):
                              constants["Message"]: constants["SomethingWentWrong"].format("adding book")},
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @staticmethod
+    def _get_list_data(request):
+        """
+        static method of class to build the book list response data and its last modified time.
+        param request: A request object consists of query param value.
+        type request: request
+        """
+        params = request.query_params
+        if params.get("ids") or params.get("slugs"):
+            return BookAPIView._get_many_data(params)
+        books, fields = BookSerializer.sparse(filter_books(Book.objects.all(), params), params)
+        if KeysetPagination.is_requested(request):
+            page = KeysetPagination(get_count=lambda: get_facet_count(params)).paginate_queryset(books, request)
+            data = {"Data": BookSerializer(page, many=True, fields=fields).data,
+                    "Next": page.next_cursor, "Previous": page.previous_cursor}
+            if page.count is not None:
+                data["Count"] = page.count
+        else:
+            page = CountedPageNumberPagination(get_count=lambda: get_facet_count(params)).paginate_queryset(
+                books.order_by("created", "id"), request)
+            data = {"Data": BookSerializer(page, many=True, fields=fields).data}
+        data[constants["Message"]] = constants["SuccessfullyFetched"].format(" ".join([
+            constants["Book"].capitalize(), "list"]))
+        return data, get_catalogue_modified()
+
+    @classmethod
+    def _get_many_data(cls, params):
+        """
+        class method of class to build the response data of the books given by the comma separated
+        ``ids`` and ``slugs`` query params, in the given order, and its last modified time.
+        param params: The query params of the request.
+        type params: QueryDict
+        """
+        ids = [attr.strip() for attr in params.get("ids", "").split(",") if attr.strip()]
+        slugs = [attr.strip().lower() for attr in params.get("slugs", "").split(",") if attr.strip()]
+        if not all(attr.isnumeric() for attr in ids):
+            raise ValidationError({"ids": "A comma separated list of integers is required."})
+        attrs = cls._get_batch(list(dict.fromkeys(ids + slugs)))
+        queryset, fields = BookSerializer.sparse(Book.objects.all(), params, keep=("slug", "title"))
+        books = cls._get_books(attrs, queryset)
+        found = list({books[attr].id: books[attr] for attr in attrs if attr in books}.values())
+        data = {"Data": BookSerializer(found, many=True, fields=fields).data,
+                "Missing": [attr for attr in attrs if attr not in books],
+                constants["Message"]: constants["SuccessfullyFetched"].format(" ".join([
+                    constants["Book"].capitalize(), "list"]))}
+        return data, get_catalogue_modified()
+
+    @staticmethod
+    def _get_list_stream(request):
+        """
+        static method of class to stream the book list page as JSON or JSON Lines,
+        query param ``page_size`` is bounded by ``STREAM_MAX_PAGE_SIZE``.
+        param request: A request object consists of query param value.
+        type request: request
+        """
+        try:
+            page_size = int(request.query_params.get("page_size") or DEFAULT_PAGE_SIZE)
+            if page_size < 1:
+                raise ValueError(page_size)
+        except ValueError:
+            raise ValidationError({"page_size": "A valid positive integer is required."})
+        page_size = min(page_size, STREAM_MAX_PAGE_SIZE)
+        # The rows are read once the response is iterated, after ``read_from_replica`` returned,
+        # so the database is chosen now.
+        books = Book.objects.using(router.db_for_read(Book))
+        books, fields = BookSerializer.sparse(filter_books(books, request.query_params), request.query_params)
+        paginator = KeysetPagination(page_size=page_size)
+        books = paginator.iterate_queryset(books, request, chunk_size=STREAM_CHUNK_SIZE)
+        serializer = BookSerializer(fields=fields)
+
+        def trailer():
+            return {"Next": paginator.next_cursor,
+                    constants["Message"]: constants["SuccessfullyFetched"].format(" ".join([
+                        constants["Book"].capitalize(), "list"]))}
+        if request.query_params["stream"] == "ndjson":
+            return StreamingHttpResponse(stream_ndjson(books, serializer, trailer),
+                                         content_type="application/x-ndjson")
+        return StreamingHttpResponse(stream_json(books, serializer, trailer), content_type="application/json")
+
+    @read_from_replica
     def list(self, request):
         """
         This method includes business logic to fetch list of book.
@@ -87,17 +244,226 @@ class BookAPIView(BaseViewMixin):
         :type request: request
         """
         try:
-            books = Book.objects.all()
+            if request.query_params.get("stream") in ("json", "ndjson"):
+                return self._get_list_stream(request)
+            return cached_response(request, lambda: self._get_list_data(request))
+        except ValidationError as err:
+            return Response({constants["Error"]: err.args[0],
+                             constants["Message"]: constants["ErrorMessage"].format("fetching book list")},
+                            status=status.HTTP_400_BAD_REQUEST)
+        except Exception as err:
+            return Response({constants["Error"]: str(err),
+                             constants["Message"]: constants["SomethingWentWrong"].format("fetching book list")},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        This method includes business logic to search book by title, author and description.
+        :param request: A request object consists of query param value.
+        :type request: request
+        """
+        try:
+            query = request.query_params.get("q", "").strip()
+            if not query:
+                raise ValidationError({"q": "This query param is required."})
             paginator = PageNumberPagination()
-            return Response({"Data": BookSerializer(paginator.paginate_queryset(books, request), many=True).data,
+            books = paginator.paginate_queryset(get_search_backend().search(query), request)
+            return Response({"Data": BookSerializer(books, many=True).data,
+                             "Count": paginator.page.paginator.count,
                              constants["Message"]: constants["SuccessfullyFetched"].format(" ".join([
-                                 constants["Book"].capitalize(), "list"]))},
+                                 constants["Book"].capitalize(), "search result"]))},
                             status=status.HTTP_200_OK)
+        except ValidationError as err:
+            return Response({constants["Error"]: err.args[0],
+                             constants["Message"]: constants["ErrorMessage"].format("searching book")},
+                            status=status.HTTP_400_BAD_REQUEST)
+        except NotFound as err:
+            return Response({constants["Error"]: err.detail,
+                             constants["Message"]: constants["ErrorMessage"].format("searching book")},
+                            status=status.HTTP_404_NOT_FOUND)
         except Exception as err:
             return Response({constants["Error"]: str(err),
-                             constants["Message"]: constants["SomethingWentWrong"].format("fetching book list")},
+                             constants["Message"]: constants["SomethingWentWrong"].format("searching book")},
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @action(detail=False, methods=["get"])
+    def facets(self, request):
+        """
+        This method includes business logic to fetch the number of books per category and of the authors
+        with most books, query param ``limit`` is the number of authors.
+        :param request: A request object consists of query param value.
+        :type request: request
+        """
+        try:
+            limit = int(request.query_params.get("limit") or AUTHOR_FACET_LIMIT)
+            if limit < 1:
+                raise ValueError(limit)
+            return cached_response(request, lambda: ({
+                "Data": get_facets(author_limit=limit),
+                constants["Message"]: constants["SuccessfullyFetched"].format(" ".join([
+                    constants["Book"].capitalize(), "facets"]))}, None))
+        except ValueError:
+            return Response({constants["Error"]: {"limit": "A valid positive integer is required."},
+                             constants["Message"]: constants["ErrorMessage"].format("fetching book facets")},
+                            status=status.HTTP_400_BAD_REQUEST)
+        except Exception as err:
+            return Response({constants["Error"]: str(err),
+                             constants["Message"]: constants["SomethingWentWrong"].format("fetching book facets")},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @classmethod
+    def _get_detail_data(cls, _book):
+        """
+        class method of class to build the book detail response data and its last modified time.
+        param _book: A unique value for model object.
+        type _book: str
+        """
+        book = cls._get_book(_book)
+        return ({"Data": BookSerializer(book).data,
+                 constants["Message"]: constants["SuccessfullyFetched"].format(constants["Book"])},
+                get_last_modified([book]))
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """
+        This method includes business logic to import many books at once, the body is
+        a JSON list, JSON Lines (``application/x-ndjson``) or CSV (``text/csv``).
+        Query param ``update`` updates the books whose slug already exists.
+        :param request: A request object consists of query param value.
+        :type request: request
+        """
+        try:
+            # The stream of an empty body is None.
+            if request.stream is None:
+                raise ValidationError("Expected a list of books.")
+            if request.content_type.startswith("text/csv"):
+                records = read_records(request.stream, "csv")
+            elif request.content_type.startswith("application/x-ndjson"):
+                records = read_records(request.stream, "jsonl")
+            elif isinstance(request.data, list):
+                records = request.data
+            else:
+                raise ValidationError("Expected a list of books.")
+            result = import_books(records, update=request.query_params.get("update") in ("true", "1"),
+                                  batch_size=int(request.query_params.get("batch_size", 0)) or None)
+            return Response({"Data": result,
+                             constants["Message"]: constants["SuccessfullyAdded"].format(" ".join([
+                                 str(result["Created"] + result["Updated"]), constants["Book"]]))},
+                            status=status.HTTP_207_MULTI_STATUS if result["Errors"] else status.HTTP_201_CREATED)
+        except (ValidationError, ValueError) as err:
+            return Response({constants["Error"]: err.args[0],
+                             constants["Message"]: constants["ErrorMessage"].format("importing book")},
+                            status=status.HTTP_400_BAD_REQUEST)
+        except Exception as err:
+            return Response({constants["Error"]: str(err),
+                             constants["Message"]: constants["SomethingWentWrong"].format("importing book")},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """
+        This method includes business logic to stream every book as JSON Lines,
+        or CSV with query param ``file_type=csv``.
+        :param request: A request object consists of query param value.
+        :type request: request
+        """
+        file_type = "csv" if request.query_params.get("file_type") == "csv" else "jsonl"
+        response = StreamingHttpResponse(export_books(file_type),
+                                         content_type="text/csv" if file_type == "csv" else "application/x-ndjson")
+        response["Content-Disposition"] = f'attachment; filename="books.{file_type}"'
+        return response
+
+    @action(detail=False, methods=["patch"])
+    def bulk_update(self, request):
+        """
+        This method includes business logic to partially update many books in one transaction, the body is
+        a JSON list of books whose ``id`` is the id, slug or title of the book. The books are fetched
+        with one query and the result of every book is returned.
+        :param request: A request object consists of query param value.
+        :type request: request
+        """
+        try:
+            items = self._get_batch(request.data)
+            if not all(isinstance(item, dict) and str(item.get("id") or "") for item in items):
+                raise ValidationError("Expected an id in every book.")
+            books = self._get_books([str(item["id"]) for item in items])
+            with transaction.atomic():
+                results = [self._update_item(books.get(str(item["id"])), item) for item in items]
+            return Response({"Data": results,
+                             constants["Message"]: constants["SuccessfullyUpdated"].format(" ".join([
+                                 str(sum(result["Status"] == status.HTTP_200_OK for result in results)),
+                                 constants["Book"]]))},
+                            status=self._get_batch_status(results))
+        except ValidationError as err:
+            return Response({constants["Error"]: err.args[0],
+                             constants["Message"]: constants["ErrorMessage"].format(constants["UpdatingBook"])},
+                            status=status.HTTP_400_BAD_REQUEST)
+        except Exception as err:
+            return Response({constants["Error"]: str(err),
+                             constants["Message"]: constants["SomethingWentWrong"].format(constants["UpdatingBook"])},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @staticmethod
+    def _update_item(book, item):
+        """
+        static method of class to update one book of the batch in a savepoint, so a failing book
+        does not roll back the others.
+        """
+        if book is None:
+            return {"id": item["id"], "Status": status.HTTP_404_NOT_FOUND,
+                    constants["Error"]: constants["DoseNotExist"].format(constants["Book"].capitalize())}
+        serializer = BookSerializer(data={key: value for key, value in item.items() if key != "id"}, partial=True)
+        if not serializer.is_valid():
+            return {"id": item["id"], "Status": status.HTTP_400_BAD_REQUEST, constants["Error"]: serializer.errors}
+        try:
+            with transaction.atomic():
+                book = serializer.update(book, serializer.validated_data)
+        except IntegrityError:
+            return {"id": item["id"], "Status": status.HTTP_400_BAD_REQUEST,
+                    constants["Error"]: constants["AlreadyExist"].format(" ".join([book.title, constants["Book"]]))}
+        return {"id": item["id"], "Status": status.HTTP_200_OK, "Data": BookSerializer(book).data}
+
+    @action(detail=False, methods=["delete"])
+    def bulk_delete(self, request):
+        """
+        This method includes business logic to delete many books in one transaction, the body is a JSON list
+        of ids, slugs or titles. The books are fetched with one query and the result of every book is returned.
+        :param request: A request object consists of query param value.
+        :type request: request
+        """
+        try:
+            attrs = [str(attr) for attr in self._get_batch(request.data)]
+            books = self._get_books(attrs)
+            with transaction.atomic():
+                Book.objects.filter(id__in={book.id for book in books.values()}).delete()
+            results = [{"id": attr, "Status": status.HTTP_200_OK} if attr in books else
+                       {"id": attr, "Status": status.HTTP_404_NOT_FOUND,
+                        constants["Error"]: constants["DoseNotExist"].format(constants["Book"].capitalize())}
+                       for attr in attrs]
+            return Response({"Data": results,
+                             constants["Message"]: constants["SuccessfullyDeleted"].format(" ".join([
+                                 str(len({book.id for book in books.values()})), constants["Book"]]))},
+                            status=self._get_batch_status(results))
+        except ValidationError as err:
+            return Response({constants["Error"]: err.args[0],
+                             constants["Message"]: constants["ErrorMessage"].format("deleting book")},
+                            status=status.HTTP_400_BAD_REQUEST)
+        except Exception as err:
+            return Response({constants["Error"]: str(err),
+                             constants["Message"]: constants["SomethingWentWrong"].format("deleting book")},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @staticmethod
+    def _get_batch_status(results):
+        """
+        static method of class to get the status of a batch response, multi status when any book failed.
+        """
+        if all(result["Status"] == status.HTTP_200_OK for result in results):
+            return status.HTTP_200_OK
+        return status.HTTP_207_MULTI_STATUS
+
+    @read_from_replica
     def retrieve(self, request, _book):
         """
          This method includes business logic to fetch book detail.
@@ -107,9 +473,7 @@ class BookAPIView(BaseViewMixin):
         type _book: str
         """
         try:
-            return Response({"Data": BookSerializer(Book.objects.get(self._get_query(_book))).data,
-                             constants["Message"]: constants["SuccessfullyFetched"].format(constants["Book"])},
-                            status=status.HTTP_200_OK)
+            return cached_response(request, lambda: self._get_detail_data(_book))
 
         except Book.DoesNotExist:
             return Response({constants["Error"]: constants["DoseNotExist"].format(constants["Book"].capitalize()),
@@ -132,7 +496,7 @@ class BookAPIView(BaseViewMixin):
             serializer = BookSerializer(data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
             with transaction.atomic():
-                book = serializer.update(Book.objects.get(self._get_query(_book)), serializer.validated_data)
+                book = serializer.update(self._get_book(_book), serializer.validated_data)
                 return Response({"Data": BookSerializer(book).data,
                                  constants["Message"]: constants["SuccessfullyUpdated"].format(
                                      constants["Book"].capitalize())}, status=status.HTTP_200_OK)
@@ -166,7 +530,7 @@ class BookAPIView(BaseViewMixin):
             serializer = BookSerializer(data=request.data)
             serializer.is_valid(raise_exception=True)
             with transaction.atomic():
-                book = serializer.update(Book.objects.get(self._get_query(_book)), serializer.validated_data)
+                book = serializer.update(self._get_book(_book), serializer.validated_data)
                 return Response({constants["Data"]: BookSerializer(book).data,
                                  constants["Message"]: constants["SuccessfullyUpdated"].format(
                                      constants["Book"].capitalize())}, status=status.HTTP_200_OK)
@@ -197,7 +561,7 @@ class BookAPIView(BaseViewMixin):
         type _book: str
         """
         try:
-            Book.objects.get(self._get_query(_book)).delete()
+            self._get_book(_book).delete()
             return Response({"Data": {}, constants["Message"]: constants["SuccessfullyDeleted"].format("Book")},
                             status=status.HTTP_200_OK)
         except Book.DoesNotExist:
@@ -220,6 +584,15 @@ class BookView(LoginRequiredMixin, View):
     login_url = "/userRegister/"
 
     @staticmethod
+    def _get_page_data(paginator, number):
+        """
+        static method of class to fetch the rows, number and total count of the book page.
+        """
+        page = paginator.get_page(number)
+        return list(page.object_list), page.number, paginator.count
+
+    @staticmethod
+    @read_from_replica
     def get(request, slug=None):
         """
         This method includes business logic to display book list and detail.
@@ -228,12 +601,31 @@ class BookView(LoginRequiredMixin, View):
         """
         try:
             if slug:
+                book = get_or_build(get_catalogue_cache_key("book_detail", slug.lower()),
+                                    lambda: get_book_by_slug(slug.lower()))
+                if book.slug != slug.lower():
+                    return redirect("book_detail", slug=book.slug, permanent=True)
                 return render(template_name="book/book_detail.html", request=request,
-                              context={"book": Book.objects.get(slug=slug.lower())})
-            paginator = Paginator(Book.objects.all(), DEFAULT_PAGE_SIZE)
-            context = {"books": paginator.get_page(request.GET.get('page')), "form":  BookForm()}
+                              context={"book": book, "fragment_timeout": FRAGMENT_CACHE_TIMEOUT})
+            key = get_catalogue_cache_key("book_view", sorted(request.GET.lists()))
+            # The list does not show the description, skip loading it.
+            if KeysetPagination.is_requested(request):
+                books = get_or_build(key, lambda: KeysetPagination(with_count=False).paginate_queryset(
+                    Book.objects.defer("description"), request))
+            else:
+                paginator = Paginator(Book.objects.defer("description").order_by("created", "id"), DEFAULT_PAGE_SIZE)
+                object_list, number, count = get_or_build(key, lambda: BookView._get_page_data(
+                    paginator, request.GET.get('page')))
+                # Seed the paginator with the cached count so the page links need no query.
+                paginator.count = count
+                books = Page(object_list, number, paginator)
+            context = {"books": books, "form_html": get_book_form_html(), "fragment_timeout": FRAGMENT_CACHE_TIMEOUT}
+            if isinstance(books, Page):
+                # Only the pages around the current one are linked, not every page of the catalogue.
+                context["page_range"] = books.paginator.get_elided_page_range(books.number, on_each_side=2,
+                                                                              on_ends=1)
             return render(template_name="book/book.html", request=request, context=context)
-        except Book.DoesNotExist:
+        except (Book.DoesNotExist, ValidationError):
             return render(template_name="error.html", request=request)
 
     @staticmethod
@@ -272,8 +664,11 @@ class BookEditView(LoginRequiredMixin, View):
         type request: request
         """
         try:
+            book = get_book_by_slug(slug.lower())
+            if book.slug != slug.lower():
+                return redirect("book_edit", slug=book.slug, permanent=True)
             return render(template_name="book/book_detail.html", request=request,
-                          context={"form": BookForm(instance=Book.objects.get(slug=slug.lower()))})
+                          context={"form": BookForm(instance=book)})
         except Book.DoesNotExist:
             return render(template_name="error.html", request=request)
 
@@ -285,7 +680,7 @@ class BookEditView(LoginRequiredMixin, View):
         type request: request
         """
         try:
-            form = BookForm(request.POST, instance=Book.objects.get(slug=slug.lower()))
+            form = BookForm(request.POST, instance=get_book_by_slug(slug.lower()))
             if form.is_valid():
                 with transaction.atomic():
                     form.save()
@@ -314,7 +709,7 @@ class BookDeleteView(LoginRequiredMixin, View):
         """
         try:
             with transaction.atomic():
-                Book.objects.get(slug=slug.lower()).delete()
+                get_book_by_slug(slug.lower()).delete()
             messages.success(request, "Book deleted successfully!")
             return redirect("book_view")
         except Exception:
@@ -0,0 +1,52 @@
+"""
+Django settings for benchmarking book_project.
+
+It runs the project against a local SQLite database so the benchmark is reproducible
+without MySQL, use it with ``python manage.py benchmark_api --settings=book_project.benchmark_settings``.
+"""
+from book_project.settings import *  # noqa: F401,F403
+from book_project.settings import BASE_DIR, env
+
+DEBUG = False
+# Queue the jobs as in production, the benchmark measures the requests without them.
+JOB_QUEUE_EAGER = False
+
+# Only the benchmark settings allow the benchmark command to write to the database.
+BENCHMARK = True
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": env.str("BENCHMARK_DATABASE_NAME", default=str(BASE_DIR / "benchmark.sqlite3")),
+    }
+}
+DATABASE_REPLICAS = []
+
+# The benchmark runs in one process, its in memory cache is shared by every request.
+SILENCED_SYSTEM_CHECKS = ["book_project.W001", "book_project.E001"]
+
+# The benchmark renders the pages without collecting the static files first.
+STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
+
+# Hash the benchmark users quickly, the password hashers are not what the benchmark measures.
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher",
+                    "django.contrib.auth.hashers.Argon2PasswordHasher",
+                    "django.contrib.auth.hashers.PBKDF2PasswordHasher"]
+
+# Largest number of queries a request of every benchmark scenario may run.
+BENCHMARK_QUERY_BUDGET = {
+    "api_list": 3,
+    "api_list_compressed": 3,
+    "api_list_cursor": 2,
+    "api_list_category": 2,
+    "api_facets": 2,
+    "api_retrieve": 1,
+    "api_multi_get": 1,
+    "api_create": 11,
+    "api_update": 9,
+    "api_destroy": 7,
+    "html_list": 4,
+    "html_detail": 3,
+    "token_login": 2,
+    "register": 6,
+}
@@ -1,31 +1,344 @@
+import asyncio
+import functools
 import json
+import logging
+import mimetypes
+import os
+import random
+import time
 
 from django.conf import settings
-from django.http import HttpResponse, HttpResponseNotFound
-from django.shortcuts import render
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponse, HttpResponseNotFound, HttpResponseNotModified
+from django.template.loader import render_to_string
+from django.urls import is_valid_path
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
 
+from common import metrics, router
+from common.compression import (ENCODING_EXTENSIONS, PREFERRED_ENCODINGS, RESPONSE_ENCODINGS, choose_encoding,
+                                compress, compress_stream, is_compressible)
 from common.constant import constants
 
+logger = logging.getLogger(__name__)
+
 
 class BadRequestMiddleware(object):
     """
     This middleware class is used to handle the bad request.
+    Paths matching no URL pattern are answered before the session and authentication middlewares run,
+    the error page is rendered once and served from memory.
 
     :param object:
     :type object: object
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Mark the middleware as async so async views are not run in a thread.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
 
     def __call__(self, request):
-        response = self.get_response(request)
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not self.is_known_route(request):
+            return self.get_not_found_response(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        if not self.is_known_route(request):
+            return self.get_not_found_response(request)
+        return self.process_response(request, await self.get_response(request))
+
+    @staticmethod
+    def is_known_route(request):
+        """
+        static method of class to check whether the path matches a URL pattern,
+        or would match it once ``CommonMiddleware`` appends the slash.
+        """
+        path = request.path_info
+        if is_valid_path(path):
+            return True
+        return settings.APPEND_SLASH and not path.endswith("/") and bool(is_valid_path(f"{path}/"))
+
+    @staticmethod
+    def get_not_found_response(request):
+        if request.path.startswith(tuple(settings.REST_URL_PREFIXES)):
+            data = {constants["Error"]: constants["URLNotFound"].format(request.path)}
+            return HttpResponse(json.dumps(data), content_type="application/json", status=404)
+        return HttpResponse(get_error_page(), status=404)
+
+    def process_response(self, request, response):
         if response.__class__ == HttpResponseNotFound:
-            if "rest" in request.path:
-                data = {constants["Error"]: constants["URLNotFound"].format(request.path)}
-                response = HttpResponse(
-                    json.dumps(data), content_type="application/json", status=404
-                )
-            else:
-                return render(template_name="error.html", request=request)
-        return response
\ No newline at end of file
+            return self.get_not_found_response(request)
+        return response
+
+
+@functools.lru_cache(maxsize=None)
+def get_error_page():
+    """
+    This function is created to render the error page once, it is rendered without the request
+    so the page is the same for every user.
+    """
+    return render_to_string("error.html")
+
+
+class MetricsMiddleware(object):
+    """
+    This middleware class is used to record the count and duration of every request, and the query count,
+    database, serialization and render time of sampled requests. The sampled metrics are sent
+    in the ``Server-Timing`` header and repeated queries are logged as possible N+1 queries.
+
+    :param object:
+    :type object: object
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        token = self.start(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        return self.finish(request, response, started, token)
+
+    async def __acall__(self, request):
+        token = self.start(request)
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        return self.finish(request, response, started, token)
+
+    @staticmethod
+    def start(request):
+        sample_rate = settings.METRICS_SAMPLE_RATE
+        if sample_rate and (sample_rate >= 1 or random.random() < sample_rate):
+            return metrics.start_request()
+        return None
+
+    @staticmethod
+    def finish(request, response, started, token):
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        view = match.view_name if match is not None else "<unmatched>"
+        request_metrics = metrics.end_request(token) if token is not None else None
+        metrics.registry.observe_request(view, request.method, response.status_code, duration, request_metrics)
+        if request_metrics is None:
+            return response
+
+        timings = request_metrics.timings
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={timings["db"] * 1000:.2f};desc="{request_metrics.queries} queries"',
+            f'serialize;dur={timings["serialize"] * 1000:.2f}',
+            f'render;dur={timings["render"] * 1000:.2f}',
+            f"total;dur={duration * 1000:.2f}",
+        ])
+        statement, count = request_metrics.get_repeated_statement()
+        if count >= settings.METRICS_N_PLUS_ONE_THRESHOLD:
+            logger.warning("Possible N+1 query in %s %s (%s), ran %d times: %s",
+                           request.method, request.path, view, count, statement)
+        return response
+
+
+class ReplicaMiddleware(object):
+    """
+    This middleware class is used to keep the reads of a client on the primary database for
+    ``DATABASE_REPLICA_STICKY_SECONDS`` after it wrote, so the client reads its own writes while
+    the replicas catch up. The client is marked with a cookie, which works for every server process.
+    It is not used when no replica is configured.
+
+    :param object:
+    :type object: object
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        token = router.pin_to_primary(router.PRIMARY_COOKIE in request.COOKIES)
+        try:
+            response = self.get_response(request)
+        finally:
+            router.unpin(token)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        token = router.pin_to_primary(router.PRIMARY_COOKIE in request.COOKIES)
+        try:
+            response = await self.get_response(request)
+        finally:
+            router.unpin(token)
+        return self.process_response(request, response)
+
+    @staticmethod
+    def process_response(request, response):
+        if request.method not in ("GET", "HEAD", "OPTIONS", "TRACE") and response.status_code < 400:
+            response.set_cookie(router.PRIMARY_COOKIE, "1", max_age=settings.DATABASE_REPLICA_STICKY_SECONDS,
+                                httponly=True, samesite="Lax")
+        return response
+
+
+class StaticFilesMiddleware(object):
+    """
+    This middleware class is used to serve the files collected to ``STATIC_ROOT`` by the app server.
+    The gzip or brotli variant saved by ``collectstatic`` is sent when the client accepts it, and the files
+    with a hashed name are cached by the browsers for a year, so only the first page load downloads them.
+    It is not used when ``STATIC_SERVE`` is off, e.g. when a web server or CDN serves the static files,
+    or when ``collectstatic`` has not run. The files are indexed once, restart the server after collecting.
+
+    :param object:
+    :type object: object
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    immutable_cache_control = "public, max-age=31536000, immutable"
+
+    def __init__(self, get_response):
+        if not settings.STATIC_SERVE or not settings.STATIC_ROOT or not os.path.isdir(settings.STATIC_ROOT):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.files = self.get_files(settings.STATIC_ROOT, settings.STATIC_URL)
+        # Values of the manifest, names holding the hash of their content never change.
+        self.immutable = set(getattr(staticfiles_storage, "hashed_files", {}).values())
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        response = self.serve(request)
+        return response if response is not None else self.get_response(request)
+
+    async def __acall__(self, request):
+        response = self.serve(request)
+        return response if response is not None else await self.get_response(request)
+
+    @staticmethod
+    def get_files(root, url):
+        """
+        static method of class to index the collected files by their URL, with the paths of their
+        compressed variants.
+        """
+        compressed_extensions = tuple(ENCODING_EXTENSIONS.values())
+        files = {}
+        for directory, _, names in os.walk(root):
+            for name in names:
+                if name.endswith(compressed_extensions):
+                    continue
+                path = os.path.join(directory, name)
+                variants = {encoding: path + extension for encoding, extension in ENCODING_EXTENSIONS.items()
+                            if encoding in PREFERRED_ENCODINGS and os.path.isfile(path + extension)}
+                relative_name = os.path.relpath(path, root).replace(os.sep, "/")
+                files[url + relative_name] = (relative_name, path, variants)
+        return files
+
+    def serve(self, request):
+        if request.method not in ("GET", "HEAD"):
+            return None
+        found = self.files.get(request.path_info)
+        if found is None:
+            return None
+        name, path, variants = found
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING"), variants)
+        file_path = variants[encoding] if encoding else path
+        # The variants are saved after the file, every encoding of it has the time of the file.
+        modified = os.stat(path).st_mtime
+        if not was_modified_since(request.META.get("HTTP_IF_MODIFIED_SINCE"), modified):
+            response = HttpResponseNotModified()
+        else:
+            content_type, _ = mimetypes.guess_type(name)
+            response = FileResponse(open(file_path, "rb"), content_type=content_type or "application/octet-stream")
+            response.headers.pop("Content-Disposition", None)
+            if encoding:
+                response["Content-Encoding"] = encoding
+        response["Last-Modified"] = http_date(modified)
+        response["Cache-Control"] = self.immutable_cache_control if name in self.immutable else "no-cache"
+        if variants:
+            response["Vary"] = "Accept-Encoding"
+        return response
+
+
+class CompressionMiddleware(object):
+    """
+    This middleware class is used to compress the responses with the encoding accepted by the client,
+    in the order of ``COMPRESSION_ENCODINGS`` among zstd, brotli and gzip. Responses smaller than
+    ``COMPRESSION_MIN_SIZE`` are sent as they are, and streamed responses are compressed as they are streamed,
+    flushing every ``COMPRESSION_FLUSH_SIZE`` bytes. It is not used when none of the encodings is available.
+
+    :param object:
+    :type object: object
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.encodings = [encoding for encoding in settings.COMPRESSION_ENCODINGS if encoding in RESPONSE_ENCODINGS]
+        if not self.encodings:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding") or not is_compressible(response.get("Content-Type")):
+            return response
+        if "no-transform" in response.get("Cache-Control", ""):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        # A shared cache must not send the compressed response to a client not accepting it.
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING"), self.encodings)
+        if encoding is None:
+            return response
+        level = settings.COMPRESSION_LEVELS[encoding]
+
+        if response.streaming:
+            response.streaming_content = compress_stream(response.streaming_content, encoding, level,
+                                                         settings.COMPRESSION_FLUSH_SIZE)
+            del response["Content-Length"]
+        else:
+            compressed = compress(response.content, encoding, level)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        # The compressed body is not byte for byte the body the strong ETag was computed for.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = encoding
+        return response
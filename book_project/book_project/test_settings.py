@@ -0,0 +1,24 @@
+"""
+Django settings for testing book_project.
+
+It runs the tests against SQLite so they run without MySQL,
+use it with ``python manage.py test --settings=book_project.test_settings``.
+"""
+from book_project.settings import *  # noqa: F401,F403
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    }
+}
+DATABASE_REPLICAS = []
+
+# Hash the test users quickly.
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+# The tests render the pages without collecting the static files first.
+STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
+
+# The tests run in one process, its in memory cache is shared by every request.
+SILENCED_SYSTEM_CHECKS = ["book_project.W001", "book_project.E001"]
@@ -18,9 +18,11 @@ from django.urls import path, include
 from django.conf.urls.static import static
 
 from book_project import settings
+from common.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name="metrics"),
     path('', include("book_app.urls")),
     path('', include("user_registration.urls")),
 ]
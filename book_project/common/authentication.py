@@ -0,0 +1,155 @@
+import copy
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from common.cache import LRUCache
+from common.hashing import hash_password, verify_password
+
+token_cache = LRUCache(max_size=settings.TOKEN_CACHE_SIZE, timeout=settings.TOKEN_CACHE_TIMEOUT)
+
+
+def _get_shared_cache():
+    return caches[settings.TOKEN_CACHE_ALIAS] if settings.TOKEN_CACHE_ALIAS else None
+
+
+def _get_revocation_cache():
+    # The revocations only reach every process through a shared cache, the ``book_project.E001``
+    # check refuses a cache private to every process.
+    return caches[settings.TOKEN_CACHE_ALIAS or "default"]
+
+
+def _get_token_cache_key(key):
+    return f"token:{key}"
+
+
+def _get_revocation_cache_key(key):
+    return f"token:revoked:{key}"
+
+
+def invalidate_token(*keys):
+    """
+    This function is created to revoke the cached authentication of the given token keys.
+    The other processes drop their in process entries cached before the revocation time.
+    """
+    if not keys:
+        return
+    revoked_at = time.time()
+    for key in keys:
+        token_cache.delete(key)
+    shared_cache = _get_shared_cache()
+    if shared_cache is not None:
+        shared_cache.delete_many([_get_token_cache_key(key) for key in keys])
+    # An in process entry lives at most ``TOKEN_CACHE_TIMEOUT``, the revocation is not needed after it.
+    _get_revocation_cache().set_many({_get_revocation_cache_key(key): revoked_at for key in keys},
+                                     settings.TOKEN_CACHE_TIMEOUT)
+
+
+def _get_local_entry(key, revoked_at):
+    cached = token_cache.get(key)
+    if cached is None:
+        return None
+    cached_at, entry = cached
+    if revoked_at is not None and revoked_at >= cached_at:
+        token_cache.delete(key)
+        return None
+    return entry
+
+
+def _set_local_entry(key, entry):
+    token_cache.set(key, (time.time(), entry))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication class which caches the authenticated user and token,
+    first in process and then in the shared cache, before falling back to the database.
+    The in process entry is only used while the token is not revoked in the shared cache.
+    """
+
+    def authenticate_credentials(self, key):
+        entry = _get_local_entry(key, _get_revocation_cache().get(_get_revocation_cache_key(key)))
+        if entry is None:
+            shared_cache = _get_shared_cache()
+            entry = shared_cache.get(_get_token_cache_key(key)) if shared_cache is not None else None
+            if entry is None:
+                entry = super().authenticate_credentials(key)
+                if shared_cache is not None:
+                    shared_cache.set(_get_token_cache_key(key), entry, settings.TOKEN_CACHE_TIMEOUT)
+            _set_local_entry(key, entry)
+
+        return _copy_entry(entry)
+
+
+class AsyncCachedTokenAuthentication(object):
+    """
+    Async version of ``CachedTokenAuthentication`` for async views, the database and
+    shared cache are only reached through their async interfaces.
+    """
+    keyword = "Token"
+
+    async def authenticate(self, request):
+        """
+        Returns the user and token of the request, or ``None`` when the token is missing or invalid.
+        """
+        auth = request.headers.get("Authorization", "").split()
+        if len(auth) != 2 or auth[0].lower() != self.keyword.lower():
+            return None
+        key = auth[1]
+        entry = _get_local_entry(key, await _get_revocation_cache().aget(_get_revocation_cache_key(key)))
+        if entry is None:
+            shared_cache = _get_shared_cache()
+            entry = await shared_cache.aget(_get_token_cache_key(key)) if shared_cache is not None else None
+            if entry is None:
+                try:
+                    token = await Token.objects.select_related("user").aget(key=key)
+                except Token.DoesNotExist:
+                    return None
+                if not token.user.is_active:
+                    return None
+                entry = (token.user, token)
+                if shared_cache is not None:
+                    await shared_cache.aset(_get_token_cache_key(key), entry, settings.TOKEN_CACHE_TIMEOUT)
+            _set_local_entry(key, entry)
+        return _copy_entry(entry)
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    Authentication backend checking the password in the bounded hashing pool, a password hashed with
+    an older hasher is hashed again with the preferred one once it is verified.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user_model = get_user_model()
+        if username is None:
+            username = kwargs.get(user_model.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = user_model._default_manager.get_by_natural_key(username)
+        except user_model.DoesNotExist:
+            # Hash the password anyway, so the response time does not tell whether the user exists.
+            hash_password(password)
+            return None
+        valid, must_update = verify_password(password, user.password)
+        if not valid or not self.user_can_authenticate(user):
+            return None
+        if must_update:
+            user.password = hash_password(password)
+            user.save(update_fields=["password"])
+        return user
+
+
+def _copy_entry(entry):
+    # Hand out copies so per request state never leaks into the cached objects.
+    user, token = entry
+    user = copy.copy(user)
+    token = copy.copy(token)
+    token.user = user
+    return user, token
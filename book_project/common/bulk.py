@@ -0,0 +1,133 @@
+import csv
+import io
+import itertools
+import json
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from common.cache import bump_catalogue_generation
+from common.facet import change_facet_counts, count_facets
+from common.slug import allocate_slugs
+from common.serializer import BookSerializer
+from db.models import Book, BookFacet
+from db.tasks import enqueue_index
+
+# Book fields read and written by import and export.
+BOOK_FIELDS = ["title", "category", "description", "author"]
+
+EXPORT_FIELDS = ["id", "title", "category", "description", "author", "slug"]
+
+
+def chunked(iterable, size):
+    """
+    This function is created to split the iterable into lists of the given size.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_records(lines, file_type):
+    """
+    This function is created to read book records from JSON Lines or CSV lines.
+    param lines: An iterable of text or bytes lines.
+    type lines: iterable
+    param file_type: ``jsonl`` or ``csv``.
+    type file_type: str
+    """
+    lines = (line.decode("utf-8") if isinstance(line, bytes) else line for line in lines)
+    if file_type == "csv":
+        yield from csv.DictReader(lines)
+        return
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+
+def import_books(records, update=False, chunk_size=None, batch_size=None):
+    """
+    This function is created to validate and save book records in chunks with bulk writes.
+    param records: An iterable of book records.
+    type records: iterable
+    param update: Whether a record whose title slug already exists updates that book instead of adding one.
+    type update: bool
+    """
+    chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+    batch_size = batch_size or settings.BULK_BATCH_SIZE
+    result = {"Created": 0, "Updated": 0, "Errors": []}
+    for index, chunk in enumerate(chunked(records, chunk_size)):
+        offset = index * chunk_size
+        for row, record in enumerate(chunk):
+            if not isinstance(record, dict):
+                raise ValueError(f"Expected a book object in row {offset + row}.")
+        chunk = [{field: record.get(field) for field in BOOK_FIELDS} for record in chunk]
+        serializer = BookSerializer(data=chunk, many=True)
+        if not serializer.is_valid():
+            result["Errors"].extend({"Row": offset + row, "Error": errors}
+                                    for row, errors in enumerate(serializer.errors) if errors)
+            serializer = BookSerializer(data=[record for record, errors in zip(chunk, serializer.errors)
+                                              if not errors], many=True)
+            serializer.is_valid()
+        created, updated = _save_books(serializer.validated_data, update, batch_size)
+        result["Created"] += created
+        result["Updated"] += updated
+    return result
+
+
+def _save_books(records, update, batch_size):
+    now = timezone.now()
+    created, updated, previous = [], [], []
+    if update:
+        existing = {book["slug"]: book for book in Book.objects.filter(
+            slug__in=[slugify(data["title"]) for data in records]).values("slug", "id", *BookFacet.FIELDS)}
+        for data in records:
+            book = existing.pop(slugify(data["title"]), None)
+            if book is None:
+                created.append(Book(**data))
+            else:
+                updated.append(Book(id=book["id"], slug=slugify(data["title"]), updated=now, **data))
+                previous.append(book)
+    else:
+        created = [Book(**data) for data in records]
+    for book, slug in zip(created, allocate_slugs([book.title for book in created])):
+        book.slug = slug
+
+    with transaction.atomic():
+        Book.objects.bulk_create(created, batch_size=batch_size)
+        Book.objects.bulk_update(updated, BOOK_FIELDS + ["updated"], batch_size=batch_size)
+        if created and created[0].pk is None:
+            # Backends without RETURNING do not set the primary keys, fetch them for indexing.
+            created = list(Book.objects.filter(slug__in=[book.slug for book in created]))
+        enqueue_index([book.pk for book in created + updated])
+        facets = count_facets(created + updated)
+        facets.subtract(count_facets(previous))
+        change_facet_counts(facets)
+        transaction.on_commit(bump_catalogue_generation)
+    return len(created), len(updated)
+
+
+def export_books(file_type, chunk_size=None):
+    """
+    This function is created to stream every book as JSON Lines or CSV lines.
+    param file_type: ``jsonl`` or ``csv``.
+    type file_type: str
+    """
+    books = Book.objects.order_by("id").values_list(*EXPORT_FIELDS).iterator(
+        chunk_size=chunk_size or settings.BULK_CHUNK_SIZE)
+    if file_type == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in itertools.chain([EXPORT_FIELDS], books):
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        return
+    for book in books:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, book))) + "\n"
@@ -0,0 +1,207 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from common import router
+
+CATALOGUE_GENERATION_KEY = "catalogue:generation"
+CATALOGUE_MODIFIED_KEY = "catalogue:modified"
+
+
+class LRUCache(object):
+    """
+    Thread safe in-process cache with a bounded size and per entry time to live.
+
+    :param max_size: Maximum number of entries, the least recently used entry is evicted first.
+    :type max_size: int
+    :param timeout: Time to live of an entry in seconds.
+    :type timeout: int
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Cache backends keeping the values in the memory of every process.
+PROCESS_LOCAL_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache",
+                          "django.core.cache.backends.dummy.DummyCache")
+
+
+def is_process_local(alias="default"):
+    """
+    This function is created to check whether the cache keeps its values in the memory of every process,
+    an invalidation recorded in it then never reaches the other processes of the server.
+    param alias: A cache alias of ``CACHES``.
+    type alias: str
+    """
+    backend = caches[alias]
+    return f"{type(backend).__module__}.{type(backend).__name__}" in PROCESS_LOCAL_BACKENDS
+
+
+def get_catalogue_generation():
+    """
+    This function is created to get the generation of the book catalogue,
+    it changes whenever any book is saved or deleted.
+    """
+    return cache.get_or_set(CATALOGUE_GENERATION_KEY, 1, None)
+
+
+def get_catalogue_modified():
+    """
+    This function is created to get the time the book catalogue last changed, e.g. the last modified time
+    of a list page, which changes when a book is deleted or moves to another page without any of its
+    books being updated. It is the current time when the cache lost it.
+    """
+    return datetime.fromtimestamp(cache.get_or_set(CATALOGUE_MODIFIED_KEY, time.time, None), tz=timezone.utc)
+
+
+def bump_catalogue_generation():
+    """
+    This function is created to expire every cached catalogue response.
+    """
+    # The time is stored before the generation changes, so a response of the new generation
+    # never gets an older time.
+    cache.set(CATALOGUE_MODIFIED_KEY, time.time(), None)
+    try:
+        cache.incr(CATALOGUE_GENERATION_KEY)
+    except ValueError:
+        cache.set(CATALOGUE_GENERATION_KEY, 2, None)
+
+
+def get_catalogue_cache_key(*parts):
+    """
+    This function is created to build the cache key of catalogue data for the current generation.
+    """
+    digest = hashlib.md5(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f"catalogue:{get_catalogue_generation()}:{digest}"
+
+
+class ReplicaEntry(object):
+    """
+    Cached value built from the rows of a replica, it may miss the latest writes so it is kept for
+    ``DATABASE_REPLICA_STICKY_SECONDS``, the time the replicas are given to catch up, and is never
+    served to a request reading from the primary database.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __getstate__(self):
+        return self.value
+
+    def __setstate__(self, state):
+        self.value = state
+
+
+def get_or_build_entry(key, build):
+    """
+    This function is created to get the cached value or build and cache it, and whether the value was
+    built from a replica.
+    param key: A cache key.
+    type key: str
+    param build: A callable building the value.
+    type build: callable
+    """
+    from_replica = router.reads_from_replica()
+    value = cache.get(key)
+    if isinstance(value, ReplicaEntry):
+        if from_replica:
+            return value.value, True
+        # The request reads from the primary, e.g. the client wrote recently, rebuild the value from it.
+        value = None
+    if value is not None:
+        return value, False
+    value = build()
+    if from_replica:
+        cache.set(key, ReplicaEntry(value), settings.DATABASE_REPLICA_STICKY_SECONDS)
+    else:
+        cache.set(key, value, settings.RESPONSE_CACHE_TIMEOUT)
+    return value, from_replica
+
+
+def get_or_build(key, build):
+    """
+    This function is created to get the cached value or build and cache it.
+    param key: A cache key.
+    type key: str
+    param build: A callable building the value.
+    type build: callable
+    """
+    return get_or_build_entry(key, build)[0]
+
+
+def get_last_modified(objects):
+    """
+    This function is created to get the latest update time of the given objects, e.g. of a book detail.
+    Use ``get_catalogue_modified`` for a list of books, it changes without any of them being updated.
+    """
+    return max((obj.updated or obj.created for obj in objects), default=None)
+
+
+def cached_response(request, build):
+    """
+    This function is created to serve the catalogue response from the cache with
+    ``ETag`` and ``Last-Modified`` headers, answering conditional requests with 304.
+    param request: A request object.
+    type request: request
+    param build: A callable returning the response data and its last modified time.
+    type build: callable
+    """
+    key = get_catalogue_cache_key(request.path, sorted(request.GET.lists()))
+    (data, last_modified), from_replica = get_or_build_entry(key, build)
+    # The response built from a replica gets its own ETag, so it is not revalidated against
+    # the response of the same generation built from the primary database.
+    etag = quote_etag(key.replace(":", "-") + ("-replica" if from_replica else ""))
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = Response(data, status=status.HTTP_200_OK)
+    response["ETag"] = etag
+    if timestamp:
+        response["Last-Modified"] = http_date(timestamp)
+    return response
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core import checks
+
+from common.cache import is_process_local
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    This function is created to warn when the default cache is private to every process, the cached
+    permissions, responses and their invalidations are then not shared by the processes of the server.
+    """
+    if settings.DEBUG or not is_process_local():
+        return []
+    return [checks.Warning(
+        "The default cache is private to every process, a permission change or a book write only expires "
+        "the cached permissions and responses of the process handling it.",
+        hint="Set CACHE_BACKEND and CACHE_LOCATION to a cache shared by the server processes, e.g. Redis "
+             "or Memcached, or silence this check when the server runs a single process.",
+        id="book_project.W001",
+    )]
+
+
+@checks.register(checks.Tags.caches, checks.Tags.security)
+def check_token_revocation_cache(app_configs, **kwargs):
+    """
+    This function is created to refuse a token revocation cache private to every process, the other
+    processes would keep accepting a revoked token from their in process cache.
+    """
+    alias = settings.TOKEN_CACHE_ALIAS or "default"
+    if settings.DEBUG or not is_process_local(alias):
+        return []
+    return [checks.Error(
+        f"The token revocations are recorded in the {alias} cache, which is private to every process, "
+        f"the other processes keep accepting a revoked token for up to TOKEN_CACHE_TIMEOUT seconds.",
+        hint="Set TOKEN_CACHE_ALIAS, or CACHE_BACKEND for the default cache, to a cache shared by the server "
+             "processes, or silence this check when the server runs a single process.",
+        id="book_project.E001",
+    )]
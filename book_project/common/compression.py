@@ -0,0 +1,135 @@
+import functools
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip is always available.
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional.
+    zstandard = None
+
+# File extensions of the content encodings.
+ENCODING_EXTENSIONS = {
+    "br": ".br",
+    "gzip": ".gz",
+}
+
+# Content encodings in the order the server prefers them, brotli compresses text best.
+PREFERRED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Content encodings the responses can be compressed with, depending on the installed libraries.
+RESPONSE_ENCODINGS = tuple(encoding for encoding, library in (("zstd", zstandard), ("br", brotli), ("gzip", zlib))
+                           if library is not None)
+
+# Content types worth compressing, images and fonts are compressed already.
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml",
+                      "application/x-ndjson", "image/svg+xml")
+
+
+def compress(data, encoding, level=None):
+    """
+    This function is created to compress the data, with the best compression of the encoding by default,
+    for content compressed once and served many times.
+    param data: The data to compress.
+    type data: bytes
+    param encoding: ``br``, ``gzip`` or ``zstd``.
+    type encoding: str
+    param level: Compression level, brotli quality, of the encoding.
+    type level: int
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if level is None else level)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=19 if level is None else level).compress(data)
+    # The modification time is left out so the same file always compresses to the same bytes.
+    return gzip.compress(data, compresslevel=9 if level is None else level, mtime=0)
+
+
+def compress_stream(chunks, encoding, level, flush_size=0):
+    """
+    This function is created to compress the chunks of a streamed response as one stream, the compressed
+    data is sent once at least ``flush_size`` bytes were added, so the client receives the response
+    progressively without flushing every small chunk.
+    param chunks: An iterable of bytes.
+    type chunks: iterable
+    param encoding: ``br``, ``gzip`` or ``zstd``.
+    type encoding: str
+    param level: Compression level, brotli quality, of the encoding.
+    type level: int
+    param flush_size: Number of bytes added before the compressed data is flushed.
+    type flush_size: int
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=level)
+        add, flush, finish = compressor.process, compressor.flush, compressor.finish
+    elif encoding == "zstd":
+        compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        add, finish = compressor.compress, compressor.flush
+        flush = functools.partial(compressor.flush, zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+    else:
+        # The window bits of 16 + 15 write the gzip header and trailer.
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        add, finish = compressor.compress, compressor.flush
+        flush = functools.partial(compressor.flush, zlib.Z_SYNC_FLUSH)
+    pending = 0
+    for chunk in chunks:
+        data = add(chunk)
+        pending += len(chunk)
+        if pending >= flush_size:
+            data += flush()
+            pending = 0
+        if data:
+            yield data
+    yield finish()
+
+
+def get_accepted_encodings(header):
+    """
+    This function is created to parse the ``Accept-Encoding`` header into the quality of every content
+    encoding, ``*`` stands for the encodings not listed.
+    param header: The value of the ``Accept-Encoding`` header.
+    type header: str
+    """
+    qualities = {}
+    for item in (header or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.strip():
+            qualities[coding.strip().lower()] = quality
+    return qualities
+
+
+def choose_encoding(header, available=PREFERRED_ENCODINGS):
+    """
+    This function is created to choose the preferred content encoding accepted by the client,
+    an encoding with ``q=0`` is refused. Returns ``None`` when the content should be sent uncompressed.
+    param header: The value of the ``Accept-Encoding`` header.
+    type header: str
+    param available: Encodings the content is available in, in the order of preference.
+    type available: iterable
+    """
+    qualities = get_accepted_encodings(header)
+    for encoding in available:
+        if qualities.get(encoding, qualities.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+def is_compressible(content_type):
+    """
+    This function is created to check whether the content type is worth compressing.
+    param content_type: A content type, parameters such as the charset are ignored.
+    type content_type: str
+    """
+    return (content_type or "").split(";")[0].strip().lower().startswith(COMPRESSIBLE_TYPES)
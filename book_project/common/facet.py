@@ -0,0 +1,138 @@
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from rest_framework.exceptions import ValidationError
+
+from db.models import Book, BookFacet
+
+# Number of author values returned by default.
+AUTHOR_FACET_LIMIT = 10
+
+# Number of changed facet values from which the counts are changed with bulk queries.
+BULK_FACET_CHANGES = 10
+
+
+def count_facets(books, sign=1):
+    """
+    This function is created to count the facet values of the books.
+    param books: An iterable of book objects or dictionaries of book fields.
+    type books: iterable
+    param sign: ``1`` to add the books to the facet counts, ``-1`` to remove them.
+    type sign: int
+    """
+    changes = Counter()
+    for book in books:
+        values = book if isinstance(book, dict) else book.__dict__
+        for field in BookFacet.FIELDS:
+            if field in values:
+                changes[field, values[field]] += sign
+    return changes
+
+
+def change_facet_counts(changes):
+    """
+    This function is created to add the count changes to the facet table in the current transaction.
+    param changes: A mapping of ``(field, value)`` to the change of its count.
+    type changes: dict
+    """
+    changes = {facet: change for facet, change in changes.items() if change}
+    if len(changes) > BULK_FACET_CHANGES:
+        return _bulk_change_facet_counts(changes)
+    for (field, value), change in changes.items():
+        _change_facet_count(field, value, change)
+
+
+def _change_facet_count(field, value, change):
+    facets = BookFacet.objects.filter(field=field, value=value)
+    if facets.update(count=F("count") + change):
+        return
+    try:
+        with transaction.atomic():
+            BookFacet.objects.create(field=field, value=value, count=change)
+    except IntegrityError:
+        # Added by a concurrent transaction in the meantime.
+        facets.update(count=F("count") + change)
+
+
+def _bulk_change_facet_counts(changes):
+    # Values changed by the same amount are updated together, the missing ones are inserted at once.
+    fields = defaultdict(dict)
+    for (field, value), change in changes.items():
+        fields[field][value] = change
+    missing = []
+    for field, values in fields.items():
+        existing = set(BookFacet.objects.filter(field=field, value__in=list(values)).values_list("value", flat=True))
+        updates = defaultdict(list)
+        for value, change in values.items():
+            if value in existing:
+                updates[change].append(value)
+            else:
+                missing.append(BookFacet(field=field, value=value, count=change))
+        for change, names in updates.items():
+            BookFacet.objects.filter(field=field, value__in=names).update(count=F("count") + change)
+    try:
+        with transaction.atomic():
+            BookFacet.objects.bulk_create(missing)
+    except IntegrityError:
+        for facet in missing:
+            _change_facet_count(facet.field, facet.value, facet.count)
+
+
+def rebuild_facets():
+    """
+    This function is created to count the facets of every book again.
+    """
+    with transaction.atomic():
+        BookFacet.objects.all().delete()
+        BookFacet.objects.bulk_create([
+            BookFacet(field=field, value=row[field], count=row["count"])
+            for field in BookFacet.FIELDS
+            for row in Book.objects.order_by().values(field).annotate(count=Count("id"))], batch_size=1000)
+    return BookFacet.objects.count()
+
+
+def get_facets(author_limit=AUTHOR_FACET_LIMIT):
+    """
+    This function is created to get the number of books per category and of the authors with most books.
+    param author_limit: Number of authors returned.
+    type author_limit: int
+    """
+    facets = {"category": {category.value: 0 for category in Book.BookCategory}}
+    facets["category"].update(BookFacet.objects.filter(field="category", count__gt=0).values_list("value", "count"))
+    facets["author"] = dict(BookFacet.objects.filter(field="author", count__gt=0).order_by(
+        "-count", "value").values_list("value", "count")[:author_limit])
+    return facets
+
+
+def filter_books(queryset, params):
+    """
+    This function is created to filter the books by the ``category`` and ``author`` query params.
+    param queryset: A book queryset.
+    type queryset: QuerySet
+    param params: The query params of the request.
+    type params: QueryDict
+    """
+    filters = {field: params[field] for field in BookFacet.FIELDS if params.get(field)}
+    if "category" in filters and filters["category"] not in Book.BookCategory.values:
+        raise ValidationError({"category": "Invalid category. Valid Categories are `story`, `educational`, "
+                                           "`historical`."})
+    return queryset.filter(**filters)
+
+
+def get_facet_count(params):
+    """
+    This function is created to get the number of books matching the ``category`` or ``author`` query param
+    from the facet table. Returns ``None`` when both are given or no book is counted, the count is then
+    taken with a COUNT query.
+    param params: The query params of the request.
+    type params: QueryDict
+    """
+    filters = [(field, params[field]) for field in BookFacet.FIELDS if params.get(field)]
+    if len(filters) > 1:
+        return None
+    if filters:
+        (field, value), = filters
+        return BookFacet.objects.filter(field=field, value=value).values_list("count", flat=True).first() or None
+    # Every book has one category, the category counts add up to the number of books.
+    return sum(BookFacet.objects.filter(field="category").values_list("count", flat=True)) or None
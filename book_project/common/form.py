@@ -1,3 +1,5 @@
+import functools
+
 from django import forms
 from db.models import Book, User
 from django.core.exceptions import ValidationError
@@ -16,6 +18,15 @@ class BookForm(forms.ModelForm):
             'author': forms.TextInput(attrs={"class": "form-control"})
         }
 
+@functools.lru_cache(maxsize=None)
+def get_book_form_html():
+    """
+    This function is created to render the fields of the empty book form once, the markup is
+    the same on every request.
+    """
+    return BookForm().as_p()
+
+
 class LoginForm(forms.Form):
     """
     Loging form class.
@@ -0,0 +1,87 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+
+class PasswordHashingBusy(APIException):
+    """
+    Exception raised when every hashing worker is busy and the queue of waiting passwords is full,
+    the request is answered with 503 instead of its worker waiting behind the hashes.
+    """
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many passwords are being checked, please try again shortly."
+    default_code = "password_hashing_busy"
+    # Seconds sent in the ``Retry-After`` header.
+    wait = 1
+
+
+def _reset_executor():
+    global _executor, _slots
+    # The threads of the pool do not survive a fork, the child process starts its own pool.
+    _executor = None
+    _slots = None
+
+
+os.register_at_fork(after_in_child=_reset_executor)
+
+
+def _run(function, *args):
+    global _executor, _slots
+    if not settings.PASSWORD_HASHING_WORKERS:
+        return function(*args)
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                # A slot for every worker and every password allowed to wait for one.
+                _slots = threading.BoundedSemaphore(
+                    settings.PASSWORD_HASHING_WORKERS + settings.PASSWORD_HASHING_QUEUE_SIZE)
+                _executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASHING_WORKERS,
+                                               thread_name_prefix="password-hashing")
+    slots = _slots
+    if not slots.acquire(timeout=settings.PASSWORD_HASHING_TIMEOUT):
+        raise PasswordHashingBusy()
+    try:
+        future = _executor.submit(function, *args)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future.result()
+
+
+def _verify_password(password, encoded):
+    updates = []
+    return check_password(password, encoded, setter=updates.append), bool(updates)
+
+
+def hash_password(password):
+    """
+    This function is created to hash the password in the bounded hashing pool, so at most
+    ``PASSWORD_HASHING_WORKERS`` passwords are hashed at once and a login burst does not take every CPU.
+    When ``PASSWORD_HASHING_QUEUE_SIZE`` passwords already wait for a worker, ``PasswordHashingBusy`` is raised
+    after ``PASSWORD_HASHING_TIMEOUT`` seconds, so a burst does not hold every request worker either.
+    param password: A raw password.
+    type password: str
+    """
+    return _run(make_password, password)
+
+
+def verify_password(password, encoded):
+    """
+    This function is created to check the password against the hash in the bounded hashing pool.
+    Returns whether the password is correct and whether the hash should be upgraded to the preferred hasher.
+    param password: A raw password.
+    type password: str
+    param encoded: A hashed password.
+    type encoded: str
+    """
+    return _run(_verify_password, password, encoded)
@@ -0,0 +1,146 @@
+import logging
+import os
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from db.models import Job
+
+logger = logging.getLogger(__name__)
+
+_tasks = {}
+
+
+class LockExpired(Exception):
+    """
+    The visibility timeout of the job passed and another worker took it.
+    """
+
+
+def task(name):
+    """
+    This function is created to register the decorated function as the job of the given name,
+    the payload of the job is passed as keyword arguments.
+    param name: Name of the job.
+    type name: str
+    """
+    def register(function):
+        _tasks[name] = function
+        return function
+    return register
+
+
+def enqueue(name, payload=None, delay=0):
+    """
+    This function is created to add a job to the queue in the current transaction, so the job only
+    exists when the change it belongs to is committed. With ``JOB_QUEUE_EAGER`` the job runs in process
+    once the transaction is committed instead.
+    param name: Name of a registered job.
+    type name: str
+    param payload: JSON serializable keyword arguments of the job.
+    type payload: dict
+    param delay: Seconds before the job runs.
+    type delay: int
+    """
+    if name not in _tasks:
+        raise ValueError(f"Unknown job {name}.")
+    payload = payload or {}
+    if settings.JOB_QUEUE_EAGER:
+        transaction.on_commit(lambda: run_eager(name, payload))
+        return None
+    return Job.objects.create(name=name, payload=payload, max_attempts=settings.JOB_MAX_ATTEMPTS,
+                              run_at=timezone.now() + timedelta(seconds=delay))
+
+
+def run_eager(name, payload):
+    try:
+        with transaction.atomic():
+            _tasks[name](**payload)
+    except Exception:
+        logger.exception("Job %s failed.", name)
+
+
+def claim_jobs(worker_id, limit):
+    """
+    This function is created to lock the next ready jobs for the worker, a job is ready when it is pending
+    and due, or running and its visibility timeout passed with attempts left. A job whose visibility timeout
+    passed on its last attempt, e.g. it killed its worker, is marked failed. The lock is a conditional update,
+    so two workers never take the same job and no external broker is needed.
+    param worker_id: Unique id of the worker.
+    type worker_id: str
+    param limit: Number of jobs claimed at once.
+    type limit: int
+    """
+    now = timezone.now()
+    Job.objects.filter(status=Job.JobStatus.running, locked_until__lt=now, attempts__gte=F("max_attempts")).update(
+        status=Job.JobStatus.failed, locked_until=None,
+        last_error="The worker did not finish the last attempt within the visibility timeout.")
+    ready = (Q(status=Job.JobStatus.pending, run_at__lte=now) |
+             Q(status=Job.JobStatus.running, locked_until__lt=now, attempts__lt=F("max_attempts")))
+    ids = list(Job.objects.filter(ready).order_by("run_at", "id").values_list("id", flat=True)[:limit])
+    if not ids:
+        return []
+    Job.objects.filter(ready, id__in=ids).update(
+        status=Job.JobStatus.running, locked_by=worker_id, attempts=F("attempts") + 1,
+        locked_until=now + timedelta(seconds=settings.JOB_VISIBILITY_TIMEOUT))
+    return list(Job.objects.filter(id__in=ids, status=Job.JobStatus.running, locked_by=worker_id).order_by(
+        "run_at", "id"))
+
+
+def run_job(job, worker_id):
+    """
+    This function is created to run the claimed job. The job is removed in the transaction of its changes,
+    a failed job is tried again later with an exponential backoff until it runs out of attempts.
+    param job: A job claimed by the worker.
+    type job: Job
+    param worker_id: Unique id of the worker.
+    type worker_id: str
+    """
+    try:
+        with transaction.atomic():
+            _tasks[job.name](**job.payload)
+            if not Job.objects.filter(id=job.id, status=Job.JobStatus.running, locked_by=worker_id).delete()[0]:
+                raise LockExpired(f"Job {job.id} was taken by another worker.")
+        return True
+    except LockExpired:
+        logger.warning("Job %s %s ran longer than the visibility timeout.", job.id, job.name)
+        return False
+    except Exception:
+        logger.exception("Job %s %s failed, attempt %s of %s.", job.id, job.name, job.attempts, job.max_attempts)
+        failed = job.attempts >= job.max_attempts
+        Job.objects.filter(id=job.id, locked_by=worker_id).update(
+            status=Job.JobStatus.failed if failed else Job.JobStatus.pending, locked_until=None,
+            run_at=timezone.now() + timedelta(seconds=settings.JOB_RETRY_DELAY * 2 ** (job.attempts - 1)),
+            last_error=traceback.format_exc())
+        return False
+
+
+def work(stop, once=False, batch_size=None):
+    """
+    This function is created to run the queued jobs until ``stop`` is set.
+    param stop: An event stopping the worker once its current job is done.
+    type stop: Event
+    param once: Whether the worker stops when the queue is empty.
+    type once: bool
+    param batch_size: Number of jobs claimed at once.
+    type batch_size: int
+    """
+    worker_id = f"{os.getpid()}:{uuid.uuid4().hex}"
+    processed = 0
+    while not stop.is_set():
+        close_old_connections()
+        jobs = claim_jobs(worker_id, batch_size or settings.JOB_BATCH_SIZE)
+        if not jobs:
+            if once:
+                break
+            stop.wait(settings.JOB_POLL_INTERVAL)
+            continue
+        for job in jobs:
+            run_job(job, worker_id)
+            processed += 1
+    return processed
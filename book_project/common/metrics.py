@@ -0,0 +1,223 @@
+import bisect
+import ipaddress
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.template.backends.django import DjangoTemplates, Template
+from rest_framework.renderers import JSONRenderer
+
+# Upper bounds of the request duration histogram in seconds.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_request_metrics = ContextVar("request_metrics", default=None)
+_null_timer = nullcontext()
+
+
+class RequestMetrics(object):
+    """
+    Query count and time spent per section of a sampled request.
+    """
+    __slots__ = ("queries", "statements", "timings", "_depth")
+
+    def __init__(self):
+        self.queries = 0
+        self.statements = Counter()
+        self.timings = {"db": 0.0, "serialize": 0.0, "render": 0.0}
+        self._depth = Counter()
+
+    def get_repeated_statement(self):
+        """
+        This method includes business logic to find the statement run the most in the request,
+        the same SQL run many times with different params is the N+1 pattern.
+        """
+        return self.statements.most_common(1)[0] if self.statements else (None, 0)
+
+
+class _Timer(object):
+    __slots__ = ("metrics", "name", "started")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        # Only the outermost section is timed, so nested renders are not counted twice.
+        if not self.metrics._depth[self.name]:
+            self.started = time.perf_counter()
+        self.metrics._depth[self.name] += 1
+
+    def __exit__(self, *args):
+        self.metrics._depth[self.name] -= 1
+        if not self.metrics._depth[self.name]:
+            self.metrics.timings[self.name] += time.perf_counter() - self.started
+
+
+def start_request():
+    """
+    This function is created to start recording the metrics of the current request.
+    Returns a token to pass to ``end_request``.
+    """
+    return _request_metrics.set(RequestMetrics())
+
+
+def end_request(token):
+    """
+    This function is created to stop recording the metrics of the current request and return them.
+    """
+    metrics = _request_metrics.get()
+    _request_metrics.reset(token)
+    return metrics
+
+
+def timed(name):
+    """
+    This function is created to time a section of the request, it does nothing when the request is not sampled.
+    param name: Name of the section, `serialize` or `render`.
+    type name: str
+    """
+    metrics = _request_metrics.get()
+    return _null_timer if metrics is None else _Timer(metrics, name)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    This function is created to record the query count and time of the sampled request,
+    it is installed as an execute wrapper of every database connection.
+    """
+    metrics = _request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.timings["db"] += time.perf_counter() - started
+        metrics.queries += 1
+        metrics.statements[sql] += 1
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """
+    JSON renderer recording its time as the `render` section of the request.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed("render"):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class TimedTemplate(Template):
+
+    def render(self, context=None, request=None):
+        with timed("render"):
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    Django template backend recording the template render time as the `render` section of the request.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+class Registry(object):
+    """
+    In process store of the request metrics in the Prometheus text format.
+    Every worker process has its own registry, Prometheus should scrape each of them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = Counter()
+        self._histograms = {}
+
+    def observe_request(self, view, method, status, duration, metrics=None):
+        """
+        This method includes business logic to add a finished request to the registry.
+        """
+        with self._lock:
+            self._counters["requests_total", (("view", view), ("method", method), ("status", str(status)))] += 1
+            buckets, total = self._histograms.get(view, ([0] * (len(DURATION_BUCKETS) + 1), 0.0))
+            buckets[bisect.bisect_left(DURATION_BUCKETS, duration)] += 1
+            self._histograms[view] = (buckets, total + duration)
+            if metrics is not None:
+                labels = (("view", view),)
+                self._counters["sampled_requests_total", labels] += 1
+                self._counters["db_queries_total", labels] += metrics.queries
+                for name, elapsed in metrics.timings.items():
+                    self._counters[f"{name}_seconds_total", labels] += elapsed
+                if metrics.get_repeated_statement()[1] >= settings.METRICS_N_PLUS_ONE_THRESHOLD:
+                    self._counters["n_plus_one_total", labels] += 1
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self):
+        """
+        This method includes business logic to write the metrics in the Prometheus text format.
+        """
+        lines = []
+        with self._lock:
+            names = sorted({name for name, _ in self._counters})
+            for name in names:
+                lines.append(f"# TYPE django_http_{name} counter")
+                lines.extend(f"django_http_{name}{_format_labels(labels)} {value}"
+                             for (metric, labels), value in sorted(self._counters.items()) if metric == name)
+            if self._histograms:
+                lines.append("# TYPE django_http_request_duration_seconds histogram")
+            for view, (buckets, total) in sorted(self._histograms.items()):
+                count = 0
+                for bound, number in zip(DURATION_BUCKETS + ("+Inf",), buckets):
+                    count += number
+                    lines.append(f"django_http_request_duration_seconds_bucket"
+                                 f"{_format_labels((('view', view), ('le', str(bound))))} {count}")
+                lines.append(f"django_http_request_duration_seconds_sum{_format_labels((('view', view),))} {total}")
+                lines.append(f"django_http_request_duration_seconds_count{_format_labels((('view', view),))} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels):
+    return "{" + ",".join('{}="{}"'.format(key, value.replace("\\", "\\\\").replace('"', '\\"'))
+                          for key, value in labels) + "}"
+
+
+registry = Registry()
+
+
+def is_metrics_allowed(request):
+    """
+    This function is created to check the request may read the metrics, it must send ``METRICS_TOKEN``
+    as a bearer token or come from an address of ``METRICS_ALLOWED_NETWORKS``.
+    param request: A request object.
+    type request: request
+    """
+    if settings.METRICS_TOKEN and request.headers.get("Authorization") == f"Bearer {settings.METRICS_TOKEN}":
+        return True
+    try:
+        address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network, strict=False)
+               for network in settings.METRICS_ALLOWED_NETWORKS)
+
+
+def metrics_view(request):
+    """
+    This function is created to expose the request metrics to Prometheus, to the requests
+    allowed by ``is_metrics_allowed``.
+    """
+    if not is_metrics_allowed(request):
+        return HttpResponse(status=401 if settings.METRICS_TOKEN else 403)
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,165 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+
+
+class KeysetPage(list):
+    """
+    List of page objects with the cursors of the neighbouring pages.
+    """
+    next_cursor = None
+    previous_cursor = None
+    count = None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination ordered by ``created`` and ``id``.
+
+    The cursor is an opaque token holding the position of the first or last object of
+    the current page, so every page is fetched with an indexed range query instead of
+    an ``OFFSET`` and stays stable while books are added.
+    """
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+
+    def __init__(self, page_size=None, with_count=None, get_count=None):
+        self.page_size = int(page_size or settings.DEFAULT_PAGE_SIZE)
+        self.with_count = settings.PAGINATION_COUNT if with_count is None else with_count
+        # Optional callable returning the known number of objects, used instead of a COUNT query.
+        self.get_count = get_count
+
+    @classmethod
+    def is_requested(cls, request):
+        """
+        Whether the request should be paginated with cursors instead of page numbers.
+        """
+        return settings.PAGINATION_MODE == "cursor" or cls.cursor_query_param in _get_params(request)
+
+    @staticmethod
+    def encode_cursor(obj, reverse):
+        position = "|".join([obj.created.isoformat(), str(obj.pk), "r" if reverse else "f"])
+        return base64.urlsafe_b64encode(position.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor):
+        if not cursor:
+            return None
+        try:
+            position = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            created, pk, direction = position.split("|")
+            return datetime.fromisoformat(created), int(pk), direction == "r"
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValidationError({"cursor": "Invalid cursor."})
+
+    @staticmethod
+    def get_page_queryset(queryset, position):
+        """
+        Filter and order the queryset to start right after the cursor position.
+        """
+        reverse = bool(position and position[2])
+        if position:
+            created, pk, _ = position
+            if reverse:
+                queryset = queryset.filter(Q(created__lt=created) | Q(created=created, id__lt=pk))
+            else:
+                queryset = queryset.filter(Q(created__gt=created) | Q(created=created, id__gt=pk))
+        return queryset.order_by(*(("-created", "-id") if reverse else ("created", "id")))
+
+    def iterate_queryset(self, queryset, request, chunk_size):
+        """
+        Iterate the page in chunks without holding it in memory, the ``next_cursor`` attribute
+        is set once the page is exhausted. Only forward cursors can be iterated.
+        """
+        position = self.decode_cursor(_get_params(request).get(self.cursor_query_param))
+        if position and position[2]:
+            raise ValidationError({"cursor": "Only forward cursors can be streamed."})
+        self.next_cursor = None
+        rows = self.get_page_queryset(queryset, position)[:self.page_size + 1].iterator(chunk_size=chunk_size)
+
+        def iterate():
+            last = None
+            for index, obj in enumerate(rows):
+                if index == self.page_size:
+                    self.next_cursor = self.encode_cursor(last, reverse=False)
+                    return
+                last = obj
+                yield obj
+        return iterate()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = _get_params(request)
+        position = self.decode_cursor(params.get(self.cursor_query_param))
+        count = None
+        if self._is_counted(params):
+            count = self.get_count() if self.get_count else None
+            count = queryset.count() if count is None else count
+        rows = list(self.get_page_queryset(queryset, position)[:self.page_size + 1])
+        return self._get_page(rows, position, count)
+
+    async def apaginate_queryset(self, queryset, request):
+        """
+        Async version of ``paginate_queryset`` using the async queryset interface.
+        """
+        params = _get_params(request)
+        position = self.decode_cursor(params.get(self.cursor_query_param))
+        count = await queryset.acount() if self._is_counted(params) else None
+        rows = [obj async for obj in self.get_page_queryset(queryset, position)[:self.page_size + 1]]
+        return self._get_page(rows, position, count)
+
+    def _is_counted(self, params):
+        return params.get(self.count_query_param, str(self.with_count)).lower() in ("true", "1")
+
+    def _get_page(self, rows, position, count):
+        reverse = bool(position and position[2])
+        page = KeysetPage()
+        page.count = count
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+        page.extend(rows)
+
+        # Walking backwards there is always a next page, the one the cursor came from.
+        has_next = True if reverse else has_more
+        has_previous = has_more if reverse else position is not None
+        if rows and has_next:
+            page.next_cursor = self.encode_cursor(rows[-1], reverse=False)
+        if rows and has_previous:
+            page.previous_cursor = self.encode_cursor(rows[0], reverse=True)
+        return page
+
+
+class CountedPageNumberPagination(PageNumberPagination):
+    """
+    Page number pagination taking the number of objects from a callable when it is known,
+    instead of a COUNT query.
+    """
+
+    def __init__(self, get_count=None):
+        self.get_count = get_count
+
+    def django_paginator_class(self, object_list, per_page, *args, **kwargs):
+        paginator = Paginator(object_list, per_page, *args, **kwargs)
+        count = self.get_count() if self.get_count else None
+        if count is not None:
+            paginator.count = count
+        return paginator
+
+
+def _get_params(request):
+    return getattr(request, "query_params", request.GET)
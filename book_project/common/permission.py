@@ -1,7 +1,112 @@
-from rest_framework.exceptions import NotAuthenticated, PermissionDenied
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_permission_codename
+from django.core.cache import cache
+from rest_framework.exceptions import MethodNotAllowed, NotAuthenticated, PermissionDenied
 from rest_framework.permissions import BasePermission
-from django.contrib.auth.models import Permission
-from django.contrib.contenttypes.models import ContentType
+
+# Mapping of request method to the permission action.
+PERMISSION_SCOPE = {
+    "GET": "view",
+    "HEAD": "view",
+    "POST": "add",
+    "PUT": "change",
+    "PATCH": "change",
+    "DELETE": "delete",
+}
+
+PERMISSION_GENERATION_KEY = "permission:generation"
+
+_scope_permissions = {}
+
+
+def load_scope_permissions():
+    """
+    This function is created to map request method to the permission of every model,
+    so the permission check does not need to query content types.
+    """
+    _scope_permissions.clear()
+    for model in apps.get_models():
+        opts = model._meta
+        _scope_permissions.setdefault(opts.model_name, {
+            method: f"{opts.app_label}.{get_permission_codename(action, opts)}"
+            for method, action in PERMISSION_SCOPE.items()})
+    return _scope_permissions
+
+
+def get_scope_permissions(basename):
+    """
+    This function is created to get the request method to permission mapping of a viewset.
+    param basename: A viewset basename, same as the model name.
+    type basename: str
+    """
+    if not _scope_permissions:
+        load_scope_permissions()
+    return _scope_permissions[basename]
+
+
+def get_method_permission(basename, method):
+    """
+    This function is created to get the permission of the request method on a viewset,
+    methods without a permission such as ``OPTIONS`` are not allowed.
+    param basename: A viewset basename, same as the model name.
+    type basename: str
+    param method: The request method.
+    type method: str
+    """
+    permission = get_scope_permissions(basename).get(method)
+    if permission is None:
+        raise MethodNotAllowed(method)
+    return permission
+
+
+def _get_permission_cache_key(user_id, generation=None):
+    generation = generation or cache.get_or_set(PERMISSION_GENERATION_KEY, 1, None)
+    return f"permission:{generation}:user:{user_id}"
+
+
+def get_user_permissions(user):
+    """
+    This function is created to get the cached effective permissions of the user.
+    param user: A user object.
+    type user: User
+    """
+    key = _get_permission_cache_key(user.pk)
+    permissions = cache.get(key)
+    if permissions is None:
+        permissions = frozenset(user.get_all_permissions())
+        cache.set(key, permissions, settings.PERMISSION_CACHE_TIMEOUT)
+    return permissions
+
+
+async def aget_user_permissions(user):
+    """
+    Async version of ``get_user_permissions``.
+    """
+    key = _get_permission_cache_key(user.pk, await cache.aget_or_set(PERMISSION_GENERATION_KEY, 1, None))
+    permissions = await cache.aget(key)
+    if permissions is None:
+        permissions = frozenset(await sync_to_async(user.get_all_permissions)())
+        await cache.aset(key, permissions, settings.PERMISSION_CACHE_TIMEOUT)
+    return permissions
+
+
+def invalidate_user_permissions(*user_ids):
+    """
+    This function is created to drop the cached permissions of the given users.
+    """
+    cache.delete_many([_get_permission_cache_key(user_id) for user_id in user_ids])
+
+
+def invalidate_all_permissions():
+    """
+    This function is created to drop the cached permissions of every user.
+    """
+    try:
+        cache.incr(PERMISSION_GENERATION_KEY)
+    except ValueError:
+        cache.set(PERMISSION_GENERATION_KEY, 2, None)
 
 
 class BookPermission(BasePermission):
@@ -10,17 +115,19 @@ class BookPermission(BasePermission):
     """
 
     def has_permission(self, request, view):
-        scope = {
-            "GET": "view",
-            "POST": "add",
-            "PUT": "change",
-            "PATCH": "change",
-            "DELETE": "delete",
-        }
-        available_permissions = Permission.objects.get(content_type=ContentType.objects.get(model=view.basename),
-                                                       codename__contains=scope[request.method])
-
-        if request.user.has_perm(
-                available_permissions.codename) or f'{available_permissions.content_type.app_label}.{available_permissions.codename}' in request.user.get_group_permissions():
+        permission = get_method_permission(view.basename, request.method)
+        user = request.user
+        if (user.is_active and user.is_superuser) or permission in get_user_permissions(user):
             return True
         raise PermissionDenied()
+
+
+class AsyncBookPermission(object):
+    """
+    Async version of ``BookPermission`` for async views.
+    """
+
+    async def has_permission(self, request, view):
+        permission = get_method_permission(view.basename, request.method)
+        user = request.user
+        return (user.is_active and user.is_superuser) or permission in await aget_user_permissions(user)
@@ -0,0 +1,29 @@
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from common.hashing import hash_password
+from db.models import User
+
+
+def register_user(email, first_name, last_name, password, user_type, phone_number=None, username=None,
+                  is_staff=False, with_token=False):
+    """
+    This function is created to add the user with a single insert, the password is hashed before
+    the transaction starts and the token is added in the same transaction.
+    The group of the user type is assigned by the ``assign_user_to_group`` signal.
+    param phone_number: Phone number of the user, it is optional.
+    type phone_number: int
+    param username: Name shown to other users, ``first_name last_name`` by default.
+    type username: str
+    param is_staff: Whether the user can log into the admin site.
+    type is_staff: bool
+    param with_token: Whether an API token is added for the user.
+    type with_token: bool
+    """
+    user = User(username=username or " ".join([first_name, last_name]), first_name=first_name,
+                last_name=last_name, email=email, phone_number=phone_number, user_type=user_type,
+                is_staff=is_staff, is_active=True, password=hash_password(password))
+    with transaction.atomic():
+        user.save(force_insert=True)
+        token = Token.objects.create(user=user) if with_token else None
+    return user, token
@@ -0,0 +1,93 @@
+import asyncio
+import functools
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+# Name of the cookie keeping the reads of a client on the primary database after it wrote.
+PRIMARY_COOKIE = "read_primary"
+
+PRIMARY = "default"
+
+_replica_reads = ContextVar("replica_reads", default=False)
+_pinned = ContextVar("pinned_to_primary", default=False)
+
+
+def pin_to_primary(pinned=True):
+    """
+    This function is created to keep the reads of the current request on the primary database,
+    the client wrote recently and the replicas may not have its changes yet.
+    Returns a token to pass to ``unpin``.
+    """
+    return _pinned.set(pinned)
+
+
+def unpin(token):
+    _pinned.reset(token)
+
+
+def reads_from_replica():
+    """
+    This function is created to check whether the reads of the current request are sent to a replica,
+    data read from a replica may miss the latest writes.
+    """
+    return bool(settings.DATABASE_REPLICAS) and _replica_reads.get() and not _pinned.get()
+
+
+def read_from_replica(view):
+    """
+    This function is created to send the reads of the decorated view to a replica, unless the client
+    is pinned to the primary database. Works with sync and async views.
+    param view: A view function or method.
+    type view: callable
+    """
+    if asyncio.iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def wrapper(*args, **kwargs):
+            token = _replica_reads.set(True)
+            try:
+                return await view(*args, **kwargs)
+            finally:
+                _replica_reads.reset(token)
+        return wrapper
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        token = _replica_reads.set(True)
+        try:
+            return view(*args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+    return wrapper
+
+
+class ReplicaRouter(object):
+    """
+    Database router sending the reads of views decorated with ``read_from_replica`` to a random replica
+    of ``DATABASE_REPLICAS``, every other query goes to the primary database.
+    """
+
+    @staticmethod
+    def db_for_read(model, **hints):
+        if not reads_from_replica():
+            return PRIMARY
+        # A read in a transaction of the primary must see the writes of that transaction.
+        if connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    @staticmethod
+    def db_for_write(model, **hints):
+        return PRIMARY
+
+    @staticmethod
+    def allow_relation(obj1, obj2, **hints):
+        # The replicas hold the same rows as the primary.
+        return True
+
+    @staticmethod
+    def allow_migrate(db, app_label, model_name=None, **hints):
+        # The replicas copy the schema from the primary.
+        return db == PRIMARY
@@ -0,0 +1,142 @@
+import math
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, Count, F, FloatField, Sum, When
+from django.db.models.expressions import RawSQL
+
+from db.models import Book, BookSearchTerm
+
+# Weight of a term occurrence in every indexed field.
+FIELD_WEIGHTS = {
+    "title": 3,
+    "author": 2,
+    "description": 1,
+}
+
+STOP_WORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of", "on", "or",
+    "that", "the", "this", "to", "was", "with",
+])
+
+MAX_TERM_LENGTH = 40
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """
+    This function is created to split the text into normalized search terms.
+    param text: A text to tokenize.
+    type text: str
+    """
+    return [token[:MAX_TERM_LENGTH] for token in TOKEN_PATTERN.findall((text or "").lower())
+            if len(token) > 1 and token not in STOP_WORDS]
+
+
+def get_book_terms(book):
+    """
+    This function is created to get the weighted terms of the book.
+    param book: A book object.
+    type book: Book
+    """
+    terms = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(getattr(book, field)):
+            terms[token] += weight
+    return terms
+
+
+class InvertedIndexBackend(object):
+    """
+    Search backend storing an inverted index of book terms in ``BookSearchTerm``,
+    it works on every database.
+    """
+    # The index is written by the application when a book is saved.
+    index_on_save = True
+
+    @staticmethod
+    def index_book(book):
+        """
+        Update the index of the book, only the changed terms are written.
+        """
+        terms = get_book_terms(book)
+        existing = {term: (pk, weight) for pk, term, weight in
+                    BookSearchTerm.objects.filter(book=book).values_list("id", "term", "weight")}
+        removed = [pk for term, (pk, _) in existing.items() if term not in terms]
+        changed = [BookSearchTerm(id=existing[term][0], weight=weight) for term, weight in terms.items()
+                   if term in existing and existing[term][1] != weight]
+        added = [BookSearchTerm(term=term, book=book, weight=weight) for term, weight in terms.items()
+                 if term not in existing]
+        with transaction.atomic():
+            if removed:
+                BookSearchTerm.objects.filter(id__in=removed).delete()
+            if changed:
+                BookSearchTerm.objects.bulk_update(changed, ["weight"])
+            if added:
+                BookSearchTerm.objects.bulk_create(added)
+
+    @staticmethod
+    def index_books(books, batch_size=1000):
+        """
+        Rebuild the index of many books at once.
+        """
+        books = list(books)
+        with transaction.atomic():
+            BookSearchTerm.objects.filter(book__in=books).delete()
+            BookSearchTerm.objects.bulk_create(
+                [BookSearchTerm(term=term, book=book, weight=weight)
+                 for book in books for term, weight in get_book_terms(book).items()],
+                batch_size=batch_size)
+
+    @staticmethod
+    def search(query):
+        """
+        Get the books matching the query ranked by the number of matched terms and tf-idf score.
+        """
+        terms = set(tokenize(query))
+        document_frequency = dict(BookSearchTerm.objects.filter(term__in=terms).values("term").annotate(
+            count=Count("book")).values_list("term", "count"))
+        if not document_frequency:
+            return Book.objects.none()
+        max_frequency = max(document_frequency.values())
+        score = Sum(Case(*[When(search_terms__term=term,
+                                then=F("search_terms__weight") * math.log(1 + max_frequency / frequency))
+                           for term, frequency in document_frequency.items()], output_field=FloatField()))
+        return Book.objects.filter(search_terms__term__in=document_frequency).annotate(
+            matched=Count("search_terms"), score=score).order_by("-matched", "-score", "id")
+
+
+class MySQLFullTextBackend(object):
+    """
+    Search backend using the MySQL ``FULLTEXT`` index of the book table,
+    MySQL keeps the index up to date itself.
+    """
+    match = "MATCH (title, author, description) AGAINST (%s IN NATURAL LANGUAGE MODE)"
+    index_on_save = False
+
+    @staticmethod
+    def index_book(book):
+        return None
+
+    @staticmethod
+    def index_books(books, batch_size=1000):
+        return None
+
+    @classmethod
+    def search(cls, query):
+        return Book.objects.extra(where=[cls.match], params=[query]).annotate(
+            score=RawSQL(cls.match, [query])).order_by("-score", "id")
+
+
+def get_search_backend():
+    """
+    This function is created to get the configured search backend,
+    ``auto`` uses the full-text index on MySQL and the inverted index elsewhere.
+    """
+    backend = settings.SEARCH_BACKEND
+    if backend == "auto":
+        backend = "mysql" if connection.vendor == "mysql" else "index"
+    return MySQLFullTextBackend if backend == "mysql" else InvertedIndexBackend
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from common.metrics import timed
 from db.models import User, Book
 
 
@@ -19,3 +21,36 @@ class BookSerializer(serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = ["id", "title", "category", "description", "author", "slug"]
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def to_representation(self, instance):
+        with timed("serialize"):
+            return super().to_representation(instance)
+
+    @classmethod
+    def sparse(cls, queryset, params, keep=()):
+        """
+        Apply the comma separated ``fields`` and ``exclude`` query params to the queryset, so only
+        the selected columns are loaded. Returns the queryset and the selected field names,
+        which are ``None`` when every field is selected. The ``keep`` fields are loaded anyway.
+        """
+        fields = [name.strip() for name in params.get("fields", "").split(",") if name.strip()]
+        exclude = [name.strip() for name in params.get("exclude", "").split(",") if name.strip()]
+        if not fields and not exclude:
+            return queryset, None
+        unknown = set(fields + exclude) - set(cls.Meta.fields)
+        if unknown:
+            raise serializers.ValidationError({"fields": f"Unknown fields {', '.join(sorted(unknown))}."})
+        if fields:
+            # Pagination and cache headers read the timestamps, keep them loaded.
+            queryset = queryset.only(*set(fields) | {"created", "updated"} | set(keep))
+        else:
+            fields = list(cls.Meta.fields)
+        deferred = set(exclude) - set(keep)
+        queryset = queryset.defer(*deferred) if deferred else queryset
+        return queryset, [name for name in fields if name not in exclude]
@@ -0,0 +1,30 @@
+from django.contrib.sessions.backends.base import VALID_KEY_CHARS
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.utils.crypto import get_random_string
+
+
+class SessionStore(CachedDBStore):
+    """
+    Session store reading the sessions from the cache and writing them through to the database,
+    so a page view only reads the database when the session is missing from the cache.
+    Like every Django session store, the session is only saved when it changed.
+    """
+
+    def _get_new_session_key(self):
+        # The insert of a new session fails on a duplicate key and is tried again with another key,
+        # so the key is not looked up first.
+        return get_random_string(32, VALID_KEY_CHARS)
+
+    def cycle_key(self):
+        """
+        This method includes business logic to give the session a new key on login while keeping its data.
+        The new key is only inserted when the session is saved at the end of the request, so login writes
+        the session once instead of inserting it and updating it again.
+        """
+        data = self._session
+        key = self.session_key
+        self._session_key = None
+        self._session_cache = data
+        self.modified = True
+        if key:
+            self.delete(key)
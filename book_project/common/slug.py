@@ -0,0 +1,95 @@
+from django.db.models import BigIntegerField
+from django.db.models.functions import Cast, Substr
+from django.utils.text import slugify
+
+from db.models import Book, BookSlugRedirect
+
+SLUG_MAX_LENGTH = Book._meta.get_field("slug").max_length
+
+# Room left in a slug for the ``-<number>`` suffix added on collision.
+SUFFIX_LENGTH = 8
+
+# Number of slugs looked up by one query.
+LOOKUP_BATCH_SIZE = 100
+
+
+def _get_base(title):
+    base = slugify(title)[:SLUG_MAX_LENGTH].strip("-") or "book"
+    return base, base[:SLUG_MAX_LENGTH - SUFFIX_LENGTH].rstrip("-")
+
+
+def _get_taken_bases(bases, book_id):
+    taken = set(Book.objects.filter(slug__in=bases).exclude(id=book_id).values_list("slug", flat=True))
+    taken.update(BookSlugRedirect.objects.filter(slug__in=bases).exclude(book_id=book_id).values_list(
+        "slug", flat=True))
+    return taken
+
+
+def _get_last_suffix(short, book_id):
+    # The range reads the slugs of the base followed by a digit from the index, ``:`` sorts right after ``9``,
+    # and the pattern keeps the numbered ones. Slugs only hold letters, digits, ``-`` and ``_``, the short
+    # base needs no escaping in the pattern.
+    filters = {"slug__range": (f"{short}-0", f"{short}-:"), "slug__regex": rf"^{short}-[0-9]+$"}
+    suffix = Cast(Substr("slug", len(short) + 2), BigIntegerField())
+    books = Book.objects.filter(**filters).exclude(id=book_id).annotate(suffix=suffix)
+    redirects = BookSlugRedirect.objects.filter(**filters).exclude(book_id=book_id).annotate(suffix=suffix)
+    last = list(books.values_list("suffix", flat=True).union(
+        redirects.values_list("suffix", flat=True), all=True).order_by("-suffix")[:1])
+    return last[0] if last else 1
+
+
+def allocate_slugs(titles, book_id=None, next_suffix=None):
+    """
+    This function is created to allocate a unique slug for every title.
+    A colliding slug gets the next free ``-<number>`` suffix, the used bases are read with indexed
+    queries for the whole batch and only the largest suffix is read for every colliding base,
+    so the cost does not grow with the number of books sharing a title.
+    param titles: A list of book titles.
+    type titles: list
+    param book_id: Id of the book being renamed, its own slugs are not collisions.
+    type book_id: int
+    param next_suffix: Next free suffix of every colliding short base, it is updated in place, so the batches
+        of one seeding run share it and the bases already known are not looked up again. Only valid while
+        no other writer adds books.
+    type next_suffix: dict
+    """
+    next_suffix = {} if next_suffix is None else next_suffix
+    bases = [_get_base(title) for title in titles]
+    # A short base with a known suffix only has one because its base is taken.
+    unique_bases = list(dict.fromkeys(base for base, short in bases if short not in next_suffix))
+    taken = set()
+    for start in range(0, len(unique_bases), LOOKUP_BATCH_SIZE):
+        taken.update(_get_taken_bases(unique_bases[start:start + LOOKUP_BATCH_SIZE], book_id))
+
+    slugs = []
+    for base, short in bases:
+        if base not in taken and short not in next_suffix:
+            slug = base
+            # The base of a title ending in a number holds a suffix of another base, e.g. ``acme-5``,
+            # a later batch sharing the suffixes must not give it again.
+            prefix, _, number = slug.rpartition("-")
+            if number.isdigit() and prefix in next_suffix:
+                next_suffix[prefix] = max(next_suffix[prefix], int(number) + 1)
+        else:
+            if short not in next_suffix:
+                next_suffix[short] = _get_last_suffix(short, book_id) + 1
+            # A slug given earlier in the batch may hold the suffix, e.g. the base of a title ending in a number.
+            while f"{short}-{next_suffix[short]}" in taken:
+                next_suffix[short] += 1
+            slug = f"{short}-{next_suffix[short]}"
+            next_suffix[short] += 1
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def get_book_by_slug(slug):
+    """
+    This function is created to get the book by its slug, following the previous slugs of renamed books.
+    param slug: A current or previous book slug.
+    type slug: str
+    """
+    try:
+        return Book.objects.get(slug=slug)
+    except Book.DoesNotExist:
+        return Book.objects.get(slug_redirects__slug=slug)
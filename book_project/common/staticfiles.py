@@ -0,0 +1,57 @@
+import mimetypes
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+from common.compression import ENCODING_EXTENSIONS, PREFERRED_ENCODINGS, compress, is_compressible
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Static files storage saving the files of ``collectstatic`` under names holding the hash of their content,
+    e.g. ``css/bootstrap.3b2a1c.css``, so the browsers can cache them forever, and saving a gzip and, when
+    brotli is installed, a brotli variant next to every compressible file for ``StaticFilesMiddleware``.
+    """
+
+    # Only the references to other files are rewritten to their hashed names, the source maps
+    # referenced by the vendored bootstrap and popper files are not shipped.
+    patterns = (
+        ("*.css", (
+            r"""(?P<matched>url\(['"]{0,1}\s*(?P<url>.*?)["']{0,1}\))""",
+            (r"""(?P<matched>@import\s*["']\s*(?P<url>.*?)["'])""", """@import url("%(url)s")"""),
+        )),
+    )
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        # The unhashed names are collected as well and are compressed too, e.g. for pages linking them.
+        names = set(self.hashed_files) | set(self.hashed_files.values())
+        for name in sorted(names):
+            for _, compressed_name in self.compress_file(name):
+                yield name, compressed_name, True
+
+    def compress_file(self, name):
+        """
+        This method includes business logic to save the compressed variants of the file,
+        a variant is skipped when it is not smaller than the file.
+        param name: Name of the file in the storage.
+        type name: str
+        """
+        content_type, _ = mimetypes.guess_type(name)
+        if not self.exists(name) or not is_compressible(content_type):
+            return []
+        with self.open(name) as file:
+            data = file.read()
+        saved = []
+        for encoding in PREFERRED_ENCODINGS:
+            compressed = compress(data, encoding)
+            if len(compressed) >= len(data):
+                continue
+            compressed_name = name + ENCODING_EXTENSIONS[encoding]
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            self._save(compressed_name, ContentFile(compressed))
+            saved.append((encoding, compressed_name))
+        return saved
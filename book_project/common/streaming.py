@@ -0,0 +1,51 @@
+import json
+
+from rest_framework.utils.encoders import JSONEncoder
+
+# Number of objects encoded into one chunk of the response.
+CHUNK_SIZE = 100
+
+encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _chunks(objects, serializer):
+    chunk = []
+    for obj in objects:
+        chunk.append(encoder.encode(serializer.to_representation(obj)))
+        if len(chunk) == CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_json(objects, serializer, trailer):
+    """
+    This function is created to encode the objects as a JSON object ``{"Data": [...], ...}``
+    one chunk at a time.
+    param objects: An iterable of model objects.
+    type objects: iterable
+    param serializer: A serializer used to represent every object.
+    type serializer: Serializer
+    param trailer: A callable returning the keys written after the data, once the objects are exhausted.
+    type trailer: callable
+    """
+    yield '{"Data":['
+    separator = ""
+    for chunk in _chunks(objects, serializer):
+        yield separator + ",".join(chunk)
+        separator = ","
+    yield "]"
+    for key, value in trailer().items():
+        yield f",{json.dumps(key)}:{encoder.encode(value)}"
+    yield "}"
+
+
+def stream_ndjson(objects, serializer, trailer):
+    """
+    This function is created to encode the objects as JSON Lines, one object per line,
+    followed by a line holding the trailer keys.
+    """
+    for chunk in _chunks(objects, serializer):
+        yield "\n".join(chunk) + "\n"
+    yield encoder.encode(trailer()) + "\n"
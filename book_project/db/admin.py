@@ -1,5 +1,5 @@
 from django.contrib import admin
-from db.models import User, Book
+from db.models import User, Book, Job
 
 
 @admin.register(User)
@@ -16,4 +16,12 @@ class BookAdmin(admin.ModelAdmin):
     """
     Class to manage user table on book panel.
    """
-    list_display = ["title", "created", "updated"]
\ No newline at end of file
+    list_display = ["title", "created", "updated"]
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """
+    Class to manage background job table on admin panel.
+    """
+    list_display = ["name", "status", "attempts", "run_at", "last_error"]
+    list_filter = ["status", "name"]
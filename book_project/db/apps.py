@@ -8,7 +8,11 @@ class DbAppConfig(AppConfig):
     name = 'db'
 
     def ready(self):
+        import common.checks
         import db.signal
+        import db.tasks
+        from common.permission import load_scope_permissions
+        load_scope_permissions()
         post_migrate.connect(db.signal.populate_groups, sender=self)
         post_migrate.connect(db.signal.populate_users, sender=self)
         post_migrate.connect(db.signal.populate_books, sender=self)
@@ -0,0 +1,129 @@
+import random
+
+import faker
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, Permission
+from django.db import transaction
+
+from common.cache import bump_catalogue_generation
+from common.facet import change_facet_counts, count_facets
+from common.permission import invalidate_all_permissions
+from common.search import get_search_backend
+from common.slug import allocate_slugs
+from db.models import Book, User
+
+# Number of books added by the seeder per scale unit.
+SEED_BOOKS = 25
+
+SEED_PASSWORD = "password"
+
+SEED_USERS = [
+    {"email": "admin@mail.com", "first_name": "Admin", "last_name": "Book", "username": "Book Admin",
+     "phone_number": "987654321", "user_type": "admin"},
+    {"email": "rupam@mail.com", "first_name": "Rupam", "last_name": "Solanki", "username": "Rupam Solanki",
+     "phone_number": "987654321", "user_type": "student"},
+    {"email": "james@mail.com", "first_name": "James", "last_name": "Woods", "username": "James Woods",
+     "phone_number": "987654321", "user_type": "student"},
+]
+
+
+def generate_books(count, batch_size=1000, seed=0, pool_size=1000, index=False):
+    """
+    This function is created to add fake books quickly for development and load testing.
+    Titles, authors and descriptions are drawn from a pool generated once with Faker,
+    so large counts do not pay for a 55 sentence paragraph per book.
+    param count: Number of books to add.
+    type count: int
+    param seed: Seed of the random data, the same seed generates the same books.
+    type seed: int
+    param index: Whether the books are added to the search index.
+    type index: bool
+    """
+    fake = faker.Faker()
+    fake.seed_instance(seed)
+    rand = random.Random(seed)
+    pool_size = max(min(pool_size, count), 1)
+    titles = [fake.company() for _ in range(pool_size)]
+    authors = [fake.name()[:15] for _ in range(pool_size)]
+    descriptions = [fake.paragraph(nb_sentences=55) for _ in range(min(pool_size, 100))]
+    categories = [category for category in Book.BookCategory]
+    # The titles repeat across the batches, the next suffix of every title is kept between them
+    # instead of being looked up again.
+    next_suffix = {}
+
+    for start in range(0, count, batch_size):
+        books = [Book(title=rand.choice(titles), category=rand.choice(categories),
+                      description=rand.choice(descriptions), author=rand.choice(authors))
+                 for _ in range(min(batch_size, count - start))]
+        for book, slug in zip(books, allocate_slugs([book.title for book in books], next_suffix=next_suffix)):
+            book.slug = slug
+        with transaction.atomic():
+            Book.objects.bulk_create(books, batch_size=batch_size)
+            change_facet_counts(count_facets(books))
+            if index:
+                if books[0].pk is None:
+                    # Backends without RETURNING do not set the primary keys, fetch them for indexing.
+                    books = list(Book.objects.filter(slug__in=[book.slug for book in books]))
+                get_search_backend().index_books(books, batch_size=batch_size)
+    return count
+
+
+def load_groups():
+    """
+    This function is created to give the admin group every permission and the student group
+    the view permissions, the missing ones are added with a single insert.
+    """
+    groups = Group.objects.in_bulk(["Admin", "Student"], field_name="name")
+    permissions = list(Permission.objects.values_list("id", "codename"))
+    Group.permissions.through.objects.bulk_create([
+        Group.permissions.through(group_id=group.id, permission_id=permission_id)
+        for name, group in groups.items()
+        for permission_id, codename in permissions
+        if name == "Admin" or "view" in codename], ignore_conflicts=True)
+    invalidate_all_permissions()
+    return True
+
+
+def load_users():
+    """
+    This function is created to add the built-in users missing from the database,
+    the password is hashed once for all of them.
+    """
+    existing = set(User.objects.filter(email__in=[user["email"] for user in SEED_USERS]).values_list(
+        "email", flat=True))
+    users = [User(is_staff=True, is_active=True, is_superuser=user["user_type"] == User.UserType.admin, **user)
+             for user in SEED_USERS if user["email"] not in existing]
+    if not users:
+        return 0
+    password = make_password(SEED_PASSWORD)
+    for user in users:
+        user.password = password
+    groups = Group.objects.in_bulk(field_name="name")
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        if users[0].pk is None:
+            users = list(User.objects.filter(email__in=[user.email for user in users]))
+        User.groups.through.objects.bulk_create([
+            User.groups.through(user_id=user.id, group_id=groups[user.user_type.capitalize()].id)
+            for user in users if user.user_type.capitalize() in groups], ignore_conflicts=True)
+    return len(users)
+
+
+def load_books(scale=None, index=True):
+    """
+    This function is created to add fake books until the database holds ``SEED_BOOKS`` books per scale unit,
+    so running it again adds nothing.
+    param scale: Number of scale units, ``SEED_SCALE`` by default.
+    type scale: int
+    param index: Whether the books are added to the search index, ``rebuild_search_index`` can add them later.
+    type index: bool
+    """
+    scale = settings.SEED_SCALE if scale is None else scale
+    existing = Book.objects.count()
+    missing = SEED_BOOKS * scale - existing
+    if missing <= 0:
+        return 0
+    generate_books(missing, seed=existing, index=index)
+    transaction.on_commit(bump_catalogue_generation)
+    return missing
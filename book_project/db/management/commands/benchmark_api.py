@@ -0,0 +1,203 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+from db.fixtures import generate_books
+from db.models import Book, User
+
+# Credentials of the admin user added by the ``populate_users`` seeder.
+ADMIN_EMAIL = "admin@mail.com"
+ADMIN_PASSWORD = "password"
+
+
+class Command(BaseCommand):
+    """
+    Command to measure the throughput, latency and queries per request of the book and auth endpoints.
+    """
+    help = ("Load the database with fake books and measure throughput, p50/p99 latency and queries per request "
+            "of the book and auth endpoints, fails when a scenario runs more queries than its budget "
+            "with the cache cleared.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=10000, help="Number of books the table should hold.")
+        parser.add_argument("--requests", type=int, default=200, help="Number of requests sent per scenario.")
+        parser.add_argument("--login-requests", type=int, default=20,
+                            help="Number of requests sent to the login and register scenarios, "
+                                 "they are bound by password hashing.")
+        parser.add_argument("--scenario", action="append", dest="scenarios",
+                            help="Run only the given scenario, can be repeated.")
+        parser.add_argument("--warm", action="store_true",
+                            help="Keep the cache between requests instead of clearing it before every request, "
+                                 "the query budgets are not checked since cached responses skip the queries.")
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the generated books.")
+        parser.add_argument("--output", help="Write the results to the given JSON file.")
+
+    def handle(self, *args, **options):
+        if not getattr(settings, "BENCHMARK", False):
+            raise CommandError("The benchmark writes to the database, "
+                               "run it with --settings=book_project.benchmark_settings.")
+        call_command("migrate", verbosity=0, interactive=False)
+        existing = Book.objects.count()
+        if existing < options["books"]:
+            started = time.perf_counter()
+            generate_books(options["books"] - existing, seed=options["seed"])
+            self.stdout.write(f"Inserted {options['books'] - existing} books "
+                              f"in {time.perf_counter() - started:.1f} s.")
+        self.stdout.write(f"Books: {Book.objects.count()}")
+
+        self.admin = User.objects.get(email=ADMIN_EMAIL)
+        self.token, _ = Token.objects.get_or_create(user=self.admin)
+        self.api = Client(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        # Tokens are cached by every process, so the token is looked up once before the scenarios
+        # instead of counting against the first one.
+        self.api.get("/rest/book/facets/")
+        self.html = Client()
+        self.html.force_login(self.admin)
+        self.run_id = int(time.time())
+        self.created = []
+        self.cursor = None
+
+        scenarios = self.get_scenarios(options)
+        unknown = set(options["scenarios"] or []) - set(scenarios)
+        if unknown:
+            raise CommandError(f"Unknown scenario {', '.join(sorted(unknown))}, "
+                               f"valid scenarios are {', '.join(scenarios)}.")
+
+        results = {}
+        for name, (request, count) in scenarios.items():
+            if options["scenarios"] and name not in options["scenarios"]:
+                continue
+            if name in ("api_update", "api_destroy"):
+                self.seed_created(count)
+            results[name] = self.measure(request, count, cold=not options["warm"])
+            self.report(name, results[name])
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(results, file, indent=2)
+        if options["warm"]:
+            self.stdout.write("The query budgets are only checked with the cache cleared, run without --warm.")
+        else:
+            self.check_budget(results)
+
+    def get_scenarios(self, options):
+        """
+        This method includes the requests of every scenario, a request is called with the index of the
+        request and returns the response.
+        """
+        requests, login_requests = options["requests"], options["login_requests"]
+        pages = max(Book.objects.count() // int(settings.DEFAULT_PAGE_SIZE), 1)
+        category_pages = {category: max(Book.objects.filter(category=category).count()
+                                        // int(settings.DEFAULT_PAGE_SIZE), 1)
+                          for category in Book.BookCategory.values}
+        books = list(Book.objects.order_by("-id").values_list("id", "slug")[:requests])
+        return {
+            "api_list": (lambda index: self.api.get("/rest/book/", {"page": index % pages + 1}), requests),
+            "api_list_compressed": (lambda index: self.api.get("/rest/book/", {"page": index % pages + 1},
+                                                               HTTP_ACCEPT_ENCODING="zstd, br, gzip"), requests),
+            "api_list_cursor": (self.list_by_cursor, requests),
+            "api_list_category": (lambda index: self.api.get("/rest/book/", {
+                "category": Book.BookCategory.values[index % 3],
+                "page": index % category_pages[Book.BookCategory.values[index % 3]] + 1}), requests),
+            "api_facets": (lambda index: self.api.get("/rest/book/facets/", {"limit": index % 20 + 1}), requests),
+            "api_retrieve": (lambda index: self.api.get(f"/rest/book/{books[index % len(books)][0]}/"), requests),
+            "api_multi_get": (lambda index: self.api.get("/rest/book/", {"ids": ",".join(
+                str(book_id) for book_id, _ in books[index % len(books):][:50])}), requests),
+            "api_create": (self.create_book, requests),
+            "api_update": (lambda index: self.api.patch(
+                f"/rest/book/{self.created[index % len(self.created)]}/",
+                {"author": f"Author {index}"}, content_type="application/json"), requests),
+            "api_destroy": (lambda index: self.api.delete(
+                f"/rest/book/{self.created[index % len(self.created)]}/"), requests),
+            "html_list": (lambda index: self.html.get("/", {"page": index % pages + 1}), requests),
+            "html_detail": (lambda index: self.html.get(f"/book/{books[index % len(books)][1]}"), requests),
+            "token_login": (lambda index: Client().post(
+                "/restUserLogin/", {"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD}), login_requests),
+            "register": (self.register_user, login_requests),
+        }
+
+    def list_by_cursor(self, index):
+        """
+        This method includes business logic to walk the book list with the cursor of the previous page,
+        starting over from the first page after the last one.
+        """
+        response = self.api.get("/rest/book/", {"cursor": self.cursor or ""})
+        self.cursor = response.json()["Next"] if response.status_code == 200 else None
+        return response
+
+    def seed_created(self, count):
+        """
+        This method includes business logic to create the books the update and destroy scenarios
+        write to, when the create scenario did not create enough of them.
+        """
+        for index in range(len(self.created), count):
+            self.create_book(f"seed {index}")
+
+    def create_book(self, index):
+        response = self.api.post("/rest/book/", {
+            "title": f"Benchmark {self.run_id} {index}", "category": "story",
+            "description": "Benchmark book.", "author": "Benchmark"}, content_type="application/json")
+        if response.status_code == 201:
+            self.created.append(response.json()["Data"]["id"])
+        return response
+
+    def register_user(self, index):
+        return Client().post("/rest/register/", {
+            "first_name": f"Benchmark{self.run_id}", "last_name": f"User{index}",
+            "email": f"benchmark{self.run_id}.{index}@mail.com", "password": "password",
+            "phone_number": "987654321", "user_type": "student"}, content_type="application/json")
+
+    @staticmethod
+    def measure(request, count, cold=False):
+        """
+        This method includes business logic to send the requests of a scenario one after another and
+        collect the latency, query count and status code of every request.
+        """
+        latencies, queries, statuses = [], [], {}
+        for index in range(count):
+            if cold:
+                cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = request(index)
+                latencies.append(time.perf_counter() - started)
+            queries.append(len(context))
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        latencies.sort()
+        return {
+            "requests": count,
+            "throughput": count / sum(latencies),
+            "p50": statistics.median(latencies) * 1000,
+            "p99": latencies[min(int(count * 0.99), count - 1)] * 1000,
+            "queries_mean": statistics.mean(queries),
+            "queries_max": max(queries),
+            "statuses": statuses,
+        }
+
+    def report(self, name, result):
+        statuses = ", ".join(f"{code}: {number}" for code, number in sorted(result["statuses"].items()))
+        self.stdout.write(f"{name:<20} {result['throughput']:>8.1f} req/s  p50 {result['p50']:>8.2f} ms  "
+                          f"p99 {result['p99']:>8.2f} ms  queries {result['queries_mean']:>5.1f} "
+                          f"(max {result['queries_max']})  status {statuses}")
+
+    def check_budget(self, results):
+        """
+        This method includes business logic to fail the command when a scenario ran more queries per request
+        than its ``BENCHMARK_QUERY_BUDGET``.
+        """
+        budget = getattr(settings, "BENCHMARK_QUERY_BUDGET", {})
+        regressions = [f"{name} ran {result['queries_max']} queries, budget is {budget[name]}"
+                       for name, result in results.items()
+                       if name in budget and result["queries_max"] > budget[name]]
+        if regressions:
+            raise CommandError("Query count regression: " + "; ".join(regressions) + ".")
+        self.stdout.write(self.style.SUCCESS("All scenarios are within the query budget."))
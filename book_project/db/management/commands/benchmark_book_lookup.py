@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from common.facet import change_facet_counts, count_facets
+from db.models import Book
+
+
+class Command(BaseCommand):
+    """
+    Command to compare the query plan and timing of the book lookups by name.
+    """
+    help = "Compare the query plan and timing of the legacy title/slug lookup with the slug first lookup."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000000, help="Number of books the table should hold.")
+        parser.add_argument("--populate", action="store_true",
+                            help="Insert filler books until the table holds --rows books.")
+        parser.add_argument("--repeat", type=int, default=100, help="Number of times every lookup is timed.")
+
+    def handle(self, *args, **options):
+        if options["populate"]:
+            self.populate(options["rows"])
+        book = Book.objects.order_by("-id").first()
+        if book is None:
+            self.stderr.write("No book found, run the command with --populate.")
+            return
+        self.stdout.write(f"Books: {Book.objects.count()}")
+
+        lookups = {
+            "legacy title OR slug": Book.objects.filter(Q(title=book.title) | Q(slug=book.slug)),
+            "slug (unique index)": Book.objects.filter(slug=book.slug),
+            "title fallback (title index)": Book.objects.filter(title=book.title),
+        }
+        for name, queryset in lookups.items():
+            started = time.perf_counter()
+            for _ in range(options["repeat"]):
+                list(queryset.all())
+            elapsed = (time.perf_counter() - started) / options["repeat"] * 1000
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name}: {elapsed:.3f} ms"))
+            self.stdout.write(queryset.explain())
+
+    def populate(self, rows, batch_size=10000):
+        existing = Book.objects.count()
+        categories = [category for category in Book.BookCategory]
+        for start in range(existing, rows, batch_size):
+            books = Book.objects.bulk_create([
+                Book(title=f"Benchmark book {index}", slug=f"benchmark-book-{index}",
+                     category=categories[index % len(categories)], author=f"Author {index % 1000}",
+                     description="")
+                for index in range(start, min(start + batch_size, rows))])
+            change_facet_counts(count_facets(books))
+        self.stdout.write(f"Inserted {max(rows - existing, 0)} books.")
@@ -0,0 +1,130 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from rest_framework.authtoken.models import Token
+
+from common.compression import RESPONSE_ENCODINGS, compress, compress_stream
+from db.fixtures import generate_books
+from db.management.commands.benchmark_api import ADMIN_EMAIL
+from db.models import Book, User
+
+# Compression levels measured for every encoding, brotli quality for ``br``.
+LEVELS = {
+    "zstd": (1, 3, 6, 9, 19),
+    "br": (1, 4, 5, 6, 11),
+    "gzip": (1, 6, 9),
+}
+
+
+class Command(BaseCommand):
+    """
+    Command to measure the CPU cost and the bytes saved by every response encoding and level
+    on the pages of the book list.
+    """
+    help = ("Fetch pages of the book list uncompressed and measure the compression time, ratio and bytes saved "
+            "of every content encoding and level, for the pages and for a streamed page.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=10000, help="Number of books the table should hold.")
+        parser.add_argument("--pages", type=int, default=20, help="Number of list pages compressed.")
+        parser.add_argument("--stream-size", type=int, default=1000,
+                            help="Number of books of the streamed page, 0 skips it.")
+        parser.add_argument("--repeat", type=int, default=5,
+                            help="Number of times every page is compressed, the median time is reported.")
+        parser.add_argument("--level", action="append", dest="levels", metavar="ENCODING:LEVEL",
+                            help="Measure only the given encoding and level, e.g. br:4, can be repeated.")
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the generated books.")
+        parser.add_argument("--output", help="Write the results to the given JSON file.")
+
+    def handle(self, *args, **options):
+        if not getattr(settings, "BENCHMARK", False):
+            raise CommandError("The benchmark writes to the database, "
+                               "run it with --settings=book_project.benchmark_settings.")
+        levels = self.get_levels(options["levels"])
+        call_command("migrate", verbosity=0, interactive=False)
+        existing = Book.objects.count()
+        if existing < options["books"]:
+            generate_books(options["books"] - existing, seed=options["seed"])
+        token, _ = Token.objects.get_or_create(user=User.objects.get(email=ADMIN_EMAIL))
+        api = Client(HTTP_AUTHORIZATION=f"Token {token.key}", HTTP_ACCEPT_ENCODING="identity")
+
+        pages = max(Book.objects.count() // int(settings.DEFAULT_PAGE_SIZE), 1)
+        bodies = [api.get("/rest/book/", {"page": index % pages + 1}).content for index in range(options["pages"])]
+        self.stdout.write(f"Books: {Book.objects.count()}, list pages of {settings.DEFAULT_PAGE_SIZE} books, "
+                          f"{statistics.mean(len(body) for body in bodies) / 1024:.1f} KiB per page")
+        results = {"pages": self.measure(bodies, levels, options["repeat"], self.compress_page)}
+        if options["stream_size"]:
+            response = api.get("/rest/book/", {"stream": "json", "page_size": options["stream_size"]})
+            chunks = list(response.streaming_content)
+            self.stdout.write(f"Streamed page of {options['stream_size']} books in {len(chunks)} chunks, "
+                              f"{sum(len(chunk) for chunk in chunks) / 1024:.1f} KiB")
+            results["stream"] = self.measure([chunks], levels, options["repeat"], self.compress_chunks)
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(results, file, indent=2)
+
+    @staticmethod
+    def get_levels(values):
+        """
+        static method of class to parse the ``--level`` options into the encodings and levels to measure,
+        encodings missing their library are skipped.
+        """
+        if not values:
+            return [(encoding, level) for encoding in RESPONSE_ENCODINGS for level in LEVELS[encoding]]
+        levels = []
+        for value in values:
+            encoding, _, level = value.partition(":")
+            if encoding not in RESPONSE_ENCODINGS or not level.lstrip("-").isdigit():
+                raise CommandError(f"Invalid level {value}, use ENCODING:LEVEL with an encoding "
+                                   f"of {', '.join(RESPONSE_ENCODINGS)}.")
+            levels.append((encoding, int(level)))
+        return levels
+
+    @staticmethod
+    def compress_page(body, encoding, level):
+        return len(compress(body, encoding, level))
+
+    @staticmethod
+    def compress_chunks(chunks, encoding, level):
+        return sum(len(data) for data in compress_stream(chunks, encoding, level, settings.COMPRESSION_FLUSH_SIZE))
+
+    def measure(self, bodies, levels, repeat, compress_body):
+        """
+        This method includes business logic to compress every body with every encoding and level and report
+        the compression time per body, the ratio, the throughput and the time spent per KiB saved.
+        """
+        size = sum(sum(len(chunk) for chunk in body) if isinstance(body, list) else len(body) for body in bodies)
+        results = []
+        for encoding, level in levels:
+            seconds, compressed = 0, 0
+            for body in bodies:
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    length = compress_body(body, encoding, level)
+                    timings.append(time.perf_counter() - started)
+                seconds += statistics.median(timings)
+                compressed += length
+            saved = size - compressed
+            result = {
+                "encoding": encoding,
+                "level": level,
+                "ms_per_body": seconds / len(bodies) * 1000,
+                "ratio": size / compressed,
+                "saved": saved / size,
+                "mib_per_second": size / seconds / 1024 ** 2,
+                "us_per_kib_saved": seconds * 10 ** 6 / (saved / 1024) if saved > 0 else None,
+            }
+            results.append(result)
+            configured = " (configured)" if settings.COMPRESSION_LEVELS.get(encoding) == level else ""
+            cost = f"{result['us_per_kib_saved']:>7.1f} us/KiB saved" if saved > 0 else "no bytes saved"
+            self.stdout.write(f"{encoding:<5} {level:>3}  {result['ms_per_body']:>8.3f} ms  "
+                              f"ratio {result['ratio']:>5.2f}  saved {result['saved'] * 100:>5.1f} %  "
+                              f"{result['mib_per_second']:>7.1f} MiB/s  {cost}{configured}")
+        return results
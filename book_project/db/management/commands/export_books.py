@@ -0,0 +1,28 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from common.bulk import export_books
+
+
+class Command(BaseCommand):
+    """
+    Command to export every book to a JSON Lines or CSV file.
+    """
+    help = "Export every book to a JSON Lines or CSV file, use - to write to standard output."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path of the file to write.")
+        parser.add_argument("--file-type", choices=["jsonl", "csv"],
+                            help="Type of the file, guessed from the extension by default.")
+        parser.add_argument("--chunk-size", type=int, help="Number of rows fetched at once.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_type = options["file_type"] or ("csv" if path.endswith(".csv") else "jsonl")
+        stream = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+        try:
+            stream.writelines(export_books(file_type, chunk_size=options["chunk_size"]))
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
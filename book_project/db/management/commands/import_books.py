@@ -0,0 +1,35 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from common.bulk import import_books, read_records
+
+
+class Command(BaseCommand):
+    """
+    Command to import books from a JSON Lines or CSV file.
+    """
+    help = "Import books from a JSON Lines or CSV file, use - to read from standard input."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path of the file to import.")
+        parser.add_argument("--file-type", choices=["jsonl", "csv"],
+                            help="Type of the file, guessed from the extension by default.")
+        parser.add_argument("--update", action="store_true", help="Update the books whose slug already exists.")
+        parser.add_argument("--chunk-size", type=int, help="Number of records validated together.")
+        parser.add_argument("--batch-size", type=int, help="Number of rows per bulk query.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_type = options["file_type"] or ("csv" if path.endswith(".csv") else "jsonl")
+        stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        try:
+            result = import_books(read_records(stream, file_type), update=options["update"],
+                                  chunk_size=options["chunk_size"], batch_size=options["batch_size"])
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        for error in result["Errors"]:
+            self.stderr.write(f"Row {error['Row']}: {error['Error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result['Created']} and updated {result['Updated']} books, {len(result['Errors'])} failed."))
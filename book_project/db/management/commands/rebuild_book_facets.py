@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from common.cache import bump_catalogue_generation
+from common.facet import rebuild_facets
+
+
+class Command(BaseCommand):
+    """
+    Command to count the books per category and author again.
+    """
+    help = "Rebuild the book facet table from the books, e.g. after books were written without signals."
+
+    def handle(self, *args, **options):
+        total = rebuild_facets()
+        bump_catalogue_generation()
+        self.stdout.write(self.style.SUCCESS(f"Counted {total} facet values."))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from common.search import get_search_backend
+from db.models import Book
+
+
+class Command(BaseCommand):
+    """
+    Command to rebuild the search index of every book.
+    """
+    help = "Rebuild the search index of every book."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Number of books indexed at once.")
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        batch_size = options["batch_size"]
+        batch, total = [], 0
+        for book in Book.objects.order_by("id").iterator(chunk_size=batch_size):
+            batch.append(book)
+            if len(batch) == batch_size:
+                backend.index_books(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            backend.index_books(batch)
+            total += len(batch)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} books."))
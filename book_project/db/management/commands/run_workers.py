@@ -0,0 +1,70 @@
+import multiprocessing
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from common.jobs import work
+
+
+def run_worker(stop, once, batch_size):
+    """
+    This function is created to run the jobs in a worker process, the worker finishes its current job
+    when the parent asks it to stop.
+    """
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        # Started with spawn, the process does not inherit the loaded apps.
+        django.setup()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    work(stop, once=once, batch_size=batch_size)
+
+
+class Command(BaseCommand):
+    """
+    Command to run the background jobs with a pool of worker processes.
+    """
+    help = ("Run the queued background jobs, e.g. search indexing of saved books, "
+            "with a pool of worker processes. SIGINT or SIGTERM stops the workers after their current job.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=None,
+                            help="Number of worker processes, defaults to JOB_WORKERS.")
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="Number of jobs a worker claims at once, defaults to JOB_BATCH_SIZE.")
+        parser.add_argument("--once", action="store_true", help="Stop when the queue is empty.")
+
+    def handle(self, *args, **options):
+        processes = options["processes"] or settings.JOB_WORKERS
+        stop = multiprocessing.Event()
+        # The handler only records the signal, setting the event from it can deadlock with the main loop.
+        signals = []
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda signum, frame: signals.append(signum))
+        # The workers open their own connections, a forked connection is shared with the parent.
+        connections.close_all()
+        workers = {}
+        self.stdout.write(f"Starting {processes} workers.")
+        while not signals:
+            for index in range(processes):
+                worker = workers.get(index)
+                if worker is not None and worker.is_alive():
+                    continue
+                if worker is not None:
+                    if options["once"] and worker.exitcode == 0:
+                        continue
+                    self.stderr.write(f"Worker {worker.pid} exited with code {worker.exitcode}, restarting it.")
+                workers[index] = worker = multiprocessing.Process(
+                    target=run_worker, args=(stop, options["once"], options["batch_size"]), daemon=True)
+                worker.start()
+            if options["once"] and not any(worker.is_alive() for worker in workers.values()):
+                break
+            time.sleep(1)
+        stop.set()
+        for worker in workers.values():
+            worker.join()
+        self.stdout.write(self.style.SUCCESS("Workers stopped."))
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from db.fixtures import SEED_BOOKS, load_books, load_groups, load_users
+
+
+class Command(BaseCommand):
+    """
+    Command to seed the groups, built-in users and fake books, e.g. a large dataset for load testing.
+    """
+    help = f"Seed the groups, built-in users and {SEED_BOOKS} fake books per scale unit, existing data is kept."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=None,
+                            help=f"Number of scale units, the database holds {SEED_BOOKS} books per unit. "
+                                 f"Defaults to SEED_SCALE.")
+        parser.add_argument("--no-index", action="store_false", dest="index",
+                            help="Do not add the books to the search index, which is the slowest part "
+                                 "of seeding large datasets.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        load_groups()
+        users = load_users()
+        books = load_books(options["scale"], index=options["index"])
+        self.stdout.write(self.style.SUCCESS(f"Added {users} users and {books} books "
+                                             f"in {time.perf_counter() - started:.1f} s."))
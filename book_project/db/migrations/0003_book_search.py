@@ -0,0 +1,45 @@
+# Generated by Django 4.1.1 on 2026-10-18 19:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_fulltext_index(apps, schema_editor):
+    """
+    This method is created to add full-text index on book for MySQL.
+    """
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(
+            "ALTER TABLE db_book ADD FULLTEXT INDEX book_fulltext_idx (title, author, description)")
+
+
+def drop_fulltext_index(apps, schema_editor):
+    """
+    This method is created to remove full-text index of book for MySQL.
+    """
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute("ALTER TABLE db_book DROP INDEX book_fulltext_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0002_initial_data'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=40)),
+                ('weight', models.PositiveIntegerField(default=1)),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='db.book')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='booksearchterm',
+            constraint=models.UniqueConstraint(fields=('term', 'book'), name='unique_book_search_term'),
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.1.1 on 2026-10-18 19:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0004_book_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookSlugRedirect',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(unique=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slug_redirects', to='db.book')),
+            ],
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.1.1 on 2026-10-18 19:58
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_book_facets(apps, schema_editor):
+    """
+    This method is created to count the books per category and author of the existing books.
+    """
+    Book = apps.get_model("db", "Book")
+    BookFacet = apps.get_model("db", "BookFacet")
+    BookFacet.objects.bulk_create([
+        BookFacet(field=field, value=row[field], count=row["count"])
+        for field in ("category", "author")
+        for row in Book.objects.order_by().values(field).annotate(count=Count("id"))], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0005_book_slug_redirect'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=15)),
+                ('value', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='book',
+            name='book_category_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='book',
+            name='book_author_idx',
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['category', 'created', 'id'], name='book_category_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['author', 'created', 'id'], name='book_author_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookfacet',
+            index=models.Index(fields=['field', '-count'], name='book_facet_count_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='bookfacet',
+            constraint=models.UniqueConstraint(fields=('field', 'value'), name='unique_book_facet'),
+        ),
+        migrations.RunPython(count_book_facets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.db import migrations
+
+from common.search import get_book_terms
+
+
+def index_existing_books(apps, schema_editor):
+    """
+    This function is created to add the existing books to the inverted search index, when the index
+    is the search backend. The books indexed already, e.g. by the seeder, are skipped.
+    """
+    backend = settings.SEARCH_BACKEND
+    if backend == "mysql" or (backend == "auto" and schema_editor.connection.vendor == "mysql"):
+        return
+    Book = apps.get_model("db", "Book")
+    BookSearchTerm = apps.get_model("db", "BookSearchTerm")
+    books = Book.objects.filter(search_terms__isnull=True).order_by("id").only(
+        "id", "title", "author", "description")
+    batch = []
+    for book in books.iterator(chunk_size=1000):
+        batch.extend(BookSearchTerm(term=term, book_id=book.id, weight=weight)
+                     for term, weight in get_book_terms(book).items())
+        if len(batch) >= 5000:
+            BookSearchTerm.objects.bulk_create(batch, batch_size=1000)
+            batch = []
+    BookSearchTerm.objects.bulk_create(batch, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0007_job'),
+    ]
+
+    operations = [
+        migrations.RunPython(index_existing_books, migrations.RunPython.noop),
+    ]
@@ -31,10 +31,37 @@ class Book(BaseModel):
     author = models.CharField(max_length=15)
     slug = models.SlugField(unique=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["title"], name="book_title_idx"),
+            models.Index(fields=["category", "created", "id"], name="book_category_created_idx"),
+            models.Index(fields=["author", "created", "id"], name="book_author_created_idx"),
+            models.Index(fields=["created", "id"], name="book_created_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Keep the loaded title, the slug is only regenerated when the title changes.
+        instance._loaded_title = instance.__dict__.get("title")
+        # Keep the loaded facet values, the facet counts move from them when they change.
+        instance._loaded_facets = {name: instance.__dict__[name] for name in BookFacet.FIELDS
+                                   if name in instance.__dict__}
+        return instance
+
     def get_absolute_url(self):
         return reverse("book", kwargs={"slug": self.slug})
 
 
+class BookSlugRedirect(models.Model):
+    """
+    Model for store previous slug of book, so old book URLs keep working.
+    """
+    slug = models.SlugField(unique=True)
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="slug_redirects")
+    created = models.DateTimeField(auto_now_add=True)
+
+
 class User(BaseModel, AbstractUser):
     """
     Model for store user detail.
@@ -52,3 +79,53 @@ class User(BaseModel, AbstractUser):
     REQUIRED_FIELDS = ["username", "first_name", "last_name"]
 
 
+class BookSearchTerm(models.Model):
+    """
+    Model for store inverted search index of book.
+    """
+    term = models.CharField(max_length=40)
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="search_terms")
+    weight = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["term", "book"], name="unique_book_search_term")]
+
+
+class BookFacet(models.Model):
+    """
+    Model for store number of books per category and author, kept up to date on book save and delete.
+    """
+    FIELDS = ("category", "author")
+
+    field = models.CharField(max_length=15)
+    value = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["field", "value"], name="unique_book_facet")]
+        indexes = [models.Index(fields=["field", "-count"], name="book_facet_count_idx")]
+
+
+class Job(BaseModel):
+    """
+    Model for store background job, run by the ``run_workers`` command off the request path.
+    """
+    class JobStatus(models.TextChoices):
+        pending = "pending", "pending"
+        running = "running", "running"
+        failed = "failed", "failed"
+
+    name = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=15, choices=JobStatus.choices, default=JobStatus.pending)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    # The job runs once this time has passed, retries are scheduled later.
+    run_at = models.DateTimeField()
+    # A running job whose worker did not finish it by this time is taken again by another worker.
+    locked_until = models.DateTimeField(null=True)
+    locked_by = models.CharField(max_length=40, blank=True, default="")
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_at"], name="job_status_run_at_idx")]
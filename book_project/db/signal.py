@@ -1,11 +1,41 @@
-import random
+import functools
 
-from django.db.models.signals import post_save, pre_save
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, pre_save, post_delete, m2m_changed
 from django.dispatch import receiver
-from db.models import User, Book
-from django.utils.text import slugify
-from django.contrib.auth.models import Group, Permission
-import faker
+from db.fixtures import load_books, load_groups, load_users
+from db.models import User, Book, BookFacet, BookSlugRedirect
+from db.tasks import enqueue_index
+from django.contrib.auth.models import Group
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from common.authentication import invalidate_token
+from common.cache import bump_catalogue_generation
+from common.facet import change_facet_counts, count_facets
+from common.metrics import record_query
+from common.slug import allocate_slugs
+from common.search import FIELD_WEIGHTS
+from common.permission import invalidate_user_permissions, invalidate_all_permissions
+
+
+@functools.lru_cache(maxsize=None)
+def get_group_id(name):
+    """
+    This function is created to look up the id of the group once, the ids are forgotten when a group
+    is saved or deleted and after every migrate or flush, which add the groups again.
+    """
+    return Group.objects.values_list("id", flat=True).get(name=name)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def clear_group_ids(sender, **kwargs):
+    """
+    This function is created to forget the group ids looked up by ``get_group_id``.
+    """
+    get_group_id.cache_clear()
+    return True
 
 
 @receiver(pre_save, sender=User)
@@ -20,74 +50,188 @@ def assign_user_admin(sender, instance, **kwargs):
 
 
 @receiver(post_save, sender=User)
-def assign_user_to_group(sender, instance, **kwargs):
+def assign_user_to_group(sender, instance, created, update_fields=None, **kwargs):
+    """
+    This function is created to assign user to the group of the user type, when the user is added
+    or the user type is saved.
+    """
+    if not instance.user_type:
+        return True
+    group_id = get_group_id(instance.user_type.capitalize())
+    if created:
+        # A new user has no groups yet, insert the membership without looking it up.
+        User.groups.through.objects.create(user_id=instance.pk, group_id=group_id)
+    elif update_fields is None or "user_type" in update_fields:
+        instance.groups.add(group_id)
+    return True
+
+
+@receiver(post_save, sender=User)
+def clear_user_tokens(sender, instance, created, update_fields=None, **kwargs):
     """
-    This function is created to assign user to the admin.
+    This function is created to clear the cached token authentication of the updated user.
     """
-    if instance.user_type:
-        instance.groups.add(Group.objects.get(name=instance.user_type.capitalize()))
+    if created or update_fields == frozenset(["last_login"]):
+        return True
+    invalidate_token(*Token.objects.filter(user_id=instance.pk).values_list("key", flat=True))
+    return True
+
+
+@receiver(post_delete, sender=Token)
+def clear_token(sender, instance, **kwargs):
+    """
+    This function is created to clear the cached token authentication of the deleted token.
+    """
+    invalidate_token(instance.key)
     return True
 
 
 @receiver(pre_save, sender=Book)
 def create_book_slug(sender, instance, **kwargs):
     """
-    This function is created to store slug in book model.
+    This function is created to store unique slug in book model when the book is added or renamed.
+    """
+    if instance.slug and ("title" in instance.get_deferred_fields() or
+                          getattr(instance, "_loaded_title", None) == instance.title):
+        return True
+    instance._previous_slug = None if instance._state.adding else instance.slug
+    instance.slug = allocate_slugs([instance.title], book_id=instance.pk)[0]
+    return True
+
+
+@receiver(post_save, sender=Book)
+def keep_book_slug_redirect(sender, instance, **kwargs):
+    """
+    This function is created to redirect the previous slug of the renamed book to the new one.
+    """
+    previous_slug = getattr(instance, "_previous_slug", None)
+    if previous_slug and previous_slug != instance.slug:
+        BookSlugRedirect.objects.filter(slug=instance.slug).delete()
+        BookSlugRedirect.objects.update_or_create(slug=previous_slug, defaults={"book": instance})
+    instance._previous_slug = None
+    instance._loaded_title = instance.title
+    return True
+
+
+@receiver(post_save, sender=Book)
+def index_book(sender, instance, update_fields=None, **kwargs):
+    """
+    This function is created to queue the search indexing of the saved book.
+    """
+    if update_fields is None or set(update_fields) & set(FIELD_WEIGHTS):
+        enqueue_index([instance.pk])
+    return True
+
+
+@receiver(pre_save, sender=Book)
+def load_book_facets(sender, instance, **kwargs):
+    """
+    This function is created to load the previous category and author of a book loaded with deferred
+    fields, when they are set before saving.
     """
+    loaded = getattr(instance, "_loaded_facets", None)
+    if instance._state.adding or loaded is None:
+        return True
+    missing = [name for name in BookFacet.FIELDS if name in instance.__dict__ and name not in loaded]
+    if missing:
+        loaded.update(Book.objects.filter(pk=instance.pk).values(*missing).first() or {})
+    return True
 
-    instance.slug = slugify(instance.title)
+
+@receiver(post_save, sender=Book)
+def count_book_facets(sender, instance, created, **kwargs):
+    """
+    This function is created to count the added book, or move the count of the changed category and author,
+    in the transaction of the save so the counts are always committed with the books.
+    """
+    current = {name: instance.__dict__[name] for name in BookFacet.FIELDS if name in instance.__dict__}
+    if created:
+        change_facet_counts(count_facets([current]))
+    elif hasattr(instance, "_loaded_facets"):
+        # Only the values known before saving can have changed, deferred fields are not saved.
+        previous = instance._loaded_facets
+        changes = count_facets([{name: current[name] for name in previous if name in current}])
+        changes.subtract(count_facets([previous]))
+        change_facet_counts(changes)
+    instance._loaded_facets = current
     return True
 
 
+@receiver(post_delete, sender=Book)
+def uncount_book_facets(sender, instance, **kwargs):
+    """
+    This function is created to remove the deleted book from the facet counts.
+    """
+    change_facet_counts(count_facets([instance], sign=-1))
+    return True
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def clear_user_permissions(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    This function is created to clear the cached permissions when user groups or permissions change.
+    """
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return True
+    if not reverse:
+        invalidate_user_permissions(instance.pk)
+    elif pk_set:
+        invalidate_user_permissions(*pk_set)
+    else:
+        invalidate_all_permissions()
+    return True
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def clear_group_permissions(sender, action, **kwargs):
+    """
+    This function is created to clear the cached permissions when group permissions change.
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_all_permissions()
+    return True
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def expire_catalogue(sender, **kwargs):
+    """
+    This function is created to expire the cached book responses once the change is committed.
+    """
+    transaction.on_commit(bump_catalogue_generation)
+    return True
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    This function is created to record the queries of sampled requests on every database connection.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
 def populate_groups(sender, **kwargs):
     """
     This method is created to add permission to group.
     """
-    groups = Group.objects.all()
-    for group in groups:
-        if group.name == "Admin":
-            query = {}
-        else:
-            query = {"codename__contains": "view"}
-        permissions = Permission.objects.filter(**query)
-        group.permissions.add(*permissions)
-    return True
+    # The groups may have been added again with other ids, e.g. after a flush.
+    get_group_id.cache_clear()
+    return load_groups()
 
 
 def populate_users(sender, **kwargs):
     """
     This method is created to create initial users.
     """
-    users = [
-        {"email": "admin@mail.com", "first_name": "Admin", "last_name": "Book", "username": "Book Admin",
-         "password": "password", "phone_number": "987654321", "user_type": "admin"},
-        {"email": "rupam@mail.com", "first_name": "Rupam", "last_name": "Solanki", "username": "Rupam Solanki",
-         "password": "password", "phone_number": "987654321", "user_type": "student"},
-        {"email": "james@mail.com", "first_name": "James", "last_name": "Woods", "username": "James Woods",
-         "password": "password", "phone_number": "987654321", "user_type": "student"},
-    ]
-    for user in users:
-        if not User.objects.filter(email=user["email"]).exists():
-            user_inst = User.objects.create(username=user["username"],
-                                            first_name=user["first_name"],
-                                            last_name=user["last_name"],
-                                            email=user["email"],
-                                            phone_number=user["phone_number"],
-                                            is_staff=True, is_active=True, user_type=user["user_type"],
-                                            )
-            user_inst.set_password(user["password"])
-            user_inst.save()
+    load_users()
     return True
 
 
 def populate_books(sender, **kwargs):
     """
-    This method is created to add books.
+    This method is created to add books, ``SEED_SCALE`` sets how many.
     """
-    fake = faker.Faker()
-    category = [category for category in Book.BookCategory]
-    if Book.objects.count() <= 25:
-        for _ in range(25):
-            Book.objects.create(title=fake.company(), category=random.choice(category),
-                                description=fake.paragraph(nb_sentences=55), author=fake.name())
+    load_books()
     return True
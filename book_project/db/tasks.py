@@ -0,0 +1,36 @@
+from django.db import transaction
+
+from common.cache import bump_catalogue_generation
+from common.jobs import enqueue, task
+from common.search import get_search_backend
+from db.models import Book
+
+
+@task("index_books")
+def index_books(ids):
+    """
+    This function is created to update the search index of the books, deleted books are skipped.
+    param ids: Ids of the books.
+    type ids: list
+    """
+    books = list(Book.objects.filter(id__in=ids))
+    if len(books) == 1:
+        get_search_backend().index_book(books[0])
+    elif books:
+        get_search_backend().index_books(books)
+    # The catalogue was cached with the previous index, e.g. search results.
+    transaction.on_commit(bump_catalogue_generation)
+    return True
+
+
+def enqueue_index(ids):
+    """
+    This function is created to queue the search indexing of the books, when the search backend
+    does not index them in the database itself.
+    param ids: Ids of the books.
+    type ids: list
+    """
+    if ids and get_search_backend().index_on_save:
+        return enqueue("index_books", {"ids": list(ids)})
+    return None
+
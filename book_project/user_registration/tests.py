@@ -0,0 +1,236 @@
+import threading
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+
+from common import hashing
+from common.authentication import PooledModelBackend
+from common.session import SessionStore
+from db.models import User
+from db.signal import get_group_id, populate_groups
+
+
+class RegistrationTest(TestCase):
+    """
+    Tests of the user registration by the REST API and by the registration form.
+    """
+
+    user = {"first_name": "test", "last_name": "user", "email": "test.user@mail.com", "password": "password",
+            "phone_number": "987654321", "user_type": "student"}
+
+    def test_rest_registration(self):
+        response = self.client.post("/rest/register/", self.user, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        user = User.objects.get(email=self.user["email"])
+        self.assertEqual(Token.objects.get(user=user).key, response.json()["Data"]["Token"])
+        self.assertEqual(user.username, "test user")
+        self.assertTrue(user.is_staff)
+        self.assertFalse(user.is_superuser)
+        self.assertTrue(user.check_password(self.user["password"]))
+        self.assertEqual(list(user.groups.values_list("name", flat=True)), ["Student"])
+
+    def test_rest_registration_without_phone_number(self):
+        user = {key: value for key, value in self.user.items() if key != "phone_number"}
+        response = self.client.post("/rest/register/", user, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNone(User.objects.get(email=self.user["email"]).phone_number)
+
+    def test_rest_registration_duplicate(self):
+        self.client.post("/rest/register/", self.user, content_type="application/json")
+        response = self.client.post("/rest/register/", self.user, content_type="application/json")
+        self.assertNotEqual(response.status_code, 201)
+        self.assertEqual(User.objects.filter(email=self.user["email"]).count(), 1)
+
+    def test_form_registration_is_not_staff(self):
+        response = self.client.post("/userRegister/", self.user)
+        self.assertRedirects(response, "/", fetch_redirect_response=False)
+        user = User.objects.get(email=self.user["email"])
+        self.assertEqual(user.username, "Test User")
+        self.assertFalse(user.is_staff)
+        self.assertFalse(user.is_superuser)
+        self.assertFalse(Token.objects.filter(user=user).exists())
+        self.assertEqual(list(user.groups.values_list("name", flat=True)), ["Student"])
+        self.assertEqual(int(self.client.session["_auth_user_id"]), user.pk)
+
+    def test_form_registration_cannot_use_admin(self):
+        self.client.post("/userRegister/", self.user)
+        response = self.client.get("/admin/")
+        self.assertRedirects(response, "/admin/login/?next=/admin/", fetch_redirect_response=False)
+
+
+class UserGroupTest(TestCase):
+    """
+    Tests of the group ids looked up to assign the users to the group of their type.
+    """
+
+    def test_group_added_again(self):
+        get_group_id("Student")
+        Group.objects.filter(name="Student").delete()
+        group = Group.objects.create(name="Student")
+        user = User.objects.create(email="new.student@mail.com", username="new student", user_type="student")
+        self.assertEqual(list(user.groups.values_list("id", flat=True)), [group.id])
+
+    def test_migrate_forgets_group_ids(self):
+        get_group_id("Student")
+        populate_groups(sender=None)
+        self.assertEqual(get_group_id.cache_info().currsize, 0)
+
+
+class SessionTest(TestCase):
+    """
+    Tests of the sessions kept in the cache and written through to the database.
+    """
+
+    credentials = {"email": "admin@mail.com", "password": "password"}
+
+    def setUp(self):
+        cache.clear()
+
+    def get_session_key(self):
+        return self.client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    def start_session(self):
+        session = self.client.session
+        session["visited"] = True
+        session.save()
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+        return session.session_key
+
+    def test_login_changes_key(self):
+        key = self.start_session()
+        response = self.client.post("/userLogin/", self.credentials)
+        self.assertRedirects(response, "/", fetch_redirect_response=False)
+        new_key = self.get_session_key()
+        self.assertNotEqual(new_key, key)
+        self.assertTrue(SessionStore(new_key).get("visited"))
+        self.assertEqual(Session.objects.filter(session_key=new_key).count(), 1)
+        self.assertEqual(self.client.get("/userRegister/").status_code, 302)
+
+    def test_old_key_is_invalid(self):
+        key = self.start_session()
+        self.client.post("/userLogin/", self.credentials)
+        self.assertFalse(SessionStore().exists(key))
+        self.assertEqual(SessionStore(key).load(), {})
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = key
+        self.assertEqual(self.client.get("/userRegister/").status_code, 200)
+        self.assertFalse(Session.objects.filter(session_key=key).exists())
+
+    def test_duplicate_key_is_not_overwritten(self):
+        taken = SessionStore()
+        taken["owner"] = "first"
+        taken.create()
+        session = SessionStore()
+        session["owner"] = "second"
+        with mock.patch.object(SessionStore, "_get_new_session_key", side_effect=[taken.session_key, "a" * 32]):
+            session.save()
+        self.assertEqual(session.session_key, "a" * 32)
+        self.assertEqual(SessionStore(taken.session_key).load(), {"owner": "first"})
+
+    def test_empty_session_is_not_written(self):
+        count = Session.objects.count()
+        self.assertEqual(self.client.get("/userRegister/").status_code, 200)
+        response = self.client.post("/userLogin/", dict(self.credentials, password="wrong"))
+        self.assertEqual(response.status_code, 302)
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, self.client.cookies)
+        self.assertEqual(Session.objects.count(), count)
+
+
+class PooledModelBackendTest(TestCase):
+    """
+    Tests of the passwords checked by ``PooledModelBackend``.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.get(email="admin@mail.com")
+        cls.user.set_password("password")
+        cls.user.save(update_fields=["password"])
+
+    def get_hash(self):
+        self.user.refresh_from_db()
+        return self.user.password
+
+    @override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.PBKDF2PasswordHasher",
+                                         "django.contrib.auth.hashers.MD5PasswordHasher"])
+    def test_login_upgrades_hash(self):
+        self.assertTrue(self.get_hash().startswith("md5$"))
+        response = self.client.post("/restUserLogin/", {"username": "admin@mail.com", "password": "password"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(self.get_hash().startswith("pbkdf2_sha256$"))
+        self.assertTrue(self.user.check_password("password"))
+
+    @override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.PBKDF2PasswordHasher",
+                                         "django.contrib.auth.hashers.MD5PasswordHasher"])
+    def test_wrong_password_keeps_hash(self):
+        encoded = self.get_hash()
+        self.assertIsNone(PooledModelBackend().authenticate(None, username="admin@mail.com", password="wrong"))
+        self.assertEqual(self.get_hash(), encoded)
+
+    def test_current_hash_is_kept(self):
+        encoded = self.get_hash()
+        self.assertEqual(PooledModelBackend().authenticate(None, email="admin@mail.com", password="password"),
+                         self.user)
+        self.assertEqual(self.get_hash(), encoded)
+
+    def test_unknown_user_hashes_password(self):
+        with mock.patch("common.authentication.hash_password") as hash_password:
+            self.assertIsNone(PooledModelBackend().authenticate(None, username="nobody@mail.com",
+                                                                password="password"))
+        hash_password.assert_called_once_with("password")
+
+    def test_inactive_user(self):
+        User.objects.filter(id=self.user.id).update(is_active=False)
+        self.assertIsNone(PooledModelBackend().authenticate(None, username="admin@mail.com", password="password"))
+
+
+@override_settings(PASSWORD_HASHING_WORKERS=1, PASSWORD_HASHING_QUEUE_SIZE=0, PASSWORD_HASHING_TIMEOUT=0.05)
+class PasswordHashingBusyTest(TestCase):
+    """
+    Tests of the requests hashing a password while the hashing pool and its queue are full.
+    """
+
+    def setUp(self):
+        hashing._reset_executor()
+        self.release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            self.release.wait(5)
+        self.blocker = threading.Thread(target=hashing._run, args=(block,))
+        self.blocker.start()
+        started.wait(5)
+
+    def tearDown(self):
+        self.release.set()
+        self.blocker.join()
+        hashing._reset_executor()
+
+    def test_rest_login(self):
+        response = self.client.post("/restUserLogin/", {"username": "admin@mail.com", "password": "password"})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+
+    def test_rest_registration(self):
+        response = self.client.post("/rest/register/", RegistrationTest.user, content_type="application/json")
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(User.objects.filter(email=RegistrationTest.user["email"]).exists())
+
+    def test_form_login(self):
+        response = self.client.post("/userLogin/", {"email": "admin@mail.com", "password": "password"})
+        self.assertEqual(response.status_code, 503)
+
+    def test_backend(self):
+        with self.assertRaises(hashing.PasswordHashingBusy):
+            PooledModelBackend().authenticate(None, username="admin@mail.com", password="password")
+
+    def test_hashing_after_release(self):
+        self.release.set()
+        self.blocker.join()
+        response = self.client.post("/restUserLogin/", {"username": "admin@mail.com", "password": "password"})
+        self.assertEqual(response.status_code, 200)
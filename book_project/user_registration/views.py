@@ -1,18 +1,17 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db import transaction
 from django.shortcuts import render, redirect
 from django.views import View
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib import messages
+from common.authentication import CachedTokenAuthentication, invalidate_token
 from common.form import UserRegistrationForm, LoginForm
+from common.hashing import PasswordHashingBusy
+from common.registration import register_user
 from common.serializer import UserRegistrationSerializer
-from common.utility import generate_token
-from db.models import User
 from django.db.utils import IntegrityError
 from common.constant import constants
 from django.contrib.auth import authenticate, login, logout
@@ -34,21 +33,10 @@ class RegistrationView(ViewSet):
         try:
             serializer = UserRegistrationSerializer(data=request.data)
             serializer.is_valid(raise_exception=True)
-            with transaction.atomic():
-                serial_data = serializer.validated_data
-                user_inst = User.objects.create(
-                    username=" ".join([serial_data.get("first_name"), serial_data.get("last_name")]),
-                    first_name=serial_data.get("first_name"),
-                    last_name=serial_data.get("last_name"),
-                    email=serial_data.get("email"),
-                    phone_number=serial_data.get("phone_number"),
-                    is_staff=True, is_active=True, user_type=serial_data.get("user_type"))
-                user_inst.set_password(serial_data.get("password"))
-                user_inst.save()
-                token = generate_token(user_inst)
-                return Response({constants["Data"]: {"Token": token},
-                                 constants["Message"]: constants["SuccessfullyAdded"].format("User")},
-                                status=status.HTTP_201_CREATED)
+            user_inst, token = register_user(**serializer.validated_data, is_staff=True, with_token=True)
+            return Response({constants["Data"]: {"Token": token.key},
+                             constants["Message"]: constants["SuccessfullyAdded"].format("User")},
+                            status=status.HTTP_201_CREATED)
         except ValidationError as err:
             return Response({constants["Error"]: err.args[0],
                              constants["Message"]: constants["ErrorMessage"].format("creating user")},
@@ -57,6 +45,10 @@ class RegistrationView(ViewSet):
             return Response({constants["Error"]: constants["AlreadyExist"].format("User"),
                              constants["Message"]: constants["ErrorMessage"].format("creating user")},
                             status=status.HTTP_400_BAD_REQUEST)
+        except PasswordHashingBusy as err:
+            return Response({constants["Error"]: err.detail,
+                             constants["Message"]: constants["SomethingWentWrong"].format("creating user")},
+                            status=err.status_code, headers={"Retry-After": str(err.wait)})
         except Exception as err:
             return Response({constants["Error"]: str(err),
                              constants["Message"]: constants["SomethingWentWrong"].format("creating user")},
@@ -68,7 +60,7 @@ class LogoutView(ViewSet):
     Class to manage user, and it includes a methods
     ``destroy`` to logout user.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def destroy(self, request):
@@ -78,7 +70,9 @@ class LogoutView(ViewSet):
         type request: request
         """
         try:
-            request.user.auth_token.delete()
+            key = request.auth.key
+            request.auth.delete()
+            invalidate_token(key)
             return Response({constants["Data"]: "User logged out successfully.",
                              constants["Message"]: "User loggerd out successfully."}, status=status.HTTP_200_OK)
         except Exception as err:
@@ -122,18 +116,22 @@ class UserRegistrationView(View):
         try:
             form = UserRegistrationForm(request.POST)
             if form.is_valid():
-                with transaction.atomic():
-                    user_instance = form.save()
-                    user_instance.username = " ".join([form.cleaned_data.get("first_name").capitalize(),
-                                                       form.cleaned_data.get("last_name").capitalize()])
-                    user_instance.set_password(form.cleaned_data.get("password"))
-                    user_instance.save()
-                    login(request=request, user=user_instance)
+                data = form.cleaned_data
+                user_instance, _ = register_user(
+                    email=data.get("email"), first_name=data.get("first_name"), last_name=data.get("last_name"),
+                    password=data.get("password"), phone_number=data.get("phone_number"),
+                    user_type=data.get("user_type"),
+                    username=" ".join([data.get("first_name").capitalize(), data.get("last_name").capitalize()]))
+                login(request=request, user=user_instance)
                 return redirect("book_view")
             messages.warning(request, "Please insert correct value!")
             return redirect("user_register")
         except IntegrityError:
             return render(template_name="error.html", request=request)
+        except PasswordHashingBusy as err:
+            response = render(template_name="error.html", request=request, status=err.status_code)
+            response["Retry-After"] = str(err.wait)
+            return response
         except Exception as err:
             return render(template_name="error.html", request=request)
 
@@ -180,5 +178,9 @@ class UserLoginView(View):
             return redirect("user_register")
         except IntegrityError:
             return render(template_name="error.html", request=request)
+        except PasswordHashingBusy as err:
+            response = render(template_name="error.html", request=request, status=err.status_code)
+            response["Retry-After"] = str(err.wait)
+            return response
         except Exception as err:
             return render(template_name="error.html", request=request)